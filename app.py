@@ -2,6 +2,7 @@ import streamlit as st
 from config.theme import theme, app_background
 from config.design import disclaimer, hero_section, how_to_use_section, load_lottie_file
 from streamlit_lottie import st_lottie
+from utils.page_metrics import page_run_finished, page_run_started
 
 # ==========================
 # PAGE CONFIGURATION
@@ -12,6 +13,7 @@ st.set_page_config(
     layout="wide",  # Wide layout for better user experience
     initial_sidebar_state="expanded",  # Sidebar is expanded by default
 )
+run_started = page_run_started()  # Starts the local /metrics endpoint
 
 # ==========================
 # APPLY THEME AND BACKGROUND
@@ -124,6 +126,7 @@ st.markdown("""
         }
     </style>
 """, unsafe_allow_html=True)
+page_run_finished("Home", run_started)
 
 
 
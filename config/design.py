@@ -1,12 +1,21 @@
 import json
 import streamlit as st
 from streamlit_lottie import st_lottie
+from utils.metrics import ASSET_LOAD_SECONDS, CACHE_REQUESTS
+
+_lottie_cache = {}
 
 # Function to load Lottie animations from a local JSON file
 def load_lottie_file(filepath: str):
-    """Load a Lottie animation file from the given filepath."""
-    with open(filepath, "r") as f:
-        return json.load(f)
+    """Load a Lottie animation file from the given filepath (parsed once per process)."""
+    if filepath in _lottie_cache:
+        CACHE_REQUESTS.labels(cache="asset", result="hit").inc()
+        return _lottie_cache[filepath]
+    CACHE_REQUESTS.labels(cache="asset", result="miss").inc()
+    with ASSET_LOAD_SECONDS.labels(asset=filepath).time():
+        with open(filepath, "r") as f:
+            _lottie_cache[filepath] = json.load(f)
+    return _lottie_cache[filepath]
 
 # Function to display the hero section at the top of the page
 def hero_section():
@@ -0,0 +1,170 @@
+from functools import lru_cache
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from utils.report import prevention_tips
+
+# ==========================
+# STATIC CONTENT (built once per process)
+# ==========================
+STROKE_STATS = pd.DataFrame({
+    'Age Group': ['18-44', '45-64', '65-74', '75+'],
+    'Stroke Risk (%)': [2, 8, 15, 25],
+    'Prevention Potential (%)': [80, 70, 60, 40]
+})
+
+WARNING_SIGNS_HTML = """
+<div style='background-color:#fff3cd;border:1px solid #ffeaa7;border-radius:10px;padding:20px;margin:10px 0;'>
+    <h3 style='color:#856404;margin-top:0;'>Remember F.A.S.T.:</h3>
+    <div style='display:grid;grid-template-columns:repeat(auto-fit,minmax(200px,1fr));gap:15px;margin-top:15px;'>
+        <div style='text-align:center;'>
+            <div style='font-size:3em;'>😵</div>
+            <h4 style='color:#856404;'>F - Face</h4>
+            <p>Face drooping or numbness</p>
+        </div>
+        <div style='text-align:center;'>
+            <div style='font-size:3em;'>💪</div>
+            <h4 style='color:#856404;'>A - Arms</h4>
+            <p>Arm weakness or numbness</p>
+        </div>
+        <div style='text-align:center;'>
+            <div style='font-size:3em;'>🗣️</div>
+            <h4 style='color:#856404;'>S - Speech</h4>
+            <p>Speech difficulty or slurred</p>
+        </div>
+        <div style='text-align:center;'>
+            <div style='font-size:3em;'>⏰</div>
+            <h4 style='color:#856404;'>T - Time</h4>
+            <p>Time to call emergency services</p>
+        </div>
+    </div>
+</div>
+"""
+
+HEALTH_ORGANIZATIONS_HTML = """
+<div class="features">
+    <div class="feature-card">
+        <span class="material-icons">local_hospital</span>
+        <h4>Singapore Heart Foundation</h4>
+        <p><a href="https://www.myheart.org.sg" target="_blank">myheart.org.sg</a></p>
+    </div>
+    <div class="feature-card">
+        <span class="material-icons">health_and_safety</span>
+        <h4>HealthHub (MOH)</h4>
+        <p><a href="https://www.healthhub.sg" target="_blank">healthhub.sg</a></p>
+    </div>
+    <div class="feature-card">
+        <span class="material-icons">coronavirus</span>
+        <h4>National Neuroscience Institute</h4>
+        <p><a href="https://www.nni.com.sg" target="_blank">nni.com.sg</a></p>
+    </div>
+</div>
+"""
+
+HEALTH_APPS_HTML = """
+<div class="features">
+    <div class="feature-card">
+        <span class="material-icons">fitness_center</span>
+        <h4>Healthy 365</h4>
+        <p>Track steps, health points & nutrition (by HPB)</p>
+    </div>
+    <div class="feature-card">
+        <span class="material-icons">self_improvement</span>
+        <h4>Headspace</h4>
+        <p>Meditation and stress management</p>
+    </div>
+    <div class="feature-card">
+        <span class="material-icons">monitor_heart</span>
+        <h4>Samsung Health / Apple Health</h4>
+        <p>Monitor heart rate & physical activity</p>
+    </div>
+</div>
+"""
+
+EMERGENCY_CONTACTS_HTML = """
+<div class="features">
+    <div class="feature-card">
+        <span class="material-icons">emergency</span>
+        <h4>Emergency Ambulance</h4>
+        <p><strong>995</strong> (Singapore Civil Defence Force)</p>
+    </div>
+    <div class="feature-card">
+        <span class="material-icons">support</span>
+        <h4>HealthLine</h4>
+        <p><strong>1800-223-1313</strong> (Non-emergency health advice)</p>
+    </div>
+</div>
+"""
+
+
+@lru_cache(maxsize=None)
+def stroke_statistics_figures():
+    """Risk and prevention-potential bar charts by age group."""
+    fig_risk = px.bar(STROKE_STATS, x='Age Group', y='Stroke Risk (%)',
+                      title='Stroke Risk by Age Group',
+                      color='Stroke Risk (%)',
+                      color_continuous_scale='Reds')
+    fig_risk.update_layout(height=400, showlegend=False)
+    fig_prevention = px.bar(STROKE_STATS, x='Age Group', y='Prevention Potential (%)',
+                            title='Prevention Potential by Age',
+                            color='Prevention Potential (%)',
+                            color_continuous_scale='Greens')
+    fig_prevention.update_layout(height=400, showlegend=False)
+    return fig_risk, fig_prevention
+
+
+# ==========================
+# TAB RENDERERS
+# ==========================
+def risk_statistics_tab(user_inputs):
+    """Global stroke statistics charts."""
+    st.markdown("### Global Stroke Statistics")
+    fig_risk, fig_prevention = stroke_statistics_figures()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(fig_risk, use_container_width=True)
+    with col2:
+        st.plotly_chart(fig_prevention, use_container_width=True)
+    st.info("💡 **Key Insight**: Up to 80% of strokes are preventable through lifestyle changes!")
+
+
+def prevention_tips_tab(user_inputs):
+    """Prevention tips for the user's risk factors."""
+    st.markdown("### 🎯 Personalized Prevention Tips")
+    for tip in prevention_tips(user_inputs):
+        st.markdown(f"""
+        <div style='background-color:#f0f8ff;border-radius:10px;padding:15px;margin:10px 0;border-left:5px solid #4169e1;'>
+            <h4>{tip['icon']} {tip['title']}</h4>
+            <p>{tip['tip']}</p>
+            <strong>Action: {tip['action']}</strong>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def warning_signs_tab(user_inputs):
+    """F.A.S.T. stroke warning signs."""
+    st.markdown("### ⚠️ Stroke Warning Signs - F.A.S.T.")
+    st.markdown(WARNING_SIGNS_HTML, unsafe_allow_html=True)
+    st.error("🚨 **EMERGENCY**: If you notice these signs, call 911/emergency services immediately!")
+
+
+def learn_more_tab(user_inputs):
+    """Singapore health organisations, apps and emergency contacts."""
+    st.markdown("### 📚 Additional Resources (Singapore)")
+    st.markdown("#### 🏥 Health Organizations")
+    st.markdown(HEALTH_ORGANIZATIONS_HTML, unsafe_allow_html=True)
+    st.markdown("#### 📱 Mobile Apps for Health Tracking")
+    st.markdown(HEALTH_APPS_HTML, unsafe_allow_html=True)
+    st.markdown("#### 🚨 Emergency Contacts")
+    st.markdown(EMERGENCY_CONTACTS_HTML, unsafe_allow_html=True)
+
+
+# Tab label -> renderer, in display order
+EDUCATION_TABS = {
+    "📊 Risk Statistics": risk_statistics_tab,
+    "🏥 Prevention Tips": prevention_tips_tab,
+    "⚠️ Warning Signs": warning_signs_tab,
+    "📚 Learn More": learn_more_tab,
+}
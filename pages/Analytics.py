@@ -0,0 +1,135 @@
+import time
+from datetime import datetime
+
+import plotly.graph_objects as go
+import streamlit as st
+from config.theme import theme, app_background
+from config.design import footer
+from utils.model import deployed_threshold_config
+from utils.page_metrics import page_run_finished, page_run_started
+from utils.report import BAND_COLORS
+from utils.risk_cube import DIMENSIONS, RISK_CUBE_PATH, load_risk_cube
+
+# ==========================
+# PAGE CONFIGURATION
+# ==========================
+st.set_page_config(
+    page_title="StrokeSense – Cohort Analytics",
+    page_icon="../assets/icon.png",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+run_started = page_run_started()
+
+# ==========================
+# APPLY THEME AND STYLING
+# ==========================
+theme()  # Apply the theme
+app_background()  # Apply the background animation
+st.title("Cohort Risk Analytics")
+
+# ==========================
+# LOAD RISK CUBE
+# ==========================
+# Built by scripts/score.py --cube; every number below is summed from it
+cube = load_risk_cube()
+if cube is None:
+    st.info("No scored cohort yet. Score one with "
+            f"`python -m scripts.score cohort.parquet --out scored.parquet --cube {RISK_CUBE_PATH}`.")
+    footer()
+    page_run_finished("Analytics", run_started)
+    st.stop()
+
+threshold = deployed_threshold_config()["threshold"]
+total = cube.breakdown([]).iloc[0]
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Patients Scored", f"{int(total['patients']):,}")
+col2.metric("Mean Risk", f"{total['mean_risk'] * 100:.1f}%")
+col3.metric(f"Above {threshold * 100:.0f}% Threshold", f"{total['flagged_share'] * 100:.1f}%")
+col4.metric("Rows Failing Validation", f"{cube.meta['invalid_rows']:,}")
+st.caption(
+    f"Source: {cube.meta.get('source', 'unknown')} · model {cube.meta.get('model_version', 'unknown')} · "
+    f"built {datetime.fromtimestamp(cube.meta['built']).strftime('%Y-%m-%d %H:%M')}")
+
+TITLES = {name: title for name, (title, _) in DIMENSIONS.items()}
+
+
+# ==========================
+# COHORT EXPLORER (FRAGMENT)
+# ==========================
+# Filters and breakdowns rerun only this function; each one slices and
+# sums the cube, so the cost does not grow with the cohort
+@st.fragment
+def cohort_explorer():
+    """Filters, breakdown charts and table over the risk cube."""
+    with st.expander("Filters (empty means everyone)", expanded=True):
+        filters = {}
+        columns = st.columns(4)
+        for i, name in enumerate(cube.dimensions):
+            with columns[i % 4]:
+                selected = st.multiselect(TITLES[name], cube.labels[name], placeholder="All", key=f"cube_filter_{name}")
+            if selected:
+                filters[name] = selected
+
+    dimensions = [name for name in cube.dimensions if name != "risk_band"]
+    col1, col2 = st.columns(2)
+    by = col1.selectbox("Break down by", dimensions, format_func=TITLES.get, key="cube_by")
+    then_by = col2.selectbox("Then by (drill-down)", [None] + [d for d in dimensions if d != by],
+                             format_func=lambda name: "—" if name is None else TITLES[name], key="cube_then_by")
+    groups = [by] if then_by is None else [by, then_by]
+
+    started = time.perf_counter()
+    summary = cube.breakdown(groups, filters)
+    bands = cube.breakdown([by, "risk_band"], filters)
+    seconds = time.perf_counter() - started
+    if summary["patients"].sum() == 0:
+        st.warning("No patients match these filters.")
+        return
+
+    # Breakdowns come back in the order of the selected labels, so they reshape into grids
+    labels = filters.get(by) or cube.labels[by]
+    layout = dict(height=400, plot_bgcolor="white", margin=dict(l=40, r=40, t=60, b=40))
+    col1, col2 = st.columns(2)
+    with col1:
+        if then_by is None:
+            fig = go.Figure(go.Bar(
+                x=labels, y=summary["mean_risk"] * 100, marker_color="#4169e1", customdata=summary["patients"],
+                hovertemplate="%{x}<br>Mean risk: %{y:.1f}%<br>Patients: %{customdata:,}<extra></extra>",
+            ), layout=dict(layout, title=f"Mean Stroke Risk by {TITLES[by]}", yaxis=dict(title="Mean Risk (%)")))
+        else:
+            shape = (len(labels), -1)
+            fig = go.Figure(go.Heatmap(
+                z=(summary["mean_risk"].to_numpy().reshape(shape) * 100).T, x=labels,
+                y=filters.get(then_by) or cube.labels[then_by],
+                customdata=summary["patients"].to_numpy().reshape(shape).T,
+                colorscale="RdYlGn_r", zmin=0, zmax=100, texttemplate="%{z:.0f}%", colorbar=dict(title="Risk %"),
+                hovertemplate="%{x} · %{y}<br>Mean risk: %{z:.1f}%<br>Patients: %{customdata:,}<extra></extra>",
+            ), layout=dict(layout, title=f"Mean Stroke Risk by {TITLES[by]} and {TITLES[then_by]}",
+                           yaxis=dict(title=TITLES[then_by])))
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        counts = bands["patients"].to_numpy().reshape(len(labels), -1)
+        shares = counts / counts.sum(axis=1, keepdims=True).clip(min=1) * 100
+        fig = go.Figure([
+            go.Bar(x=labels, y=shares[:, i], name=band, marker_color=BAND_COLORS[i % len(BAND_COLORS)],
+                   hovertemplate=f"%{{x}}<br>{band}: %{{y:.1f}}%<extra></extra>")
+            for i, band in enumerate(cube.labels["risk_band"])
+        ], layout=dict(layout, barmode="stack", title=f"Risk Band Mix by {TITLES[by]}",
+                       yaxis=dict(title="Share of Patients (%)", range=[0, 100])))
+        st.plotly_chart(fig, use_container_width=True)
+
+    table = summary.rename(columns=TITLES).assign(
+        **{"Mean Risk (%)": (summary["mean_risk"] * 100).round(1),
+           "Above Threshold (%)": (summary["flagged_share"] * 100).round(1),
+           "Share of Filtered Cohort (%)": (summary["cohort_share"] * 100).round(1)},
+    ).drop(columns=["mean_risk", "flagged_share", "cohort_share"]).rename(columns={"patients": "Patients"})
+    st.dataframe(table, hide_index=True, use_container_width=True)
+    st.caption(f"Aggregated from {cube.count.size:,} cube cells in {seconds * 1000:.1f} ms, "
+               f"for a cohort of {cube.meta['rows']:,} rows.")
+
+
+cohort_explorer()
+
+# Footer
+footer()
+page_run_finished("Analytics", run_started)
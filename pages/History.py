@@ -0,0 +1,139 @@
+import time
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from config.theme import theme, app_background
+from config.design import disclaimer, footer
+from utils.history import get_history_store, history_user_id
+from utils.model import deployed_threshold_config
+from utils.page_metrics import page_run_finished, page_run_started
+from utils.report import BAND_COLORS
+
+# ==========================
+# PAGE CONFIGURATION
+# ==========================
+st.set_page_config(
+    page_title="StrokeSense – History",
+    page_icon="../assets/icon.png",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+run_started = page_run_started()
+
+# ==========================
+# APPLY THEME AND STYLING
+# ==========================
+theme()  # Apply the theme
+app_background()  # Apply the background animation
+st.title("Stroke Risk – Progress Over Time")
+
+# ==========================
+# HISTORY KEY AND RANGE SELECTION
+# ==========================
+store = get_history_store()
+threshold_config = deployed_threshold_config()
+
+col1, col2 = st.columns([2, 1])
+with col1:
+    history_key = st.text_input(
+        "History key",
+        value=st.session_state.get("history_key", ""),
+        type="password",
+        help="The key entered on the input form. Assessments made without a key are not saved.",
+    )
+with col2:
+    ranges = {"Last 30 days": 30, "Last year": 365, "All time": None}
+    period = st.selectbox("Period", list(ranges), index=2)
+
+days = ranges[period]
+start = time.time() - days * 86400 if days else None
+
+if not history_key.strip():
+    st.info("Enter the history key you used on the input form to see your saved assessments.")
+    if st.button("Go to Input Form", key="go_to_form"):
+        st.switch_page("pages/Input.py")
+    footer()
+    page_run_finished("History", run_started)
+    st.stop()
+user_id = history_user_id(history_key)
+
+# ==========================
+# RISK TIMELINE
+# ==========================
+# Long histories are downsampled by the database to at most 500 points
+timeline = store.timeline(user_id, start=start)
+if timeline.empty:
+    st.info("No saved assessments for this key yet. Complete the input form to start tracking your risk.")
+    if st.button("Go to Input Form", key="go_to_form"):
+        st.switch_page("pages/Input.py")
+    footer()
+    page_run_finished("History", run_started)
+    st.stop()
+
+latest = store.latest(user_id, limit=10)
+col1, col2, col3 = st.columns(3)
+col1.metric("Assessments", store.count(user_id, start=start))
+col2.metric(
+    "Latest Risk",
+    f"{latest['probability'].iloc[0] * 100:.1f}%",
+    f"{(latest['probability'].iloc[0] - latest['probability'].iloc[1]) * 100:+.1f}%" if len(latest) > 1 else None,
+    delta_color="inverse",
+)
+col3.metric("Average Risk", f"{(timeline['probability'] * timeline['n']).sum() / timeline['n'].sum() * 100:.1f}%")
+
+fig = go.Figure()
+
+# Shade the risk bands behind the line
+edges = [0, *threshold_config["bands"], 100]
+for i, label in enumerate(threshold_config["band_labels"]):
+    fig.add_hrect(y0=edges[i], y1=edges[i + 1], fillcolor=BAND_COLORS[i], opacity=0.08, line_width=0,
+                  annotation_text=label, annotation_position="left")
+
+# Range of each downsampled point, when points cover several assessments
+if (timeline["n"] > 1).any():
+    fig.add_trace(go.Scatter(
+        x=pd.concat([timeline["ts"], timeline["ts"][::-1]]),
+        y=pd.concat([timeline["high"], timeline["low"][::-1]]) * 100,
+        fill="toself", fillcolor="rgba(65,105,225,0.15)", line=dict(width=0),
+        hoverinfo="skip", name="Min–max range",
+    ))
+fig.add_trace(go.Scatter(
+    x=timeline["ts"],
+    y=timeline["probability"] * 100,
+    mode="lines+markers",
+    line=dict(color="#4169e1", width=3),
+    customdata=timeline["n"],
+    hovertemplate="%{x|%Y-%m-%d %H:%M}<br>Risk: %{y:.1f}%<br>Assessments: %{customdata}<extra></extra>",
+    name="Stroke risk",
+))
+fig.update_layout(
+    height=450,
+    title="Estimated Stroke Risk Over Time",
+    xaxis=dict(title="Date"),
+    yaxis=dict(title="Stroke Risk (%)", range=[0, 100]),
+    plot_bgcolor="white",
+    margin=dict(l=40, r=40, t=60, b=40),
+)
+st.plotly_chart(fig, use_container_width=True)
+
+# ==========================
+# RECENT ASSESSMENTS
+# ==========================
+st.markdown("### Recent Assessments")
+answers = pd.DataFrame(latest["inputs"].tolist(), index=latest.index)
+recent = pd.DataFrame({
+    "Date": latest["ts"].dt.strftime("%Y-%m-%d %H:%M"),
+    "Risk (%)": (latest["probability"] * 100).round(1),
+})
+for column, title in [("age", "Age"), ("bmi", "BMI"), ("hypertension", "High Blood Pressure"),
+                      ("diabetes", "Diabetes"), ("smoking_status", "Smoking Status")]:
+    if column in answers:
+        recent[title] = answers[column]
+st.dataframe(recent, hide_index=True, use_container_width=True)
+
+disclaimer()
+
+# Footer
+footer()
+page_run_finished("History", run_started)
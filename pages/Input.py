@@ -1,8 +1,13 @@
 import streamlit as st
 from utils.bmi import calculate_bmi
-from utils.risk_n_level import age_gender_to_risk, age_to_age_group, health_risk_level, stress_level_category
+from utils.history import MIN_HISTORY_KEY_LENGTH, new_history_key
+from strokesense.encoding import encode_profile
+from strokesense.validation import validate_profile
 from config.theme import theme, app_background
 from config.design import input_design, hero_section, footer
+from utils.page_metrics import page_run_finished, page_run_started
+from utils.registry import served_model
+from utils.speculative import collect_scoring, start_scoring
 
 # ==========================
 # PAGE CONFIGURATION
@@ -13,6 +18,7 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded",
 )
+run_started = page_run_started()
 
 # Apply the theme, background animation, and input design styles
 theme()
@@ -35,6 +41,19 @@ st.markdown("""
 # ==========================
 with st.expander('Personal Information', expanded=True):
     # Collect user inputs for personal details
+    history_key = st.text_input(
+        "History key (optional)",
+        value=st.session_state.get("history_key", ""),
+        type="password",
+        help=f"A private key of at least {MIN_HISTORY_KEY_LENGTH} characters. Assessments saved with the same "
+             "key appear together on the History page, and only someone with the key can see them. "
+             "Without a key, assessments are not saved.",
+    )
+    if st.button("Suggest a key", help="Fill in a random key. Keep a copy to see your history later."):
+        st.session_state.history_key = st.session_state.suggested_history_key = new_history_key()
+        st.rerun()
+    if history_key and history_key == st.session_state.get("suggested_history_key"):
+        st.caption(f"Your history key: `{history_key}`")
     age = st.number_input("Age (years)", 0, 100, 30, step=1, help="Enter your age in years.")
     gender = st.selectbox("Gender", ["Male", "Female"])
     height = st.number_input("Height (cm)", 100, 250, 170)
@@ -78,17 +97,10 @@ with st.expander('Lifestyle & Demographics', expanded=True):
 # VALIDATION & PREDICT BUTTON
 # ==========================
 with st.container():
-    error_msgs = []
-    
-    # Validation checks for user inputs
-    if not (100 <= height <= 250):
-        error_msgs.append("• Height must be between 100 and 250 cm.")
-    if not (30 <= weight <= 200):
-        error_msgs.append("• Weight must be between 30 and 200 kg.")
-    if not (12 <= bmi <= 60):  # BMI between 12 and 60
-        error_msgs.append("• BMI value is out of a reasonable range. Please check your height and weight.")
-    if not (18 <= age <= 100):  # Age between 18 and 100
-        error_msgs.append("• Age must be between 18 and 100.")
+    # Validation checks for user inputs (same rules as batch scoring)
+    error_msgs = validate_profile(age=age, height=height, weight=weight, bmi=bmi)
+    if history_key.strip() and len(history_key.strip()) < MIN_HISTORY_KEY_LENGTH:
+        error_msgs.append(f"• History key must be at least {MIN_HISTORY_KEY_LENGTH} characters, or left empty.")
 
     # Display validation errors or success message
     if error_msgs:
@@ -102,18 +114,26 @@ with st.container():
 
         # Use st.dialog for confirmation modal
         if st.button("Predict", disabled=bool(error_msgs)):
-            # Convert variables to numeric values for model input
-            hypertension_val = 1 if hypertension == "Yes" else 0
-            heart_disease_val = 1 if heart_disease == "Yes" else 0
-            diabetes_val = 1 if diabetes == "Yes" else 0
-            marital_status_val = 1 if marital_status == "Married" else 0
-            smoking_status_val = 1 if smoking_status == "Formerly Smoker or Currently Smokes" else 0
-            
             @st.dialog("Please Confirm Your Details", width="large")
             def confirm_dialog():
                 """
                 Display a confirmation dialog for users to review their inputs.
                 """
+                # Start encoding and scoring while the user reviews; Results
+                # picks the parked result up on confirm
+                answers = {
+                    "age": age, "gender": gender, "bmi": bmi, "hypertension": hypertension,
+                    "heart_disease": heart_disease, "diabetes": diabetes, "marital_status": marital_status,
+                    "residence_type": residence_type, "work_type": work_type, "smoking_status": smoking_status,
+                }
+                served = served_model(st.session_state)
+                speculative = st.session_state.get("speculative")
+                if speculative is None or speculative["answers"] != answers or speculative["version"] != served.version:
+                    if speculative is not None:
+                        speculative["future"].cancel()
+                    speculative = {"answers": answers, "version": served.version, "future": start_scoring(answers, served)}
+                    st.session_state.speculative = speculative
+
                 st.markdown("#### Please review your information before submitting:")
                 
                 # --- Card 1: Personal Information ---
@@ -165,53 +185,26 @@ with st.container():
                 colA, colB = st.columns(2)
                 with colA:
                     if st.button("Continue Editing"):
+                        # The answers are about to change; drop the stale score
+                        st.session_state.pop("speculative")["future"].cancel()
                         st.rerun()
                 with colB:
                     if st.button("Confirm & Predict"):
-                        # Process user inputs and encode them for the model
-                        age_group = age_to_age_group(age)
-                        age_gender_risk = age_gender_to_risk(age_group, gender)
-                        health_risk = health_risk_level(hypertension_val, heart_disease_val, diabetes_val)
-                        
-                        work_type_mapped = "Employed" if work_type == "Government Job" else work_type
-                        marital_status_text = "Yes" if marital_status == "Married" else "No"
-                        stress_level = stress_level_category(work_type_mapped, marital_status_text, residence_type, health_risk)
-
-                        # Create feature encoding for the model
-                        user_inputs = {}
-                        user_inputs["hypertension"] = hypertension_val
-                        user_inputs["heart_disease"] = heart_disease_val  
-                        user_inputs["ever_married"] = marital_status_val
-                        user_inputs["smoking_status"] = smoking_status_val
-                        user_inputs["diabetes"] = diabetes_val
-                        
-                        # Encode categorical features
-                        age_groups = ["Middle (50-64)", "Older (65+)", "Young (<49)"]
-                        for ag in age_groups:
-                            user_inputs[f"age_group_{ag}"] = 1 if age_to_age_group(age) == ag else 0
-                        
-                        work_types = ["Employed", "Private", "Self-employed", "Unemployed"] 
-                        for wt in work_types:
-                            user_inputs[f"work_type_{wt}"] = 1 if work_type_mapped == wt else 0
-                        
-                        bmi_categories = ["Normal weight", "Obese"]
-                        for bc in bmi_categories:
-                            user_inputs[f"bmi_category_{bc}"] = 1 if bmi_category == bc else 0
-                        
-                        health_risks = ["Low Risk", "Moderate Risk"]
-                        for hr in health_risks:
-                            user_inputs[f"health_risk_{hr}"] = 1 if health_risk == hr else 0
-                        
-                        age_gender_risks = ["High Risk", "Low Risk", "Moderate Risk", "Very High Risk"]
-                        for agr in age_gender_risks:
-                            user_inputs[f"age_gender_risk_{agr}"] = 1 if age_gender_risk == agr else 0
-                        
-                        stress_levels = ["Low Stress", "Moderate Stress"]
-                        for sl in stress_levels:
-                            user_inputs[f"stress_level_{sl}"] = 1 if stress_level == sl else 0
-                        
+                        # Encoded inputs and score from the background worker; if it
+                        # failed or is running late, Results scores the profile itself
+                        scored = collect_scoring(st.session_state.pop("speculative")["future"])
+
                         # Save inputs to session state and redirect to results page
-                        st.session_state.user_inputs = user_inputs
+                        st.session_state.user_inputs = scored["user_inputs"] if scored else encode_profile(**answers)
+                        st.session_state.scored = scored
+                        st.session_state.history_key = history_key.strip()
+                        st.session_state.form_answers = {
+                            "age": age, "gender": gender, "height": height, "weight": weight, "bmi": bmi,
+                            "hypertension": hypertension, "heart_disease": heart_disease, "diabetes": diabetes,
+                            "marital_status": marital_status, "residence_type": residence_type,
+                            "work_type": work_type, "smoking_status": smoking_status,
+                        }
+                        st.session_state.new_assessment = True
                         st.success("Inputs confirmed! Redirecting to results...")
                         st.switch_page("pages/Results.py")
             confirm_dialog()
@@ -220,3 +213,4 @@ with st.container():
 # FOOTER
 # ==========================
 footer()
+page_run_finished("Input", run_started)
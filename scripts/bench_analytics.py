@@ -0,0 +1,72 @@
+"""
+Measure what a filter or breakdown change costs on the Analytics page.
+
+Starts the page under a real Streamlit server (with the risk cube at
+data/risk_cube.npz, see scripts/score.py --cube), connects over the app's
+websocket and, after the first run, cycles the "Break down by" and
+"Then by" choices and toggles the gender filter, recording the time from
+sending each change until the (fragment) rerun finishes and the bytes sent
+back. The cube has the same number of cells for any cohort, so the times
+should not depend on how many patients were scored.
+
+Usage (from the repository root):
+    python -m scripts.score cohort.parquet --out scored.parquet --cube data/risk_cube.npz
+    python -m scripts.bench_analytics
+"""
+import argparse
+import asyncio
+
+import numpy as np
+
+from scripts.page_bench import connect, find_widget, run_once, serve
+from utils.risk_cube import load_risk_cube
+
+
+async def _benchmark(port, interactions):
+    from streamlit.proto.ClientState_pb2 import ClientState
+
+    ws = await connect(port)
+    first_seconds, first_bytes, messages = await run_once(ws, ClientState())
+    by_id, fragment_id = find_widget(messages, "selectbox", "Break down by")
+    then_id, _ = find_widget(messages, "selectbox", "Then by (drill-down)")
+    gender_id, _ = find_widget(messages, "multiselect", "Gender")
+
+    timings, sizes = [], []
+    for i in range(interactions):
+        state = ClientState(fragment_id=fragment_id)
+        for widget_id, kind, value in [(by_id, "int_value", i % 7), (then_id, "int_value", i % 3),
+                                       (gender_id, "int_array_value", [i % 2])]:
+            widget = state.widget_states.widgets.add()
+            widget.id = widget_id
+            if kind == "int_value":
+                widget.int_value = value
+            else:
+                widget.int_array_value.data.extend(value)
+        seconds, received, _ = await run_once(ws, state)
+        timings.append(seconds)
+        sizes.append(received)
+    ws.close()
+    return first_seconds, first_bytes, bool(fragment_id), np.array(timings), np.array(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", default="pages/Analytics.py", help="Page script to measure")
+    parser.add_argument("--interactions", type=int, default=30, help="Filter/breakdown changes to time")
+    args = parser.parse_args()
+
+    cube = load_risk_cube()
+    if cube is None:
+        parser.error("no risk cube at data/risk_cube.npz; score a cohort with --cube first")
+    with serve(args.page) as port:
+        first_seconds, first_bytes, fragment, timings, sizes = asyncio.run(_benchmark(port, args.interactions))
+
+    print(f"Page: {args.page}, cube of {cube.meta['rows']:,} rows ({cube.count.size:,} cells)")
+    print(f"First run: {first_seconds * 1000:.0f} ms, {first_bytes / 1024:.1f} KiB")
+    print(f"Changes ({args.interactions}, {'fragment rerun' if fragment else 'full rerun'}): "
+          f"median {np.median(timings) * 1000:.1f} ms, p95 {np.percentile(timings, 95) * 1000:.1f} ms, "
+          f"{sizes.mean() / 1024:.1f} KiB sent per change")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare cohort scoring throughput for CSV and columnar (Arrow/Parquet) I/O.
+
+Writes a synthetic cohort of raw profiles (utils/synthetic.py) as CSV, Parquet and Arrow IPC,
+then scores each file end to end (validate, encode, predict, write the
+scored rows) and reports rows per second with the time spent reading,
+encoding, predicting and writing:
+
+- "pandas CSV": chunked pd.read_csv, encode_frame and to_csv, the way
+  scripts/score.py handles CSV to CSV.
+- "Arrow CSV -> Parquet", "Parquet -> Parquet", "Arrow -> Arrow": record
+  batches through utils/columnar.py.
+
+Usage (from the repository root):
+    python -m scripts.bench_io
+    python -m scripts.bench_io --rows 1000000 --keep /tmp/cohort
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from strokesense.model import predict_deduplicated
+from utils.columnar import ARROW_BATCH_ROWS, TEXT_COLUMNS, score_file
+from utils.encoding import encode_frame
+from utils.model import deployed_threshold_config, load_model_and_features
+from utils.synthetic import write_cohort
+from utils.validation import validate_columns
+
+def _write_cohort(directory, n_rows, seed):
+    paths = {kind: os.path.join(directory, f"cohort.{kind}") for kind in ("csv", "parquet", "arrow")}
+    for path in paths.values():
+        write_cohort(path, n_rows, seed)
+    return paths
+
+
+def _pandas_csv(in_path, out_path, model, feature_order, config, timings):
+    """CSV to CSV with pandas, chunked so ten million rows fit in memory."""
+    labels = np.asarray(config["band_labels"], dtype=object)
+    bands = np.asarray(config["bands"], dtype=np.float64)
+    chunks = pd.read_csv(in_path, chunksize=ARROW_BATCH_ROWS, dtype={name: "category" for name in TEXT_COLUMNS})
+    first = True
+    while True:
+        started = time.perf_counter()
+        raw = next(chunks, None)
+        timings["read"] = timings.get("read", 0.0) + time.perf_counter() - started
+        if raw is None:
+            return
+        started = time.perf_counter()
+        codes = validate_columns(raw)
+        valid = codes == 0
+        X = encode_frame(raw[valid], feature_order, dtype=np.uint8)
+        timings["encode"] = timings.get("encode", 0.0) + time.perf_counter() - started
+        started = time.perf_counter()
+        probability = np.full(len(raw), np.nan)
+        probability[valid] = predict_deduplicated(model, X, feature_order)
+        timings["predict"] = timings.get("predict", 0.0) + time.perf_counter() - started
+        started = time.perf_counter()
+        raw.assign(
+            error_code=codes,
+            probability=probability,
+            prediction=pd.Series(np.where(valid, probability > config["threshold"], np.nan)).astype("Int8").to_numpy(),
+            risk_band=np.where(valid, labels[np.searchsorted(bands, np.nan_to_num(probability) * 100, side="right")], None),
+        ).to_csv(out_path, mode="w" if first else "a", header=first, index=False)
+        timings["write"] = timings.get("write", 0.0) + time.perf_counter() - started
+        first = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Synthetic cohort size")
+    parser.add_argument("--seed", type=int, default=0, help="Cohort seed")
+    parser.add_argument("--keep", help="Directory to write the cohort and outputs to (default: a temporary one)")
+    args = parser.parse_args()
+
+    model, feature_order = load_model_and_features()
+    config = deployed_threshold_config()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.keep or tmp
+        os.makedirs(directory, exist_ok=True)
+        paths = _write_cohort(directory, args.rows, args.seed)
+        sizes = ", ".join(f"{kind} {os.path.getsize(path) / 2**20:,.0f} MiB" for kind, path in paths.items())
+        print(f"{args.rows:,} rows ({sizes})")
+
+        runs = [
+            ("pandas CSV", lambda t: _pandas_csv(paths["csv"], os.path.join(directory, "scored.csv"),
+                                                 model, feature_order, config, t)),
+            ("Arrow CSV -> Parquet", lambda t: score_file(paths["csv"], os.path.join(directory, "scored_csv.parquet"),
+                                                          model, feature_order, config, timings=t)),
+            ("Parquet -> Parquet", lambda t: score_file(paths["parquet"], os.path.join(directory, "scored.parquet"),
+                                                        model, feature_order, config, timings=t)),
+            ("Arrow -> Arrow", lambda t: score_file(paths["arrow"], os.path.join(directory, "scored.arrow"),
+                                                    model, feature_order, config, timings=t)),
+        ]
+        for name, run in runs:
+            timings = {}
+            started = time.perf_counter()
+            run(timings)
+            seconds = time.perf_counter() - started
+            stages = ", ".join(f"{stage} {timings.get(stage, 0.0):.1f} s" for stage in ("read", "encode", "predict", "write"))
+            print(f"{name:>21}: {args.rows / seconds:>10,.0f} rows/s ({seconds:.1f} s: {stages})")
+
+
+if __name__ == "__main__":
+    main()
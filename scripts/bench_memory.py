@@ -0,0 +1,106 @@
+"""
+Measure the memory of a batch scoring job per row, and what it comes to at
+job size.
+
+Writes a synthetic cohort CSV (utils/synthetic.py), then measures for the
+sample, and extrapolates to --job-rows:
+
+- raw profiles read with pd.read_csv as Python strings vs categoricals;
+- the encoded feature matrix as a float64 DataFrame, uint8 and bit-packed;
+- peak memory (tracemalloc, which sees NumPy and pandas buffers) of
+  encoding and scoring: a float64 DataFrame in one model call vs a
+  bit-packed matrix encoded in chunks and unpacked block by block
+  (strokesense.model.predict_proba).
+
+Usage (from the repository root):
+    python -m scripts.bench_memory
+    python -m scripts.bench_memory --rows 2000000 --job-rows 50000000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from strokesense.model import predict_proba
+from strokesense.packed import pack_rows
+from utils.columnar import TEXT_COLUMNS
+from utils.encoding import encode_frame
+from utils.model import load_model_and_features
+from utils.parallel import SCORE_CHUNK_ROWS
+from utils.synthetic import write_cohort
+
+
+def _peak(run):
+    """(result, peak traced bytes, seconds) of run()."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = run()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak, seconds
+
+
+def _encode_packed(raw, feature_order):
+    """Bit-packed features, encoded SCORE_CHUNK_ROWS at a time as utils.parallel does."""
+    packed = np.empty((len(raw), (len(feature_order) + 7) // 8), dtype=np.uint8)
+    for start in range(0, len(raw), SCORE_CHUNK_ROWS):
+        packed[start:start + SCORE_CHUNK_ROWS] = pack_rows(
+            encode_frame(raw.iloc[start:start + SCORE_CHUNK_ROWS], feature_order, dtype=np.uint8))
+    return packed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Sample cohort size to measure")
+    parser.add_argument("--job-rows", type=int, default=50_000_000, help="Job size to extrapolate to")
+    parser.add_argument("--seed", type=int, default=0, help="Cohort seed")
+    args = parser.parse_args()
+
+    model, feature_order = load_model_and_features()
+    rows = []
+
+    def report(name, n_bytes, baseline=None):
+        per_row = n_bytes / args.rows
+        saving = f"  x{baseline / n_bytes:.1f} smaller" if baseline else ""
+        rows.append(f"{name:<34} {per_row:>8.1f} B/row {per_row * args.job_rows / 2**30:>9.2f} GiB{saving}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cohort.csv")
+        write_cohort(path, args.rows, args.seed)
+        strings = pd.read_csv(path)
+        categorical = pd.read_csv(path, dtype={name: "category" for name in TEXT_COLUMNS})
+    raw_strings = strings.memory_usage(deep=True).sum()
+    report("raw profiles, strings", raw_strings)
+    report("raw profiles, categoricals", categorical.memory_usage(deep=True).sum(), raw_strings)
+    del strings
+
+    as_float = pd.DataFrame(encode_frame(categorical, feature_order), columns=feature_order)
+    as_uint8 = encode_frame(categorical, feature_order, dtype=np.uint8)
+    packed = pack_rows(as_uint8)
+    report("features, float64 DataFrame", as_float.memory_usage().sum())
+    report("features, uint8", as_uint8.nbytes, as_float.memory_usage().sum())
+    report("features, bit-packed", packed.nbytes, as_float.memory_usage().sum())
+    del as_uint8
+
+    # Scoring peaks include the input matrix, which is built inside run()
+    reference, float_peak, float_seconds = _peak(lambda: model.predict_proba(
+        pd.DataFrame(encode_frame(categorical, feature_order), columns=feature_order))[:, 1])
+    del as_float
+    blocked, packed_peak, packed_seconds = _peak(lambda: predict_proba(
+        model, _encode_packed(categorical, feature_order), feature_order, n_features=len(feature_order)))
+    report("scoring peak, float64 one call", float_peak)
+    report("scoring peak, packed in blocks", packed_peak, float_peak)
+
+    print(f"{args.rows:,} rows measured, extrapolated to {args.job_rows:,}")
+    print("\n".join(rows))
+    print(f"Scoring time: float64 one call {float_seconds:.2f} s, packed in blocks {packed_seconds:.2f} s "
+          f"(max |Δ| {np.abs(reference - blocked).max():.1e})")
+
+
+if __name__ == "__main__":
+    main()
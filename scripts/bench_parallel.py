@@ -0,0 +1,60 @@
+"""
+Measure how batch scoring scales with processes.
+
+Builds a synthetic cohort of raw profiles (utils/synthetic.py), encodes it once into shared
+memory and scores it in-process and with process pools of increasing size
+(utils/parallel.py). Reports rows per second, the speed-up over one worker
+and the largest difference from the in-process probabilities. Pool timings
+include starting the workers and loading the model in each.
+
+Usage (from the repository root):
+    python -m scripts.bench_parallel
+    python -m scripts.bench_parallel --rows 2000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from strokesense.model import predict_proba
+from utils.model import DEFAULT_FEATURES_PATH, deployed_model_path, load_model_and_features
+from utils.parallel import encode_to_shared, score_shared
+from utils.synthetic import cohort_frame
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic cohort size")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1))) or [1],
+                        help="Pool sizes to time")
+    parser.add_argument("--seed", type=int, default=0, help="Cohort seed")
+    args = parser.parse_args()
+
+    model, feature_order = load_model_and_features()
+    raw = cohort_frame(args.rows, args.seed)
+    started = time.perf_counter()
+    with encode_to_shared(raw, feature_order) as X:
+        print(f"{args.rows:,} rows on {cores} cores; encoded into shared memory in {time.perf_counter() - started:.2f} s")
+
+        started = time.perf_counter()
+        reference = predict_proba(model, X.array, feature_order, n_features=len(feature_order))
+        seconds = time.perf_counter() - started
+        print(f"{'in-process':>11}: {args.rows / seconds:>12,.0f} rows/s")
+
+        base = None
+        for workers in args.workers:
+            started = time.perf_counter()
+            probabilities = score_shared(X, deployed_model_path(), DEFAULT_FEATURES_PATH, workers=workers)
+            seconds = time.perf_counter() - started
+            rate = args.rows / seconds
+            if base is None:  # Per-worker rate of the smallest pool
+                base = rate / workers
+            print(f"{workers:>3} workers: {rate:>12,.0f} rows/s, speed-up x{rate / base:.2f} vs one worker "
+                  f"(max |Δ| vs in-process {np.abs(probabilities - reference).max():.1e})")
+
+
+if __name__ == "__main__":
+    main()
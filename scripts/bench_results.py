@@ -0,0 +1,75 @@
+"""
+Measure what the Results page education section costs per run.
+
+Starts the page under a real Streamlit server with a sample profile in
+session state and records, over the app's websocket, the time and bytes of
+the first run and of full reruns (what any button outside a fragment
+triggers), then opens each education topic in turn. A page that builds
+every topic up front ships them all on each run and switches topics in the
+browser; a page that renders topics on demand pays for one topic when it
+is opened, as a fragment rerun.
+
+Usage (from the repository root):
+    python -m scripts.bench_results
+    git show HEAD~1:pages/Results.py > /tmp/Results-before.py
+    python -m scripts.bench_results --page /tmp/Results-before.py
+"""
+import argparse
+import asyncio
+
+import numpy as np
+
+from scripts.page_bench import connect, find_widget, run_once, serve
+
+TOPIC_LABEL = "Stroke risk education topic"
+
+
+async def _benchmark(port, reruns):
+    from streamlit.proto.ClientState_pb2 import ClientState
+
+    ws = await connect(port)
+    first = await run_once(ws, ClientState())
+    full = [await run_once(ws, ClientState()) for _ in range(reruns)]
+    try:
+        widget_id, fragment_id = find_widget(first[2], "radio", TOPIC_LABEL)
+        options = next(
+            f.delta.new_element.radio.options for f in first[2]
+            if f.WhichOneof("type") == "delta" and f.delta.WhichOneof("type") == "new_element"
+            and f.delta.new_element.WhichOneof("type") == "radio" and f.delta.new_element.radio.id == widget_id)
+    except RuntimeError:
+        options = []
+    topics = []
+    for index, option in enumerate(options):
+        state = ClientState(fragment_id=fragment_id)
+        widget = state.widget_states.widgets.add()
+        widget.id = widget_id
+        widget.int_value = index
+        seconds, received, _ = await run_once(ws, state)
+        topics.append((option, seconds, received))
+    ws.close()
+    return first, full, topics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", default="pages/Results.py", help="Page script to measure")
+    parser.add_argument("--reruns", type=int, default=5, help="Full reruns to time")
+    args = parser.parse_args()
+
+    with serve(args.page) as port:
+        first, full, topics = asyncio.run(_benchmark(port, args.reruns))
+
+    timings = np.array([seconds for seconds, _, _ in full])
+    sizes = np.array([received for _, received, _ in full])
+    print(f"Page: {args.page}")
+    print(f"First run: {first[0] * 1000:.0f} ms, {first[1] / 1024:.1f} KiB")
+    print(f"Full reruns ({args.reruns}): median {np.median(timings) * 1000:.1f} ms, "
+          f"{sizes.mean() / 1024:.1f} KiB sent per rerun")
+    if not topics:
+        print("Education topics: all built on every run, switched in the browser")
+    for option, seconds, received in topics:
+        print(f"Open {option}: {seconds * 1000:.1f} ms, {received / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Measure what one What-If slider move costs: server time and websocket bytes.
+
+Starts the page under a real Streamlit server with a sample profile in
+session state, connects a minimal client over the app's websocket, moves
+the "Target Weight" slider back and forth and records, per interaction, the
+time from sending the change until the run finishes and the bytes of every
+message the server sends back. Widgets inside a fragment are rerun the way
+the browser does it (fragment-only).
+
+Usage (from the repository root):
+    python -m scripts.bench_whatif
+    git show HEAD~1:pages/What-If.py > /tmp/What-If-before.py
+    python -m scripts.bench_whatif --page /tmp/What-If-before.py
+"""
+import argparse
+import asyncio
+
+import numpy as np
+
+from scripts.page_bench import connect, find_widget, run_once, serve
+
+
+async def _benchmark(port, interactions, slider_label):
+    from streamlit.proto.ClientState_pb2 import ClientState
+
+    ws = await connect(port)
+    first_seconds, first_bytes, messages = await run_once(ws, ClientState())
+    widget_id, fragment_id = find_widget(messages, "slider", slider_label)
+
+    timings, sizes = [], []
+    for i in range(interactions):
+        state = ClientState(fragment_id=fragment_id)
+        widget = state.widget_states.widgets.add()
+        widget.id = widget_id
+        widget.double_array_value.data.append(70 + i % 2 * 10)
+        seconds, received, _ = await run_once(ws, state)
+        timings.append(seconds)
+        sizes.append(received)
+    ws.close()
+    return first_seconds, first_bytes, bool(fragment_id), np.array(timings), np.array(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", default="pages/What-If.py", help="Page script to measure")
+    parser.add_argument("--interactions", type=int, default=30, help="Slider moves to time")
+    parser.add_argument("--slider", default="Target Weight (kg)", help="Label of the slider to move")
+    args = parser.parse_args()
+
+    with serve(args.page) as port:
+        first_seconds, first_bytes, fragment, timings, sizes = asyncio.run(
+            _benchmark(port, args.interactions, args.slider))
+
+    print(f"Page: {args.page}")
+    print(f"First run: {first_seconds * 1000:.0f} ms, {first_bytes / 1024:.1f} KiB")
+    print(f"Slider moves ({args.interactions}, {'fragment rerun' if fragment else 'full rerun'}): "
+          f"median {np.median(timings) * 1000:.1f} ms, p95 {np.percentile(timings, 95) * 1000:.1f} ms, "
+          f"{sizes.mean() / 1024:.1f} KiB sent per move")
+
+
+if __name__ == "__main__":
+    main()
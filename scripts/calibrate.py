@@ -0,0 +1,97 @@
+"""
+Calibrate the Results page threshold and risk bands on a labelled dataset.
+
+Scores the dataset once with the deployed model (or --model), sweeps every
+candidate threshold and writes the chosen threshold, bands and supporting
+metrics to config/thresholds.json, which the app loads at startup.
+data/best_model.pkl is calibrated at the top level of the file; any other
+model under "models", keyed by its version, so every model is classified
+with its own threshold.
+
+Usage (from the repository root):
+    python -m scripts.calibrate healthcare-dataset-stroke-data.csv
+    python -m scripts.calibrate data.csv --objective recall --min-recall 0.8 --sweep-csv sweep.csv
+    python -m scripts.calibrate data.csv --model data/models/logreg/best_model.pkl
+"""
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from utils.calibration import (
+    THRESHOLD_CONFIG_PATH, DEFAULT_THRESHOLD_CONFIG,
+    band_summary, calibration_bins, pick_threshold, threshold_sweep,
+)
+from utils.dataset import load_labelled_dataset
+from utils.encoding import encode_frame
+from utils.model import DEFAULT_FEATURES_PATH, DEFAULT_MODEL_PATH, deployed_model_path, load_model_files, model_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", help="Labelled CSV (Kaggle layout or raw form fields plus a label column)")
+    parser.add_argument("--label", default="stroke", help="Name of the 0/1 outcome column")
+    parser.add_argument("--model", default=None, help="Model to calibrate (default: the deployed model)")
+    parser.add_argument("--features", default=DEFAULT_FEATURES_PATH, help="Feature columns of --model")
+    parser.add_argument("--objective", default="f1", choices=["f1", "precision", "recall"],
+                        help="Metric the chosen threshold maximises")
+    parser.add_argument("--min-recall", type=float, default=None,
+                        help="Only consider thresholds with at least this recall")
+    parser.add_argument("--bands", type=float, nargs=3, default=DEFAULT_THRESHOLD_CONFIG["bands"],
+                        metavar=("LOW", "HIGH", "CRITICAL"), help="Risk %% band edges")
+    parser.add_argument("--n-bins", type=int, default=10, help="Calibration bins")
+    parser.add_argument("--out", default=THRESHOLD_CONFIG_PATH, help="Config file to write")
+    parser.add_argument("--sweep-csv", default=None, help="Also write the full threshold sweep here")
+    args = parser.parse_args()
+
+    # Score the whole dataset in a single batch
+    raw, y_true = load_labelled_dataset(args.dataset, label=args.label)
+    model_path = args.model or deployed_model_path()
+    model, feature_order = load_model_files(model_path, args.features)
+    X = pd.DataFrame(encode_frame(raw, feature_order), columns=feature_order)
+    y_prob = model.predict_proba(X)[:, 1]
+
+    sweep = threshold_sweep(y_true, y_prob)
+    best = pick_threshold(sweep, objective=args.objective, min_recall=args.min_recall)
+    bins = calibration_bins(y_true, y_prob, n_bins=args.n_bins)
+    band_count, band_rate = band_summary(y_true, y_prob, args.bands)
+
+    config = {
+        "threshold": float(best["threshold"]),
+        "bands": [float(b) for b in args.bands],
+        "band_labels": DEFAULT_THRESHOLD_CONFIG["band_labels"],
+        "objective": args.objective,
+        "min_recall": args.min_recall,
+        "dataset": {"path": args.dataset, "rows": int(len(y_true)), "positives": int(y_true.sum())},
+        "metrics": {k: (float(best[k]) if k in ("precision", "recall", "f1") else int(best[k]))
+                    for k in ("tp", "fp", "fn", "tn", "precision", "recall", "f1")},
+        "band_stats": [
+            {"label": label, "count": int(c), "observed_rate": None if pd.isna(r) else float(r)}
+            for label, c, r in zip(DEFAULT_THRESHOLD_CONFIG["band_labels"], band_count, band_rate)
+        ],
+        "calibration": bins.astype(object).where(bins.notna(), None).to_dict(orient="records"),
+    }
+    # Keep the calibrations of the other models in the file
+    existing = {}
+    if os.path.exists(args.out):
+        with open(args.out, "r") as f:
+            existing = json.load(f)
+    models = existing.get("models", {})
+    if os.path.abspath(model_path) == os.path.abspath(DEFAULT_MODEL_PATH):
+        document = {**config, "models": models} if models else config
+    else:
+        document = {**existing, "models": {**models, model_version(model_path): {"model": model_path, **config}}}
+    with open(args.out, "w") as f:
+        json.dump(document, f, indent=2)
+    if args.sweep_csv:
+        sweep.to_csv(args.sweep_csv, index=False)
+
+    print(f"Scored {len(y_true)} rows, {len(sweep)} candidate thresholds")
+    print(f"Chosen threshold {config['threshold']:.4f}: "
+          f"precision {best['precision']:.3f}, recall {best['recall']:.3f}, f1 {best['f1']:.3f}")
+    print(f"Wrote {args.out} for {model_path} (version {model_version(model_path)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Check that every scoring path of scripts/score.py gives the same result.
+
+Writes a synthetic cohort CSV (utils/synthetic.py) with the Yes/No
+condition flags written as 0/1 and as Yes/No, scores it CSV to CSV
+in-process and with a process pool, and CSV to Parquet through Arrow, and
+compares the probabilities row by row. The risk cubes (--cube) of the CSV
+and Parquet runs are compared with a pandas groupby of the scored rows by
+age group and condition. Exits with status 1 on a mismatch.
+
+Usage (from the repository root):
+    python -m scripts.check_score_paths
+    python -m scripts.check_score_paths --rows 200000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from utils.risk_cube import AGE_EDGES, DIMENSIONS, RiskCube
+from utils.synthetic import cohort_frame
+
+FLAG_COLUMNS = ["hypertension", "heart_disease", "diabetes"]
+
+
+def _score(dataset, out, *extra):
+    subprocess.run([sys.executable, "-m", "scripts.score", dataset, "--out", out, *extra],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return pd.read_csv(out) if out.endswith(".csv") else pd.read_parquet(out)
+
+
+def _cube_mismatches(cube_path, scored, cohort):
+    """Cube cells of age group x conditions whose count or mean risk differ from a groupby."""
+    by = ["age_group", *FLAG_COLUMNS]
+    got = RiskCube.load(cube_path).breakdown(by)
+    valid = scored["error_code"].to_numpy() == 0
+    rows = cohort[valid].assign(
+        probability=scored["probability"].to_numpy()[valid],
+        age_group=pd.cut(cohort["age"][valid], [*AGE_EDGES, np.inf], right=False, labels=DIMENSIONS["age_group"][1]))
+    expected = rows.groupby(by, observed=True)["probability"].agg(["size", "mean"]).reset_index()
+    merged = got.merge(expected.astype({name: str for name in FLAG_COLUMNS}), on=by, how="left").fillna({"size": 0})
+    wrong = (merged["patients"] != merged["size"]) | ~np.isclose(merged["mean_risk"], merged["mean"], equal_nan=True)
+    return int(wrong.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="Synthetic cohort size")
+    parser.add_argument("--seed", type=int, default=0, help="Cohort seed")
+    args = parser.parse_args()
+
+    cohort = cohort_frame(args.rows, args.seed)
+    numeric = cohort.assign(**{name: (cohort[name] == "Yes").astype(int) for name in FLAG_COLUMNS})
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = None
+        for flags, frame in [("Yes/No", cohort), ("0/1", numeric)]:
+            dataset = os.path.join(tmp, "cohort.csv")
+            frame.to_csv(dataset, index=False)
+            cubes = {"CSV -> CSV": os.path.join(tmp, "cube_csv.npz"), "CSV -> Parquet": os.path.join(tmp, "cube_pq.npz")}
+            runs = {
+                "CSV -> CSV": _score(dataset, os.path.join(tmp, "scored.csv"), "--cube", cubes["CSV -> CSV"]),
+                "CSV -> CSV, 2 workers": _score(dataset, os.path.join(tmp, "scored_pool.csv"), "--workers", "2"),
+                "CSV -> Parquet": _score(dataset, os.path.join(tmp, "scored.parquet"), "--cube", cubes["CSV -> Parquet"]),
+            }
+            for name, scored in runs.items():
+                probability = scored["probability"].to_numpy(np.float64)
+                reference = probability if reference is None else reference
+                differ = int(np.count_nonzero(~np.isclose(probability, reference, rtol=0, atol=1e-12, equal_nan=True)))
+                failures += differ > 0
+                print(f"{flags:>6} flags, {name:<22}: {differ} rows differ from Yes/No CSV -> CSV")
+            for name, cube_path in cubes.items():
+                wrong = _cube_mismatches(cube_path, runs[name], cohort)
+                failures += wrong > 0
+                print(f"{flags:>6} flags, {name:<22}: {wrong} risk cube cells differ from a groupby")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Build and query a memory-mapped scored-cohort store (see utils/cohort_store.py).
+
+"build" turns a scored cohort (scripts/score.py output) into a store
+directory of fixed-width column files with a sorted patient-id index and a
+risk-band index. "lookup" fetches patients by id, "scan" lists a risk band
+highest probability first, and "info" shows the band counts and how long
+opening the store took.
+
+Usage (from the repository root):
+    python -m scripts.score cohort.parquet --out scored.parquet
+    python -m scripts.cohort_store build scored.parquet --store data/cohort_store
+    python -m scripts.cohort_store lookup --store data/cohort_store 1042 77310
+    python -m scripts.cohort_store scan --store data/cohort_store --band Critical --limit 20
+    python -m scripts.cohort_store info --store data/cohort_store
+"""
+import argparse
+import time
+
+from utils.cohort_store import CohortStore, build_store
+from utils.model import deployed_threshold_config, load_model_and_features, model_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build", "lookup", "scan", "info"])
+    parser.add_argument("args", nargs="*", help="build: scored file; lookup: patient ids")
+    parser.add_argument("--store", default="data/cohort_store", help="Store directory")
+    parser.add_argument("--id-column", default="patient_id", help="Patient id column of the scored file (build)")
+    parser.add_argument("--band", help="Risk band to scan (scan); omit for rows that failed validation")
+    parser.add_argument("--limit", type=int, default=20, help="Rows to show (scan)")
+    args = parser.parse_intermixed_args()
+
+    if args.command == "build":
+        if len(args.args) != 1:
+            parser.error("build takes one scored file")
+        _, feature_order = load_model_and_features()
+        started = time.perf_counter()
+        n_rows = build_store(args.args[0], args.store, feature_order, deployed_threshold_config(),
+                             id_column=args.id_column, model_version=model_version())
+        print(f"Stored {n_rows} rows in {args.store} ({time.perf_counter() - started:.1f} s)")
+        return
+
+    started = time.perf_counter()
+    store = CohortStore(args.store)
+    opened = time.perf_counter() - started
+
+    if args.command == "info":
+        print(f"{args.store}: {store.n_rows} rows, model {store.meta['model_version']}, opened in {opened * 1000:.2f} ms")
+        for band, count in store.band_counts().items():
+            print(f"  {band}: {count}")
+    elif args.command == "lookup":
+        for patient_id in args.args:
+            started = time.perf_counter()
+            record = store.lookup(int(patient_id))
+            seconds = time.perf_counter() - started
+            if record is None:
+                print(f"{patient_id}: not found")
+                continue
+            active = [name for name, value in record.pop("profile").items() if value]
+            print(f"{patient_id}: {record} ({seconds * 1e6:.0f} µs)")
+            print(f"  profile: {', '.join(active)}")
+    else:
+        if args.band is not None and args.band not in store.band_labels:
+            parser.error(f"--band must be one of {store.band_labels}")
+        patient_ids, probabilities = store.scan_band(args.band, args.limit)
+        for patient_id, probability in zip(patient_ids, probabilities):
+            print(f"{patient_id}\t{probability:.4f}")
+
+
+if __name__ == "__main__":
+    main()
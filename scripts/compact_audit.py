@@ -0,0 +1,34 @@
+"""
+Compact closed audit log segments into a Parquet file for analytics.
+
+Reads every rotated `logs/audit/audit-*.jsonl` segment, writes them as one
+Parquet file under logs/audit/parquet/ and removes the segments. The segment
+still being written by a running app (`.jsonl.part`) is left alone.
+
+Usage (from the repository root):
+    python -m scripts.compact_audit
+    python -m scripts.compact_audit --keep --include-open
+"""
+import argparse
+
+from utils.audit import AUDIT_DIR, compact_segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=AUDIT_DIR, help="Audit segment directory")
+    parser.add_argument("--out-dir", default=None, help="Parquet output directory (default: <dir>/parquet)")
+    parser.add_argument("--keep", action="store_true", help="Keep the JSONL segments after compaction")
+    parser.add_argument("--include-open", action="store_true",
+                        help="Also compact .part segments (only when no app is writing them)")
+    args = parser.parse_args()
+
+    path, count = compact_segments(args.dir, args.out_dir, delete=not args.keep, include_open=args.include_open)
+    if path is None:
+        print("No closed segments to compact")
+    else:
+        print(f"Compacted {count} records into {path}")
+
+
+if __name__ == "__main__":
+    main()
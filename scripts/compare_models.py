@@ -0,0 +1,76 @@
+"""
+Compare candidate models on quality and serving cost.
+
+Trains (or loads, if already saved) RF, ET, QDA and logistic regression on
+the app's feature layout, then measures single-row latency, batch
+throughput, pickle size and load time next to hold-out precision, recall
+and F1. Results go to data/models/comparison.json, which the app uses to
+pick a model under the latency budget in config/serving.json.
+
+Usage (from the repository root):
+    python -m scripts.compare_models healthcare-dataset-stroke-data.csv
+    python -m scripts.compare_models data.csv --retrain --models qda logreg
+"""
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from utils.benchmark import comparison_table, serving_cost
+from utils.model import file_sha256
+from utils.training import candidate_models, encode_dataset, save_artifacts, train
+
+MODELS_DIR = "data/models"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", help="Labelled CSV (Kaggle layout or raw form fields plus a label column)")
+    parser.add_argument("--label", default="stroke", help="Name of the 0/1 outcome column")
+    parser.add_argument("--models", nargs="+", choices=list(candidate_models()), default=list(candidate_models()),
+                        help="Candidates to compare")
+    parser.add_argument("--models-dir", default=MODELS_DIR, help="Where candidate models are saved")
+    parser.add_argument("--retrain", action="store_true", help="Retrain even if a saved model exists")
+    parser.add_argument("--cache-dir", default=".cache/training", help="Preprocessing cache ('' to disable)")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Grid search workers (-1 for all cores)")
+    parser.add_argument("--single-rows", type=int, default=200, help="Single-row predictions to time")
+    parser.add_argument("--batch-rows", type=int, default=10_000, help="Rows in the throughput batch")
+    args = parser.parse_args()
+
+    os.makedirs(args.models_dir, exist_ok=True)
+    X, _ = encode_dataset(args.dataset, args.label, file_sha256(args.dataset))
+
+    report = []
+    for name in args.models:
+        model_dir = os.path.join(args.models_dir, name)
+        manifest_path = os.path.join(model_dir, "model_manifest.json")
+        if args.retrain or not os.path.exists(manifest_path):
+            print(f"Training {name}...")
+            os.makedirs(model_dir, exist_ok=True)
+            model, manifest = train(args.dataset, label=args.label, cache_dir=args.cache_dir or None,
+                                    n_jobs=args.n_jobs, models=[name])
+            save_artifacts(model, manifest, model_dir)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        print(f"Benchmarking {name}...")
+        model_path = os.path.join(model_dir, "best_model.pkl")
+        report.append({
+            "name": name,
+            "path": model_path,
+            "params": manifest["params"],
+            "quality": manifest["candidates"][name],
+            "serving": serving_cost(model_path, X, n_single=args.single_rows, batch_rows=args.batch_rows),
+        })
+
+    with open(os.path.join(args.models_dir, "comparison.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:.3f}".format):
+        print(comparison_table(report))
+    print(f"Wrote {os.path.join(args.models_dir, 'comparison.json')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Build the training distribution the feature-drift monitor compares against.
+
+Encodes a labelled dataset with the app's feature pipeline and writes the
+share of rows with each one-hot column set to data/drift_reference.json.
+scripts/train.py writes the same file for the data it trains on; use this
+script to point the monitor at a different reference population.
+
+Usage (from the repository root):
+    python -m scripts.drift_reference healthcare-dataset-stroke-data.csv
+"""
+import argparse
+
+from utils.dataset import load_labelled_dataset
+from utils.drift import DRIFT_REFERENCE_PATH, write_reference
+from utils.encoding import encode_frame
+from utils.model import load_model_and_features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", help="Labelled CSV (Kaggle layout or raw form fields plus a label column)")
+    parser.add_argument("--label", default="stroke", help="Name of the 0/1 outcome column")
+    parser.add_argument("--out", default=DRIFT_REFERENCE_PATH, help="Reference file to write")
+    args = parser.parse_args()
+
+    raw, _ = load_labelled_dataset(args.dataset, label=args.label)
+    _, feature_order = load_model_and_features()
+    write_reference(encode_frame(raw, feature_order), feature_order, args.out, source=args.dataset)
+    print(f"Wrote {args.out} from {len(raw)} rows")
+
+
+if __name__ == "__main__":
+    main()
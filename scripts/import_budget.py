@@ -0,0 +1,64 @@
+"""
+Check that the strokesense core package imports quickly and without
+Streamlit, pandas or scikit-learn.
+
+Imports the package in fresh interpreters and reports the median wall time
+of the import (interpreter start-up excluded), the part of it spent on
+top of NumPy, and the heavy modules it pulled in. NumPy is the package's
+one dependency and its import time depends on the machine, so the budget
+applies to the time on top of it. Exits with status 1 when that median
+exceeds the budget or a forbidden module was imported.
+
+Usage (from the repository root):
+    python -m scripts.import_budget
+    python -m scripts.import_budget --budget-ms 10 --runs 15
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+FORBIDDEN = ["streamlit", "pandas", "sklearn", "imblearn", "joblib", "scipy", "plotly"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import numpy
+numpy_done = time.perf_counter()
+import {package}
+done = time.perf_counter()
+print(json.dumps({{"seconds": done - started, "own_seconds": done - numpy_done,
+                  "modules": sorted({{m.split(".")[0] for m in sys.modules}})}}))
+"""
+
+
+def _probe(package):
+    out = subprocess.run([sys.executable, "-c", _PROBE.format(package=package)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--package", default="strokesense", help="Package to import")
+    parser.add_argument("--budget-ms", type=float, default=25.0,
+                        help="Largest acceptable median import time on top of NumPy")
+    parser.add_argument("--runs", type=int, default=9, help="Fresh interpreters to time")
+    args = parser.parse_args()
+
+    probes = [_probe(args.package) for _ in range(args.runs)]
+    median_ms = np.median([p["seconds"] for p in probes]) * 1000
+    own_ms = np.median([p["own_seconds"] for p in probes]) * 1000
+    loaded = sorted(set(FORBIDDEN) & set(probes[0]["modules"]))
+
+    print(f"import {args.package}: median {median_ms:.1f} ms over {args.runs} runs, "
+          f"{own_ms:.1f} ms of it on top of NumPy (budget {args.budget_ms:.0f} ms)")
+    print(f"Heavy modules imported: {', '.join(loaded) or 'none'}")
+    if own_ms > args.budget_ms or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Shared harness for the page benchmarks.
+
+Runs a page under a real Streamlit server with a sample profile in session
+state and talks to it over the app's websocket the way the browser does, so
+a benchmark can time reruns and count the bytes the server sends back.
+"""
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+# Wrapper app: seeds session state as the input form would, then runs the page
+_WRAPPER = """
+import runpy
+import streamlit as st
+from utils.encoding import encode_profile
+
+if "user_inputs" not in st.session_state:
+    st.session_state.user_inputs = encode_profile(
+        62, "Male", 31.0, "Yes", "No", "No", "Married", "Urban", "Private",
+        "Formerly Smoker or Currently Smokes",
+    )
+    st.session_state.form_answers = {{"height": 175, "weight": 95}}
+runpy.run_path({page!r}, run_name="__main__")
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(page):
+    """Run page under a headless Streamlit server; yields the port."""
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        wrapper = os.path.join(tmp, "bench_app.py")
+        with open(wrapper, "w") as f:
+            f.write(textwrap.dedent(_WRAPPER.format(page=os.path.abspath(page))))
+        env = dict(os.environ, PYTHONPATH=os.getcwd(), STROKESENSE_METRICS_PORT="0")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", wrapper, "--server.headless", "true",
+             "--server.port", str(port), "--browser.gatherUsageStats", "false",
+             "--server.enableWebsocketCompression", "false"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            yield port
+        finally:
+            server.terminate()
+            server.wait()
+
+
+async def connect(port):
+    """Websocket to the app, retried until the server is up."""
+    from tornado.websocket import websocket_connect
+
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    for _ in range(100):
+        try:
+            return await websocket_connect(url)
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Streamlit server did not start")
+
+
+async def run_once(ws, client_state):
+    """Send one rerun request; return (seconds, bytes received, messages)."""
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    msg = BackMsg()
+    msg.rerun_script.CopyFrom(client_state)
+    started = time.perf_counter()
+    await ws.write_message(msg.SerializeToString(), binary=True)
+    received, messages = 0, []
+    while True:
+        payload = await ws.read_message()
+        if payload is None:
+            raise RuntimeError("Websocket closed by the server")
+        received += len(payload)
+        forward = ForwardMsg()
+        forward.ParseFromString(payload)
+        messages.append(forward)
+        if forward.WhichOneof("type") == "script_finished" and forward.script_finished in (
+                ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY):
+            return time.perf_counter() - started, received, messages
+
+
+def find_widget(messages, kind, label):
+    """Widget id and fragment id of the first element of a kind with the given label."""
+    for forward in messages:
+        if forward.WhichOneof("type") != "delta" or forward.delta.WhichOneof("type") != "new_element":
+            continue
+        element = forward.delta.new_element
+        if element.WhichOneof("type") == kind and getattr(element, kind).label == label:
+            return getattr(element, kind).id, forward.delta.fragment_id
+    raise RuntimeError(f"No {kind} labelled {label!r} on the page")
@@ -0,0 +1,38 @@
+"""
+Write a synthetic cohort of raw profiles for benchmarks and load tests.
+
+Records have the fields of the input form (age, gender, height, weight,
+hypertension, heart disease, diabetes, marital status, residence, work
+type, smoking) and are drawn from the marginals and dependencies in
+utils/synthetic.py. A JSON spec file replaces fields of the default spec,
+e.g. {"invalid_fraction": 0.02} or {"gender": {"Male": 0.7, "Female": 0.3}}.
+The same seed and spec always give the same rows.
+
+Usage (from the repository root):
+    python -m scripts.synthesize --rows 5000000 --out cohort.parquet
+    python -m scripts.synthesize --rows 100000 --out cohort.csv --seed 7 --spec my_spec.json
+"""
+import argparse
+import os
+import time
+
+from utils.synthetic import load_cohort_spec, write_cohort
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Cohort size")
+    parser.add_argument("--out", required=True, help="CSV, Parquet or Arrow file to write (format from the extension)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--spec", help="JSON file with spec fields to override")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    write_cohort(args.out, args.rows, args.seed, load_cohort_spec(args.spec))
+    seconds = time.perf_counter() - started
+    print(f"Wrote {args.rows:,} rows to {args.out} ({os.path.getsize(args.out) / 2**20:,.1f} MiB) "
+          f"in {seconds:.1f} s, {args.rows / seconds:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Rebuild data/best_model.pkl from the labelled stroke dataset.
+
+Encodes the data with the app's feature pipeline, grid-searches Random
+Forest, Extra Trees and QDA (each behind SMOTE) across all cores, refits the
+best model and writes best_model.pkl, feature_columns.pkl,
+model_manifest.json and drift_reference.json. Logistic regression, which
+scripts.compare_models benchmarks, is searched only when named in --models.
+Runs offline on CPU; the same data and seed give the same model.
+
+Usage (from the repository root):
+    python -m scripts.train healthcare-dataset-stroke-data.csv
+    python -m scripts.train data.csv --models qda --n-jobs 4 --out-dir /tmp/model
+"""
+import argparse
+
+from utils.training import SEED, TRAINING_MODELS, candidate_models, save_artifacts, train
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", help="Labelled CSV (Kaggle layout or raw form fields plus a label column)")
+    parser.add_argument("--label", default="stroke", help="Name of the 0/1 outcome column")
+    parser.add_argument("--out-dir", default="data", help="Where to write the model artefacts")
+    parser.add_argument("--cache-dir", default=".cache/training", help="Preprocessing cache ('' to disable)")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Grid search workers (-1 for all cores)")
+    parser.add_argument("--cv", type=int, default=5, help="Cross-validation folds")
+    parser.add_argument("--seed", type=int, default=SEED, help="Random seed")
+    parser.add_argument("--select-on", default="f1", choices=["f1", "precision", "recall", "accuracy"],
+                        help="Cross-validated metric used to pick the model")
+    parser.add_argument("--models", nargs="+", choices=list(candidate_models()), default=None,
+                        help=f"Candidates to search (default: {' '.join(TRAINING_MODELS)})")
+    args = parser.parse_args()
+
+    model, manifest = train(
+        args.dataset, label=args.label, cache_dir=args.cache_dir or None, n_jobs=args.n_jobs,
+        cv=args.cv, seed=args.seed, select_on=args.select_on, models=args.models,
+    )
+    manifest = save_artifacts(model, manifest, args.out_dir)
+
+    for name, result in manifest["candidates"].items():
+        test = result["test"]
+        print(f"{name:>4}: cv {args.select_on} {result['cv'][args.select_on]:.3f} | test precision "
+              f"{test['precision']:.3f}, recall {test['recall']:.3f}, f1 {test['f1']:.3f} | {result['best_params']}")
+    print(f"Selected {manifest['model']}; wrote artefacts to {args.out_dir}/")
+
+
+if __name__ == "__main__":
+    main()
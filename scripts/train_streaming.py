@@ -0,0 +1,61 @@
+"""
+Train the QDA model from a CSV too large to load at once.
+
+Reads the data in chunks, encodes each chunk with the app's feature
+pipeline and accumulates per-class counts, means and scatter matrices. The
+statistics are saved so new data can be folded in later without re-reading
+the old data, and a QDA model is written in place of best_model.pkl.
+
+Usage (from the repository root):
+    python -m scripts.train_streaming registry.csv --chunksize 200000
+    python -m scripts.train_streaming new_rows.csv --update
+"""
+import argparse
+import os
+
+import joblib
+import pandas as pd
+
+from utils.dataset import iter_labelled_chunks
+from utils.encoding import encode_frame
+from utils.streaming_qda import StreamingQDA
+from utils.training import FEATURE_COLUMNS
+
+STATS_PATH = "data/qda_stats.npz"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", help="Labelled CSV (Kaggle layout or raw form fields plus a label column)")
+    parser.add_argument("--label", default="stroke", help="Name of the 0/1 outcome column")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows read per chunk")
+    parser.add_argument("--stats", default=STATS_PATH, help="Sufficient statistics file")
+    parser.add_argument("--update", action="store_true", help="Add to the existing statistics instead of starting over")
+    parser.add_argument("--reg-param", type=float, default=0.4, help="QDA regularisation (new statistics only)")
+    parser.add_argument("--priors", default="balanced", choices=["balanced", "empirical"],
+                        help="Class priors (new statistics only); balanced matches SMOTE training")
+    parser.add_argument("--out-dir", default="data", help="Where to write best_model.pkl and feature_columns.pkl")
+    args = parser.parse_args()
+
+    if args.update:
+        stats = StreamingQDA.load(args.stats)
+        print(f"Loaded statistics for {stats.counts.sum()} rows from {args.stats}")
+    else:
+        stats = StreamingQDA(len(FEATURE_COLUMNS), reg_param=args.reg_param, priors=args.priors)
+
+    rows = 0
+    for raw, y in iter_labelled_chunks(args.dataset, label=args.label, chunksize=args.chunksize):
+        stats.partial_fit(encode_frame(raw, FEATURE_COLUMNS), y)
+        rows += len(y)
+        print(f"  {rows} rows", end="\r")
+    print(f"Added {rows} rows; class counts now {dict(zip(stats.classes.tolist(), stats.counts.tolist()))}")
+
+    stats.save(args.stats)
+    model = stats.to_estimator(FEATURE_COLUMNS)
+    joblib.dump(model, os.path.join(args.out_dir, "best_model.pkl"))
+    joblib.dump(pd.Index(FEATURE_COLUMNS), os.path.join(args.out_dir, "feature_columns.pkl"))
+    print(f"Wrote {args.stats} and {args.out_dir}/best_model.pkl")
+
+
+if __name__ == "__main__":
+    main()
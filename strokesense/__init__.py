@@ -0,0 +1,21 @@
+"""
+StrokeSense core: BMI, risk derivation, encoding, validation, model loading
+and prediction, with no Streamlit or pandas import.
+
+Batch jobs and workers can use this package directly; the Streamlit pages
+and the utils helpers build on it. Importing it only pulls in NumPy
+(scikit-learn and joblib load when a model is first loaded).
+"""
+from strokesense.bmi import bmi_category_of, bmi_status, calculate_bmi
+from strokesense.encoding import encode_profile, profile_matrix
+from strokesense.model import file_sha256, load_artifact, predict_deduplicated, predict_proba
+from strokesense.packed import pack_rows, unpack_rows
+from strokesense.risk import age_gender_to_risk, age_to_age_group, health_risk_level, stress_level_category
+from strokesense.validation import error_messages, validate_columns, validate_profile
+
+__all__ = [
+    "age_gender_to_risk", "age_to_age_group", "bmi_category_of", "bmi_status", "calculate_bmi",
+    "encode_profile", "error_messages", "file_sha256", "health_risk_level", "load_artifact",
+    "pack_rows", "predict_deduplicated", "predict_proba", "profile_matrix", "stress_level_category",
+    "unpack_rows", "validate_columns", "validate_profile",
+]
@@ -0,0 +1,39 @@
+def bmi_category_of(bmi):
+    """Model BMI bucket for a (rounded) BMI value."""
+    return "Normal weight" if bmi < 25 else "Obese"
+
+
+def calculate_bmi(height_cm, weight_kg):
+    """
+    BMI from height and weight.
+
+    Args:
+        height_cm (float): Height in centimetres.
+        weight_kg (float): Weight in kilograms.
+
+    Returns:
+        tuple: (BMI rounded to 2 decimals, model BMI category)
+    """
+    height_m = height_cm / 100
+    if height_m <= 0:
+        raise ValueError("Height must be greater than 0 cm")
+    if weight_kg <= 0:
+        raise ValueError("Weight must be greater than 0 kg")
+    bmi = round(weight_kg / (height_m ** 2), 2)
+    return bmi, bmi_category_of(bmi)
+
+
+def bmi_status(bmi):
+    """
+    Health message for a BMI value.
+
+    Returns:
+        tuple: (level, message), where level is "success", "warning" or "error".
+    """
+    if bmi < 18.5:
+        return "warning", f"Your BMI is {bmi}. You are underweight. Please consult a healthcare provider for advice."
+    if bmi < 25:  # Normal weight range
+        return "success", f"Your BMI is {bmi}. You have a normal weight. Keep maintaining a healthy lifestyle!"
+    if bmi < 30:  # Overweight range
+        return "warning", f"Your BMI is {bmi}. You are overweight. Consider lifestyle changes to improve your health."
+    return "error", f"Your BMI is {bmi}. You are obese. Please consult a healthcare provider for guidance."
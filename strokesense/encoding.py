@@ -0,0 +1,90 @@
+import numpy as np
+
+from strokesense.bmi import bmi_category_of
+from strokesense.risk import age_gender_to_risk, age_to_age_group, health_risk_level, stress_level_category
+
+# One-hot categories, in the order the model was trained on
+AGE_GROUPS = ["Middle (50-64)", "Older (65+)", "Young (<49)"]
+WORK_TYPES = ["Employed", "Private", "Self-employed", "Unemployed"]
+BMI_CATEGORIES = ["Normal weight", "Obese"]
+HEALTH_RISKS = ["Low Risk", "Moderate Risk"]
+AGE_GENDER_RISKS = ["High Risk", "Low Risk", "Moderate Risk", "Very High Risk"]
+STRESS_LEVELS = ["Low Stress", "Moderate Stress"]
+ONE_HOT_PREFIXES = ["age_group_", "health_risk_", "work_type_", "bmi_category_", "age_gender_risk_", "stress_level_"]
+
+# Raw profile fields as collected by the input form
+RAW_COLUMNS = [
+    "age", "gender", "height", "weight", "hypertension", "heart_disease", "diabetes",
+    "marital_status", "residence_type", "work_type", "smoking_status",
+]
+
+
+def encode_profile(age, gender, bmi, hypertension, heart_disease, diabetes,
+                   marital_status, residence_type, work_type, smoking_status):
+    """
+    Encode a single raw profile from the input form into model features.
+
+    Args:
+        age (int): Age in years.
+        gender (str): "Male" or "Female".
+        bmi (float): Body mass index.
+        hypertension, heart_disease, diabetes (str): "Yes" or "No".
+        marital_status (str): "Married" or "Single".
+        residence_type (str): "Rural" or "Urban".
+        work_type (str): "Self-employed", "Unemployed", "Private" or "Government Job".
+        smoking_status (str): "Non-smoker" or "Formerly Smoker or Currently Smokes".
+
+    Returns:
+        dict: Feature name -> 0/1, keyed like the columns in feature_columns.pkl.
+    """
+    hypertension_val = 1 if hypertension == "Yes" else 0
+    heart_disease_val = 1 if heart_disease == "Yes" else 0
+    diabetes_val = 1 if diabetes == "Yes" else 0
+
+    # Derived risk features
+    age_group = age_to_age_group(age)
+    age_gender_risk = age_gender_to_risk(age_group, gender)
+    health_risk = health_risk_level(hypertension_val, heart_disease_val, diabetes_val)
+
+    work_type_mapped = "Employed" if work_type == "Government Job" else work_type
+    marital_status_text = "Yes" if marital_status == "Married" else "No"
+    stress_level = stress_level_category(work_type_mapped, marital_status_text, residence_type, health_risk)
+    bmi_category = bmi_category_of(bmi)
+
+    user_inputs = {}
+    user_inputs["hypertension"] = hypertension_val
+    user_inputs["heart_disease"] = heart_disease_val
+    user_inputs["ever_married"] = 1 if marital_status == "Married" else 0
+    user_inputs["smoking_status"] = 1 if smoking_status == "Formerly Smoker or Currently Smokes" else 0
+    user_inputs["diabetes"] = diabetes_val
+
+    # Encode categorical features
+    for ag in AGE_GROUPS:
+        user_inputs[f"age_group_{ag}"] = 1 if age_group == ag else 0
+    for wt in WORK_TYPES:
+        user_inputs[f"work_type_{wt}"] = 1 if work_type_mapped == wt else 0
+    for bc in BMI_CATEGORIES:
+        user_inputs[f"bmi_category_{bc}"] = 1 if bmi_category == bc else 0
+    for hr in HEALTH_RISKS:
+        user_inputs[f"health_risk_{hr}"] = 1 if health_risk == hr else 0
+    for agr in AGE_GENDER_RISKS:
+        user_inputs[f"age_gender_risk_{agr}"] = 1 if age_gender_risk == agr else 0
+    for sl in STRESS_LEVELS:
+        user_inputs[f"stress_level_{sl}"] = 1 if stress_level == sl else 0
+    return user_inputs
+
+
+def profile_matrix(profiles, feature_order):
+    """
+    Encoded profiles as a model input matrix.
+
+    Args:
+        profiles (list): Encoded profiles (dicts from encode_profile).
+        feature_order (list): Model feature columns.
+
+    Returns:
+        np.ndarray: (n_profiles, n_features) float64; missing features and
+            missing values are 0.
+    """
+    X = np.array([[profile.get(f, 0) for f in feature_order] for profile in profiles], dtype=np.float64)
+    return np.nan_to_num(X.reshape(len(profiles), len(feature_order)), nan=0.0)
@@ -0,0 +1,107 @@
+import time
+
+import numpy as np
+
+from strokesense.packed import PREDICT_BLOCK_ROWS, float_blocks, pack_rows, row_keys
+
+
+def file_sha256(path):
+    """Hex digest of a file, used to tie artefacts to the data they came from."""
+    import hashlib  # OpenSSL start-up is a few ms; only pay it when hashing
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_artifact(path):
+    """
+    Load a joblib artefact (model or feature list).
+
+    joblib, and scikit-learn with it, are imported here rather than at
+    package import, so only code that actually loads a model pays for them.
+    """
+    import joblib
+
+    return joblib.load(path)
+
+
+def predict_proba(model, X, feature_order=None, n_features=None, block_rows=PREDICT_BLOCK_ROWS):
+    """
+    Positive-class probability for each row.
+
+    Rows are converted to float64 and scored block_rows at a time, so
+    compact uint8 or bit-packed matrices stay compact until the model
+    call, and the model's temporaries stay cache-sized.
+
+    Args:
+        model: Fitted classifier.
+        X (array): (n_rows, n_features) encoded rows, e.g. from profile_matrix,
+            or bit-packed rows from strokesense.packed.pack_rows.
+        feature_order (list): Column names; rows are passed as a DataFrame
+            with them when the model was fitted on named columns.
+        n_features (int): Features per row when X is bit-packed.
+        block_rows (int): Rows per model call.
+
+    Returns:
+        np.ndarray: (n_rows,) probabilities.
+    """
+    X = np.atleast_2d(np.asarray(X))
+    named = feature_order is not None and getattr(model, "feature_names_in_", None) is not None
+    if named:
+        import pandas as pd
+
+    probabilities = np.empty(len(X), dtype=np.float64)
+    for start, block in float_blocks(X, n_features, block_rows):
+        if named:
+            block = pd.DataFrame(block, columns=list(feature_order), copy=False)
+        probabilities[start:start + len(block)] = model.predict_proba(block)[:, 1]
+    return probabilities
+
+
+def predict_deduplicated(model, X, feature_order=None, n_features=None, stats=None):
+    """
+    predict_proba that scores each distinct row once.
+
+    The model only sees one-hot buckets, so millions of patients share a
+    few thousand feature vectors. Rows are keyed by their packed bits,
+    grouped with np.unique, and the unique rows' probabilities are
+    scattered back to every row.
+
+    Args:
+        model: Fitted classifier.
+        X (array): Encoded rows, or bit-packed rows when n_features is given.
+        feature_order (list): Column names (see predict_proba).
+        n_features (int): Features per row when X is bit-packed.
+        stats (dict): If given, rows, unique_rows, dedupe_seconds and
+            score_seconds are added to it, and row_seconds is set to the
+            model time per row without deduplication, timed once on up to
+            one block of rows (so rows * row_seconds estimates the time
+            scoring every row would have taken). The timing probe's own
+            cost is added to probe_seconds.
+
+    Returns:
+        np.ndarray: (n_rows,) probabilities.
+    """
+    started = time.perf_counter()
+    X = np.atleast_2d(np.asarray(X))
+    n_features = n_features or X.shape[1]
+    packed = X if X.shape[1] < n_features else pack_rows(X)
+    _, first, inverse = np.unique(row_keys(packed), return_index=True, return_inverse=True)
+    deduplicated = time.perf_counter()
+    unique_probabilities = predict_proba(model, packed[first], feature_order, n_features=n_features)
+    scored = time.perf_counter()
+    if stats is not None:
+        for key, value in [("rows", len(X)), ("unique_rows", len(first)),
+                           ("dedupe_seconds", deduplicated - started), ("score_seconds", scored - deduplicated)]:
+            stats[key] = stats.get(key, 0) + value
+        probe = min(len(X), PREDICT_BLOCK_ROWS)
+        if probe > stats.get("probe_rows", 0):
+            predict_proba(model, packed[:probe], feature_order, n_features=n_features)
+            probe_seconds = time.perf_counter() - scored
+            stats["row_seconds"] = probe_seconds / probe
+            stats["probe_rows"] = probe
+            stats["probe_seconds"] = stats.get("probe_seconds", 0) + probe_seconds
+    return unique_probabilities[inverse.ravel()]
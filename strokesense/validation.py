@@ -0,0 +1,67 @@
+from collections import namedtuple
+
+import numpy as np
+
+# A rule passes when low <= value <= high. Each rule owns one bit of the
+# per-row error code, so a code of 0 means the row is valid.
+Rule = namedtuple("Rule", ["bit", "column", "low", "high", "message"])
+
+VALIDATION_RULES = [
+    Rule(1, "height", 100, 250, "• Height must be between 100 and 250 cm."),
+    Rule(2, "weight", 30, 200, "• Weight must be between 30 and 200 kg."),
+    Rule(4, "bmi", 12, 60, "• BMI value is out of a reasonable range. Please check your height and weight."),
+    Rule(8, "age", 18, 100, "• Age must be between 18 and 100."),
+]
+
+
+def validate_columns(columns, rules=VALIDATION_RULES):
+    """
+    Check whole columns against the rules with one NumPy mask per rule.
+
+    Args:
+        columns (mapping): Column name -> values, e.g. a DataFrame. Rules for
+            columns that are not present are skipped; a BMI is derived from
+            height and weight when there is no "bmi" column. Missing values fail.
+        rules (list): Rules to apply.
+
+    Returns:
+        np.ndarray: uint8 error code per row (bitwise OR of failed rule bits).
+    """
+    arrays = {name: np.asarray(columns[name], dtype=np.float64)
+              for name in {rule.column for rule in rules} if name in columns}
+    if "bmi" not in arrays and "height" in arrays and "weight" in arrays:
+        arrays["bmi"] = np.round(arrays["weight"] / (arrays["height"] / 100) ** 2, 2)
+    n_rows = len(next(iter(arrays.values()))) if arrays else 0
+
+    codes = np.zeros(n_rows, dtype=np.uint8)
+    for rule in rules:
+        if rule.column not in arrays:
+            continue
+        values = arrays[rule.column]
+        codes |= np.where((values >= rule.low) & (values <= rule.high), 0, rule.bit).astype(np.uint8)
+    return codes
+
+
+def error_messages(code, rules=VALIDATION_RULES):
+    """Messages for the rules set in a single error code, in rule order."""
+    return [rule.message for rule in rules if int(code) & rule.bit]
+
+
+def validate_profile(**fields):
+    """
+    Validate one user's inputs with the same rules as the batch path.
+
+    Args:
+        **fields: Scalar values, e.g. age=30, height=170, weight=70, bmi=24.2.
+
+    Returns:
+        list: Error messages; empty when all inputs are valid.
+    """
+    code = validate_columns({name: [value] for name, value in fields.items()})[0]
+    return error_messages(code)
+
+
+def error_summary(codes, rules=VALIDATION_RULES):
+    """Number of rows failing each rule, keyed by the rule's column."""
+    codes = np.asarray(codes)
+    return {rule.column: int(np.count_nonzero(codes & rule.bit)) for rule in rules}
@@ -0,0 +1,197 @@
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from utils.metrics import REGISTRY
+from utils.model import model_version
+
+AUDIT_DIR = "logs/audit"
+
+AUDIT_SYNC_WRITES = REGISTRY.counter(
+    "strokesense_audit_sync_writes_total",
+    "Audit records written on the caller's thread because the writer queue stayed full or was stopped.")
+
+
+class AuditLogger:
+    """
+    Append-only prediction log that does not block the caller in normal
+    operation.
+
+    log() puts the record on a bounded queue. When the writer falls behind
+    and the queue stays full for put_timeout seconds, the record is written
+    on the caller's thread instead (counted in
+    strokesense_audit_sync_writes_total), so no record is lost. A
+    background thread drains the queue in batches, writes them as JSON
+    lines to the open segment (`*.jsonl.part`) and renames the segment to `*.jsonl` once it reaches
+    max_segment_bytes or max_segment_age seconds. Closed segments are never
+    written again, so they are safe to compact.
+
+    Args:
+        directory (str): Where segments are written.
+        max_segment_bytes (int): Rotate after this many bytes.
+        max_segment_age (float): Rotate after this many seconds.
+        batch_size (int): Most records written per batch.
+        flush_interval (float): Longest a record waits before being written.
+        max_queued (int): Most records waiting to be written.
+        put_timeout (float): Longest log() waits for room in a full queue.
+    """
+
+    def __init__(self, directory=AUDIT_DIR, max_segment_bytes=16 * 1024 * 1024,
+                 max_segment_age=3600, batch_size=500, flush_interval=1.0, max_queued=10_000,
+                 put_timeout=0.05):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._stopping = threading.Event()
+        self._write_lock = threading.Lock()  # The writer thread and overflowing callers share the segment
+        self._file = None
+        self._path = None
+        self._opened_at = 0.0
+        self._sequence = 0
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, record):
+        """
+        Queue a record (a JSON-serialisable dict); a UTC timestamp is added.
+        Written directly if the queue stays full or the logger is closed.
+        """
+        record = dict(record, ts=datetime.now(timezone.utc).isoformat())
+        if not self._stopping.is_set():
+            try:
+                self._queue.put(record, timeout=self.put_timeout)
+                return
+            except queue.Full:
+                pass
+        AUDIT_SYNC_WRITES.inc()
+        with self._write_lock:
+            self._write([record])
+            if self._stopping.is_set():
+                self._rotate()  # Nothing may be left in an open segment after shutdown
+
+    def close(self, timeout=5.0):
+        """Write everything still queued and close the open segment."""
+        self._stopping.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            stopping = self._stopping.is_set()  # Read before draining, so nothing queued earlier is missed
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=0 if stopping else self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            with self._write_lock:
+                if batch:
+                    self._write(batch)
+                if stopping and not batch:
+                    self._rotate()
+                    return
+                if self._file is not None and time.time() - self._opened_at >= self.max_segment_age:
+                    self._rotate()
+
+    def _write(self, records):
+        if self._file is None:
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+            self._sequence += 1
+            self._path = os.path.join(self.directory, f"audit-{stamp}-{os.getpid()}-{self._sequence:04d}.jsonl.part")
+            self._file = open(self._path, "a", encoding="utf-8")
+            self._opened_at = time.time()
+        self._file.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records))
+        self._file.flush()
+        if self._file.tell() >= self.max_segment_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        """Close the open segment and publish it under its final name."""
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._path, self._path[:-len(".part")])
+        self._file = None
+
+
+@lru_cache(maxsize=None)
+def get_audit_logger():
+    """Process-wide audit logger, started on first use."""
+    return AuditLogger()
+
+
+def audit_prediction(page, user_inputs, feature_order, probability, version=None):
+    """
+    Record one prediction served by the app.
+
+    Args:
+        page (str): Page that served the prediction.
+        user_inputs (dict): Encoded profile.
+        feature_order (list): Model feature columns.
+        probability (float): Predicted stroke probability.
+        version (str): Version of the model that served it (default: production).
+    """
+    get_audit_logger().log({
+        "page": page,
+        "model_version": version or model_version(),
+        "probability": float(probability),
+        "profile": {feature: int(user_inputs.get(feature, 0)) for feature in feature_order},
+    })
+
+
+def compact_segments(directory=AUDIT_DIR, out_dir=None, delete=True, include_open=False):
+    """
+    Merge closed JSONL segments into one Parquet file.
+
+    Profile fields become one int8 column each (prefixed "profile.").
+
+    Args:
+        directory (str): Segment directory.
+        out_dir (str): Where to write Parquet (default: <directory>/parquet).
+        delete (bool): Remove the segments once the Parquet file is written.
+        include_open (bool): Also read `.part` segments, e.g. left by a crash.
+
+    Returns:
+        tuple: (Parquet path or None, number of records)
+    """
+    import pandas as pd
+
+    paths = sorted(glob.glob(os.path.join(directory, "audit-*.jsonl")))
+    if include_open:
+        paths += sorted(glob.glob(os.path.join(directory, "audit-*.jsonl.part")))
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    if not records:
+        return None, 0
+
+    df = pd.json_normalize(records)
+    df["ts"] = pd.to_datetime(df["ts"], utc=True)
+    profile_columns = [c for c in df.columns if c.startswith("profile.")]
+    df[profile_columns] = df[profile_columns].fillna(0).astype("int8")
+    for column in ("page", "model_version"):
+        df[column] = df[column].astype("category")
+    df = df.sort_values("ts", kind="stable")
+
+    out_dir = out_dir or os.path.join(directory, "parquet")
+    os.makedirs(out_dir, exist_ok=True)
+    first, last = (ts.strftime("%Y%m%dT%H%M%S") for ts in (df["ts"].iloc[0], df["ts"].iloc[-1]))
+    out_path = os.path.join(out_dir, f"audit-{first}-{last}-{len(df)}.parquet")
+    df.to_parquet(out_path, index=False)
+    if delete:
+        for path in paths:
+            os.remove(path)
+    return out_path, len(df)
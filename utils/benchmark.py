@@ -0,0 +1,84 @@
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+def _timed(fn, repeat):
+    """Wall-clock seconds of each of `repeat` calls to fn."""
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return timings
+
+
+def serving_cost(model_path, X, n_single=200, batch_rows=10_000, n_load=3):
+    """
+    Measure what it costs to serve a saved model.
+
+    Single rows are scored as one-row DataFrames, exactly as the Results and
+    What-If pages do, so per-call overhead is included.
+
+    Args:
+        model_path (str): Pickled model file.
+        X (pd.DataFrame): Encoded rows to sample inputs from.
+        n_single (int): Single-row predictions to time.
+        batch_rows (int): Rows in the throughput batch (sampled with replacement).
+        n_load (int): Loads to time; the fastest is reported.
+
+    Returns:
+        dict: single_row_p50_ms, single_row_p95_ms, batch_rows_per_s, size_bytes, load_ms
+    """
+    load = _timed(lambda: joblib.load(model_path), n_load)
+    model = joblib.load(model_path)
+
+    rows = [X.iloc[[i % len(X)]] for i in range(n_single)]
+    model.predict_proba(rows[0])  # Warm-up
+    single = np.empty(n_single)
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        model.predict_proba(row)
+        single[i] = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    batch = X.iloc[rng.integers(0, len(X), batch_rows)]
+    batch_time = _timed(lambda: model.predict_proba(batch), 3).min()
+
+    return {
+        "single_row_p50_ms": float(np.percentile(single, 50) * 1e3),
+        "single_row_p95_ms": float(np.percentile(single, 95) * 1e3),
+        "batch_rows_per_s": float(batch_rows / batch_time),
+        "size_bytes": os.path.getsize(model_path),
+        "load_ms": float(load.min() * 1e3),
+    }
+
+
+def select_model(report, latency_budget_ms=None, metric="f1", latency_key="single_row_p95_ms"):
+    """
+    Pick the best-scoring model whose latency fits the budget.
+
+    Args:
+        report (list): Entries written by scripts/compare_models.py.
+        latency_budget_ms (float): Maximum latency, or None for no limit.
+        metric (str): Hold-out metric to maximise.
+        latency_key (str): Which latency figure the budget applies to.
+
+    Returns:
+        dict: The chosen entry, or None if nothing fits the budget.
+    """
+    fits = [entry for entry in report
+            if latency_budget_ms is None or entry["serving"][latency_key] <= latency_budget_ms]
+    if not fits:
+        return None
+    return max(fits, key=lambda entry: entry["quality"]["test"][metric])
+
+
+def comparison_table(report):
+    """Quality and serving cost side by side, one row per model."""
+    return pd.DataFrame([
+        {"model": entry["name"], **entry["quality"]["test"], **entry["serving"]} for entry in report
+    ]).set_index("model")
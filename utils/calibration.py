@@ -0,0 +1,160 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+THRESHOLD_CONFIG_PATH = "config/thresholds.json"
+
+# Used when no calibrated config has been written yet
+DEFAULT_THRESHOLD_CONFIG = {
+    "threshold": 0.55,
+    "bands": [20, 50, 75],  # Risk % edges between Low / Average / High / Critical
+    "band_labels": ["Low", "Average", "High", "Critical"],
+}
+
+
+def threshold_sweep(y_true, y_prob):
+    """
+    Confusion counts and metrics for every distinct score used as a threshold.
+
+    Scores are sorted once; cumulative sums of positives and negatives then
+    give the counts above every cut point without looping over thresholds.
+
+    Args:
+        y_true (array): 0/1 labels.
+        y_prob (array): Predicted probabilities of the positive class.
+
+    Returns:
+        pd.DataFrame: One row per candidate, highest score first, with the
+        threshold, tp/fp/fn/tn, precision, recall and f1. A row predicts
+        positive for every score strictly greater than its threshold, the
+        same comparison used on the Results page.
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+    order = np.argsort(-y_prob, kind="mergesort")
+    scores = y_prob[order]
+    tps = np.cumsum(y_true[order])
+    fps = np.arange(1, len(scores) + 1) - tps
+
+    # Last position of each run of equal scores is a distinct cut point
+    last = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tp, fp = tps[last], fps[last]
+    positives, negatives = tps[-1], fps[-1]
+    fn, tn = positives - tp, negatives - fp
+
+    # Threshold half way to the next lower score, so "prob > threshold"
+    # selects exactly the scores at or above the cut point
+    lower = np.r_[scores[last[1:]], 0.0]
+    thresholds = (scores[last] + lower) / 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(positives > 0, tp / max(positives, 1), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+
+    return pd.DataFrame({
+        "threshold": thresholds, "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+        "precision": precision, "recall": recall, "f1": f1,
+    })
+
+
+def calibration_bins(y_true, y_prob, n_bins=10):
+    """
+    Reliability table: mean predicted vs observed positive rate per bin.
+
+    Args:
+        y_true (array): 0/1 labels.
+        y_prob (array): Predicted probabilities.
+        n_bins (int): Number of equal-width probability bins.
+
+    Returns:
+        pd.DataFrame: lower, upper, count, mean_predicted, observed_rate.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+    edges = np.linspace(0, 1, n_bins + 1)
+    idx = np.clip((y_prob * n_bins).astype(np.int64), 0, n_bins - 1)
+    count = np.bincount(idx, minlength=n_bins)
+    prob_sum = np.bincount(idx, weights=y_prob, minlength=n_bins)
+    pos_sum = np.bincount(idx, weights=y_true, minlength=n_bins)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_predicted = np.where(count > 0, prob_sum / count, np.nan)
+        observed_rate = np.where(count > 0, pos_sum / count, np.nan)
+    return pd.DataFrame({
+        "lower": edges[:-1], "upper": edges[1:], "count": count,
+        "mean_predicted": mean_predicted, "observed_rate": observed_rate,
+    })
+
+
+def band_summary(y_true, y_prob, bands):
+    """Count and observed positive rate for each risk band (edges in %)."""
+    y_true = np.asarray(y_true, dtype=np.float64)
+    idx = np.searchsorted(np.asarray(bands, dtype=np.float64), np.asarray(y_prob) * 100, side="right")
+    count = np.bincount(idx, minlength=len(bands) + 1)
+    pos_sum = np.bincount(idx, weights=y_true, minlength=len(bands) + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        observed_rate = np.where(count > 0, pos_sum / count, np.nan)
+    return count, observed_rate
+
+
+def pick_threshold(sweep, objective="f1", min_recall=None):
+    """
+    Choose a row of threshold_sweep.
+
+    Args:
+        sweep (pd.DataFrame): Output of threshold_sweep.
+        objective (str): Metric column to maximise.
+        min_recall (float): If given, only thresholds reaching this recall qualify.
+
+    Returns:
+        pd.Series: The chosen row.
+    """
+    candidates = sweep
+    if min_recall is not None:
+        candidates = sweep[sweep["recall"] >= min_recall]
+        if candidates.empty:
+            raise ValueError(f"No threshold reaches a recall of {min_recall}")
+    return candidates.loc[candidates[objective].idxmax()]
+
+
+@lru_cache(maxsize=None)
+def load_threshold_config(path=THRESHOLD_CONFIG_PATH, model_version=None):
+    """
+    Load the classification threshold and risk bands, once per process.
+    Falls back to DEFAULT_THRESHOLD_CONFIG if the file does not exist.
+
+    The top level of the file is the calibration of data/best_model.pkl.
+    Other models are calibrated under "models", keyed by model version.
+
+    Args:
+        path (str): Threshold config file.
+        model_version (str): Version of the model to classify; its entry
+            under "models", if any, overrides the top level.
+    """
+    config = dict(DEFAULT_THRESHOLD_CONFIG)
+    try:
+        with open(path, "r") as f:
+            config.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    models = config.pop("models", {})
+    if model_version in models:
+        config.update(models[model_version])
+    return config
+
+
+@lru_cache(maxsize=None)
+def _calibrated_versions(path, mtime):
+    with open(path, "r") as f:
+        return frozenset(json.load(f).get("models", {}))
+
+
+def calibrated_versions(path=THRESHOLD_CONFIG_PATH):
+    """Model versions with their own entry in the threshold config (re-read when the file changes)."""
+    try:
+        return _calibrated_versions(path, os.path.getmtime(path))
+    except FileNotFoundError:
+        return frozenset()
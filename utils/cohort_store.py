@@ -0,0 +1,223 @@
+import json
+import os
+
+import numpy as np
+
+from strokesense.packed import pack_rows, unpack_rows
+from utils.columnar import ArrowColumns, read_batches
+from utils.encoding import encode_columns
+
+# Fixed-width column files of a store, all in scored-row order
+_COLUMNS = {
+    "patient_id": np.int64,
+    "probability": np.float32,
+    "band": np.int8,  # Index into band_labels; -1 for rows that failed validation
+    "error_code": np.uint8,
+    "profile": np.uint8,  # Encoded profile, bit-packed with strokesense.packed.pack_rows
+}
+
+
+class CohortStoreWriter:
+    """
+    Builds a scored-cohort store: one fixed-width binary file per column
+    plus two indexes, described by meta.json.
+
+    Rows are appended batch by batch; close() sorts the patient ids into
+    id_index.i8 / id_rows.u4 (for binary-search lookups) and groups rows
+    by risk band, highest probability first, into band_rows.u4 with the
+    band offsets in meta.json.
+
+    Args:
+        directory (str): Store directory (created if missing).
+        feature_order (list): Model feature columns of the packed profiles.
+        band_labels (list): Risk band names, in band index order.
+        model_version (str): Model that produced the probabilities.
+    """
+
+    def __init__(self, directory, feature_order, band_labels, model_version=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.meta = {
+            "n_rows": 0,
+            "feature_order": list(feature_order),
+            "band_labels": list(band_labels),
+            "model_version": model_version,
+        }
+        self._files = {name: open(self._path(name), "wb") for name in _COLUMNS}
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def append(self, patient_ids, probabilities, bands, error_codes, X):
+        """
+        Add scored rows.
+
+        Args:
+            patient_ids (array): Integer patient ids.
+            probabilities (array): Probability per row (NaN where invalid).
+            bands (array): Band index per row (-1 where invalid).
+            error_codes (array): Validation error code per row.
+            X (array): (n_rows, n_features) 0/1 encoded profiles.
+        """
+        values = {
+            "patient_id": patient_ids,
+            "probability": probabilities,
+            "band": bands,
+            "error_code": error_codes,
+            "profile": pack_rows(X),
+        }
+        for name, dtype in _COLUMNS.items():
+            np.ascontiguousarray(values[name], dtype=dtype).tofile(self._files[name])
+        self.meta["n_rows"] += len(patient_ids)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        n_rows = self.meta["n_rows"]
+        patient_ids = np.fromfile(self._path("patient_id"), dtype=np.int64)
+        order = np.argsort(patient_ids, kind="stable")
+        patient_ids[order].tofile(os.path.join(self.directory, "id_index.i8"))
+        order.astype(np.uint32).tofile(os.path.join(self.directory, "id_rows.u4"))
+
+        bands = np.fromfile(self._path("band"), dtype=np.int8)
+        probabilities = np.fromfile(self._path("probability"), dtype=np.float32)
+        by_band = np.lexsort((-probabilities, bands))
+        by_band.astype(np.uint32).tofile(os.path.join(self.directory, "band_rows.u4"))
+        self.meta["band_offsets"] = np.searchsorted(
+            bands[by_band], np.arange(-1, len(self.meta["band_labels"]) + 1)).tolist()
+        self.meta["profile_bytes"] = (len(self.meta["feature_order"]) + 7) // 8
+        with open(os.path.join(self.directory, "meta.json"), "w") as f:
+            json.dump(self.meta, f, indent=2)
+        return n_rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CohortStore:
+    """
+    Read side of a scored-cohort store.
+
+    Every file is memory-mapped, so opening costs the same for any number
+    of rows and only the pages a query touches are read. Patient lookups
+    are a binary search over the sorted id index (O(log n)); band scans
+    slice the band index.
+
+    Args:
+        directory (str): Store written by CohortStoreWriter.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.n_rows = self.meta["n_rows"]
+        self.feature_order = self.meta["feature_order"]
+        self.band_labels = self.meta["band_labels"]
+
+        def mapped(name, dtype, shape=None):
+            if self.n_rows == 0:
+                return np.zeros(shape or (0,), dtype=dtype)
+            return np.memmap(os.path.join(directory, name), dtype=dtype, mode="r", shape=shape or (self.n_rows,))
+
+        for name, dtype in _COLUMNS.items():
+            if name != "profile":
+                setattr(self, name, mapped(f"{name}.bin", dtype))
+        self.profile = mapped("profile.bin", np.uint8, (self.n_rows, self.meta["profile_bytes"]))
+        self._id_index = mapped("id_index.i8", np.int64)
+        self._id_rows = mapped("id_rows.u4", np.uint32)
+        self._band_rows = mapped("band_rows.u4", np.uint32)
+
+    def rows_of(self, patient_ids):
+        """Row of each patient id (-1 where the id is not in the store)."""
+        patient_ids = np.atleast_1d(np.asarray(patient_ids, dtype=np.int64))
+        positions = np.searchsorted(self._id_index, patient_ids)
+        found = positions < self.n_rows
+        found[found] = self._id_index[positions[found]] == patient_ids[found]
+        rows = np.full(len(patient_ids), -1, dtype=np.int64)
+        rows[found] = self._id_rows[positions[found]]
+        return rows
+
+    def profiles(self, rows):
+        """Unpacked 0/1 encoded profiles of the given rows, in feature_order."""
+        return unpack_rows(self.profile[rows], len(self.feature_order))
+
+    def lookup(self, patient_id):
+        """
+        One patient's scored record.
+
+        Returns:
+            dict or None: patient_id, probability, risk_band, error_code and
+                profile (feature -> 0/1); None when the id is not stored.
+        """
+        row = int(self.rows_of([patient_id])[0])
+        if row < 0:
+            return None
+        band = int(self.band[row])
+        return {
+            "patient_id": int(self.patient_id[row]),
+            "probability": None if band < 0 else float(self.probability[row]),
+            "risk_band": None if band < 0 else self.band_labels[band],
+            "error_code": int(self.error_code[row]),
+            "profile": dict(zip(self.feature_order, self.profiles([row])[0].tolist())),
+        }
+
+    def band_rows(self, risk_band):
+        """Rows in a risk band (None: rows that failed validation), highest probability first."""
+        band = -1 if risk_band is None else self.band_labels.index(risk_band)
+        offsets = self.meta["band_offsets"]
+        return self._band_rows[offsets[band + 1]:offsets[band + 2]]
+
+    def scan_band(self, risk_band, limit=None):
+        """
+        Patients in a risk band, highest probability first.
+
+        Returns:
+            tuple: (patient ids, probabilities) arrays.
+        """
+        rows = np.asarray(self.band_rows(risk_band)[:limit], dtype=np.int64)
+        return np.asarray(self.patient_id[rows]), np.asarray(self.probability[rows])
+
+    def band_counts(self):
+        """Number of stored rows per risk band."""
+        offsets = np.diff(self.meta["band_offsets"])
+        return dict(zip(self.band_labels, offsets[1:].tolist()))
+
+
+def build_store(scored_path, directory, feature_order, config, id_column="patient_id", model_version=None):
+    """
+    Build a store from a scored Parquet/Arrow/CSV file (scripts/score.py output).
+
+    Profiles are re-encoded from the raw columns the scored file keeps, and
+    bands are recomputed from the probabilities with the configured edges.
+
+    Args:
+        scored_path (str): Scored cohort file.
+        directory (str): Store directory.
+        feature_order (list): Model feature columns.
+        config (dict): Threshold config (see utils.calibration).
+        id_column (str): Integer patient id column; without it the row
+            number is the patient id.
+        model_version (str): Recorded in meta.json.
+
+    Returns:
+        int: Rows stored.
+    """
+    edges = np.asarray(config["bands"], dtype=np.float64)
+    start = 0
+    with CohortStoreWriter(directory, feature_order, config["band_labels"], model_version) as writer:
+        for batch in read_batches(scored_path):
+            n = batch.num_rows
+            patient_ids = (batch.column(id_column).to_numpy(zero_copy_only=False).astype(np.int64)
+                           if id_column in batch.schema.names else np.arange(start, start + n, dtype=np.int64))
+            codes = batch.column("error_code").to_numpy(zero_copy_only=False)
+            probabilities = np.nan_to_num(batch.column("probability").to_numpy(zero_copy_only=False), nan=0.0)
+            bands = np.searchsorted(edges, probabilities * 100, side="right").astype(np.int8)
+            bands[codes != 0] = -1
+            probabilities[codes != 0] = np.nan
+            X = encode_columns(ArrowColumns(batch), feature_order, dtype=np.uint8)
+            writer.append(patient_ids, probabilities, bands, codes, X)
+            start += n
+    return start
@@ -0,0 +1,232 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from strokesense.validation import validate_columns
+from strokesense.model import predict_deduplicated
+from utils.encoding import FLAG_TRUE, encode_columns
+
+ARROW_BATCH_ROWS = 1 << 18
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+# Text fields of the input form, read from Parquet as dictionary columns
+TEXT_COLUMNS = ["gender", "hypertension", "heart_disease", "diabetes", "marital_status",
+                "residence_type", "work_type", "smoking_status"]
+
+
+def file_format(path):
+    """"arrow", "parquet" or "csv", from the file extension."""
+    lower = path.lower()
+    if lower.endswith(ARROW_SUFFIXES):
+        return "arrow"
+    return "csv" if lower.endswith(".csv") else "parquet"
+
+
+class ArrowColumns:
+    """
+    Column access for utils.encoding.encode_columns over an Arrow record batch.
+
+    Numeric columns without nulls are viewed as NumPy arrays without
+    copying. Text columns are compared through their dictionary: each
+    distinct value is compared once and rows are matched by integer index,
+    so no Python string is created per row.
+    """
+
+    def __init__(self, batch):
+        self.batch = batch
+        self._codes = {}
+
+    def __len__(self):
+        return self.batch.num_rows
+
+    def __contains__(self, name):
+        return name in self.batch.schema.names
+
+    def numeric(self, name):
+        column = self.batch.column(name)
+        if pa.types.is_dictionary(column.type):
+            column = column.dictionary_decode()
+        return column.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+
+    def _dictionary(self, name):
+        if name not in self._codes:
+            column = self.batch.column(name)
+            if not pa.types.is_dictionary(column.type):
+                column = pc.dictionary_encode(column)
+            indices = pc.fill_null(column.indices, -1).to_numpy()
+            self._codes[name] = indices, column.dictionary.to_pylist()
+        return self._codes[name]
+
+    def equals(self, name, value):
+        indices, dictionary = self._dictionary(name)
+        if value not in dictionary:
+            return np.zeros(len(indices), dtype=bool)
+        return indices == dictionary.index(value)
+
+    def flag(self, name):
+        column_type = self.batch.schema.field(name).type
+        if pa.types.is_dictionary(column_type) or pa.types.is_string(column_type) or pa.types.is_large_string(column_type):
+            return np.logical_or.reduce([self.equals(name, value) for value in FLAG_TRUE]).astype(np.int8)
+        return (self.numeric(name) == 1).astype(np.int8)
+
+
+def read_batches(path, batch_rows=ARROW_BATCH_ROWS):
+    """
+    Record batches of a cohort file (Parquet, Arrow IPC or CSV).
+
+    Arrow IPC files are memory-mapped, so their batches point into the
+    page cache. Parquet text columns are read dictionary-encoded. CSV goes
+    through Arrow's multithreaded parser.
+
+    Yields:
+        pa.RecordBatch
+    """
+    kind = file_format(path)
+    if kind == "arrow":
+        with pa.memory_map(path) as source:
+            reader = ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+    elif kind == "csv":
+        reader = pa_csv.open_csv(path, read_options=pa_csv.ReadOptions(block_size=64 << 20))
+        yield from reader
+    else:
+        parquet = pq.ParquetFile(path, memory_map=True, read_dictionary=TEXT_COLUMNS)
+        yield from parquet.iter_batches(batch_size=batch_rows)
+
+
+def validate_batch(columns):
+    """Validation error code per row of an ArrowColumns batch."""
+    return validate_columns({name: columns.numeric(name) for name in ("age", "height", "weight", "bmi")
+                             if name in columns})
+
+
+def scored_batch(batch, codes, probabilities, config):
+    """
+    The input batch with error_code, probability, prediction and risk_band
+    columns appended. Invalid rows get nulls; risk_band is
+    dictionary-encoded over the configured band labels.
+
+    Args:
+        batch (pa.RecordBatch): Raw input rows.
+        codes (np.ndarray): Validation error code per row (0 = valid).
+        probabilities (np.ndarray): Probability per row (ignored where invalid).
+        config (dict): Threshold config (see utils.calibration).
+    """
+    invalid = codes != 0
+    bands = np.searchsorted(np.asarray(config["bands"], dtype=np.float64), probabilities * 100, side="right")
+    columns = {
+        "error_code": pa.array(codes),
+        "probability": pa.array(probabilities, mask=invalid),
+        "prediction": pa.array((probabilities > config["threshold"]).astype(np.int8), mask=invalid),
+        "risk_band": pa.DictionaryArray.from_arrays(
+            pa.array(bands.astype(np.int8), mask=invalid), pa.array(config["band_labels"])),
+    }
+    return pa.RecordBatch.from_arrays(batch.columns + list(columns.values()),
+                                      names=batch.schema.names + list(columns))
+
+
+class BatchWriter:
+    """
+    Writes record batches to Parquet, Arrow IPC or CSV (by extension).
+
+    The file is opened with the first batch's schema. Dictionary columns
+    are kept for Parquet. The IPC file format needs one dictionary per
+    column for the whole file, so input text columns (whose dictionaries
+    differ between Parquet batches) are written there as plain values;
+    risk_band keeps its fixed dictionary. CSV has no dictionaries.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.kind = file_format(path)
+        self._writer = None
+
+    def write(self, batch):
+        if self.kind != "parquet":
+            decode = [name for name, column in zip(batch.schema.names, batch.columns)
+                      if pa.types.is_dictionary(column.type) and (self.kind == "csv" or name in TEXT_COLUMNS)]
+            batch = pa.RecordBatch.from_arrays(
+                [c.dictionary_decode() if name in decode else c for name, c in zip(batch.schema.names, batch.columns)],
+                names=batch.schema.names)
+        if self._writer is None:
+            if self.kind == "arrow":
+                self._writer = ipc.new_file(self.path, batch.schema)
+            elif self.kind == "csv":
+                self._writer = pa_csv.CSVWriter(self.path, batch.schema)
+            else:
+                self._writer = pq.ParquetWriter(self.path, batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def _stage(timings, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def score_file(in_path, out_path, model, feature_order, config, batch_rows=ARROW_BATCH_ROWS, timings=None,
+               stats=None, cube=None):
+    """
+    Validate, encode and score a cohort file batch by batch.
+
+    Args:
+        in_path (str): Parquet, Arrow IPC or CSV input with the raw form fields.
+        out_path (str): Parquet, Arrow IPC or CSV output (see BatchWriter).
+        model: Fitted classifier.
+        feature_order (list): Model feature columns.
+        config (dict): Threshold config (see utils.calibration).
+        batch_rows (int): Rows per Parquet batch.
+        timings (dict): If given, seconds spent in read, encode, predict
+            and write are added to it.
+        stats (dict): If given, deduplication stats of every batch are
+            added to it (see strokesense.model.predict_deduplicated).
+        cube (utils.risk_cube.RiskCube): If given, every batch is added to it.
+
+    Returns:
+        tuple: (rows read, valid rows scored, uint8 error codes of every row)
+    """
+    all_codes = []
+    batches = read_batches(in_path, batch_rows)
+    with BatchWriter(out_path) as writer:
+        while True:
+            with _stage(timings, "read"):
+                batch = next(batches, None)
+            if batch is None:
+                break
+            with _stage(timings, "encode"):
+                columns = ArrowColumns(batch)
+                codes = validate_batch(columns)
+                valid = codes == 0
+                X = encode_columns(columns, feature_order, dtype=np.uint8)[valid]
+            with _stage(timings, "predict"):
+                probabilities = np.zeros(batch.num_rows)
+                if valid.any():
+                    probabilities[valid] = predict_deduplicated(model, X, feature_order, stats=stats)
+            if cube is not None:
+                with _stage(timings, "cube"):
+                    cube.add(columns, probabilities, valid, config)
+            with _stage(timings, "write"):
+                writer.write(scored_batch(batch, codes, probabilities, config))
+            all_codes.append(codes)
+    codes = np.concatenate(all_codes) if all_codes else np.zeros(0, dtype=np.uint8)
+    return len(codes), int(np.count_nonzero(codes == 0)), codes
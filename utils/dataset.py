@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+# Kaggle stroke dataset has no diabetes flag; an average glucose level at or
+# above the fasting diabetes cut-off (mg/dL) is treated as diabetic.
+DIABETES_GLUCOSE_THRESHOLD = 126
+
+# Kaggle work types -> input form work types
+KAGGLE_WORK_TYPES = {
+    "Private": "Private",
+    "Self-employed": "Self-employed",
+    "Govt_job": "Government Job",
+    "children": "Unemployed",
+    "Never_worked": "Unemployed",
+}
+KAGGLE_SMOKERS = ["formerly smoked", "smokes"]
+
+
+def from_kaggle(df):
+    """
+    Convert the Kaggle healthcare-dataset-stroke-data.csv layout into raw
+    profiles shaped like the input form (see utils.encoding.RAW_COLUMNS).
+
+    Args:
+        df (pd.DataFrame): Kaggle stroke dataset.
+
+    Returns:
+        pd.DataFrame: Raw profiles with a "bmi" column and the "stroke" label.
+    """
+    df = df[df["gender"].isin(["Male", "Female"])]  # The app only collects Male/Female
+    bmi = pd.to_numeric(df["bmi"], errors="coerce")
+    raw = pd.DataFrame({
+        "age": df["age"].to_numpy(np.float64),
+        "gender": df["gender"].to_numpy(),
+        "bmi": bmi.fillna(bmi.median()).round(2).to_numpy(),
+        "hypertension": df["hypertension"].to_numpy(np.int8),
+        "heart_disease": df["heart_disease"].to_numpy(np.int8),
+        "diabetes": (df["avg_glucose_level"] >= DIABETES_GLUCOSE_THRESHOLD).to_numpy(np.int8),
+        "marital_status": np.where(df["ever_married"] == "Yes", "Married", "Single"),
+        "residence_type": df["Residence_type"].to_numpy(),
+        "work_type": df["work_type"].map(KAGGLE_WORK_TYPES).fillna("Unemployed").to_numpy(),
+        "smoking_status": np.where(df["smoking_status"].isin(KAGGLE_SMOKERS),
+                                   "Formerly Smoker or Currently Smokes", "Non-smoker"),
+        "stroke": df["stroke"].to_numpy(np.int8),
+    })
+    return raw
+
+
+def load_labelled_dataset(path, label="stroke"):
+    """
+    Load a labelled CSV, either in the Kaggle layout or already in the raw
+    input form layout with a label column.
+
+    Args:
+        path (str): CSV file.
+        label (str): Name of the 0/1 outcome column.
+
+    Returns:
+        tuple: (raw profiles DataFrame, label array)
+    """
+    return _split_label(pd.read_csv(path), label)
+
+
+def iter_labelled_chunks(path, label="stroke", chunksize=100_000):
+    """
+    Stream a labelled CSV in chunks, in the same layouts as load_labelled_dataset.
+    For the Kaggle layout, missing BMIs are filled with the chunk median.
+
+    Yields:
+        tuple: (raw profiles DataFrame, label array) per chunk
+    """
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        yield _split_label(chunk, label)
+
+
+def _split_label(df, label):
+    """Normalise a frame to raw profiles and separate the label column."""
+    if "avg_glucose_level" in df.columns:
+        df = from_kaggle(df)
+    y = df[label].to_numpy(np.int8)
+    return df.drop(columns=[label]).reset_index(drop=True), y
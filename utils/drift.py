@@ -0,0 +1,160 @@
+import json
+import logging
+import threading
+from functools import lru_cache
+
+import numpy as np
+from scipy.stats import chi2
+
+from utils.encoding import feature_groups
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DRIFT_REFERENCE_PATH = "data/drift_reference.json"
+
+DRIFT_PSI = REGISTRY.gauge("strokesense_feature_psi", "Population stability index vs training.", ["group"])
+DRIFT_ALERTS = REGISTRY.counter("strokesense_drift_alerts_total", "Drift checks that raised an alert.", ["group"])
+
+
+def population_stability(observed, expected, eps=1e-4):
+    """PSI between two proportion vectors."""
+    observed = np.clip(observed, eps, None)
+    expected = np.clip(expected, eps, None)
+    return float(np.sum((observed - expected) * np.log(observed / expected)))
+
+
+class DriftMonitor:
+    """
+    One-hot frequency counts of recent traffic compared against the training mix.
+
+    Only a count per column and a row total are kept, so memory does not
+    grow with traffic and no raw profile is stored. Counts are kept per
+    window of check_every rows: when a window fills, each feature group is
+    compared with its training proportions using PSI and a chi-square
+    goodness-of-fit test, and the window starts again from zero. Each check
+    therefore sees only recent rows, so the test's power stays fixed, a
+    recent shift is not diluted by older traffic, and an alert stops once
+    traffic returns to normal.
+
+    Args:
+        feature_order (list): Model columns.
+        reference (dict): Training rate of each column (share of rows with a 1).
+        check_every (int): Rows per window; a check runs when a window fills.
+        min_rows (int): Rows a window needs before it can raise an alert.
+        psi_threshold (float): PSI above this is drift (0.2 is the usual cut-off).
+        p_value (float): Chi-square p-value below this is drift.
+    """
+
+    def __init__(self, feature_order, reference, check_every=200, min_rows=200,
+                 psi_threshold=0.2, p_value=0.001):
+        self.feature_order = list(feature_order)
+        self.reference = np.array([reference.get(f, 0.0) for f in self.feature_order])
+        self.groups = feature_groups(self.feature_order)
+        self.check_every = check_every
+        self.min_rows = min_rows
+        self.psi_threshold = psi_threshold
+        self.p_value = p_value
+        self.counts = np.zeros(len(self.feature_order), dtype=np.int64)  # Current window
+        self.rows = 0
+        self.total_rows = 0
+        self.last_report = {}
+        self.alert_handlers = [self._log_alert]
+        self._lock = threading.Lock()
+
+    def update(self, X):
+        """
+        Add encoded rows.
+
+        Args:
+            X (array): One encoded row, or a (n_rows, n_features) matrix, in feature_order.
+        """
+        X = np.atleast_2d(np.asarray(X))
+        with self._lock:
+            self.counts += (X == 1).sum(axis=0)
+            self.rows += len(X)
+            self.total_rows += len(X)
+            window = self._take_window() if self.rows >= self.check_every else None
+        if window is not None:
+            self.check(*window)
+
+    def _take_window(self):
+        """Counts and rows of the current window, which starts again from zero. Call with the lock held."""
+        window = self.counts.copy(), self.rows
+        self.counts[:] = 0
+        self.rows = 0
+        return window
+
+    def _proportions(self, indices, rates):
+        """Category shares of a group; binary flags get their 0 share added."""
+        shares = rates[indices]
+        if len(indices) == 1:
+            shares = np.array([1 - shares[0], shares[0]])
+        return shares / max(shares.sum(), 1e-12)
+
+    def check(self, counts=None, rows=None):
+        """
+        Compare a window's frequencies with the reference and raise alerts.
+
+        Args:
+            counts (array): Per-column counts of the window; by default the
+                current window, which is then reset.
+            rows (int): Rows in the window.
+
+        Returns:
+            dict: group -> {"psi", "chi2", "p_value", "drift"}
+        """
+        if counts is None:
+            with self._lock:
+                counts, rows = self._take_window()
+        if rows == 0:
+            return {}
+        rates = counts / rows
+        report = {}
+        for group, indices in self.groups.items():
+            observed = self._proportions(indices, rates)
+            expected = self._proportions(indices, self.reference)
+            statistic = float(rows * np.sum((observed - expected) ** 2 / np.clip(expected, 1e-12, None)))
+            p = float(chi2.sf(statistic, max(len(observed) - 1, 1)))
+            psi = population_stability(observed, expected)
+            drift = rows >= self.min_rows and (psi > self.psi_threshold or p < self.p_value)
+            report[group] = {"psi": psi, "chi2": statistic, "p_value": p, "drift": drift}
+            DRIFT_PSI.labels(group=group).set(psi)
+            if drift:
+                DRIFT_ALERTS.labels(group=group).inc()
+                for handler in self.alert_handlers:
+                    handler(group, report[group], rows)
+        self.last_report = report
+        return report
+
+    def _log_alert(self, group, result, rows):
+        logger.warning("Feature drift in %s over the last %d rows (%d in total): PSI %.3f, chi2 p=%.2g",
+                       group, rows, self.total_rows, result["psi"], result["p_value"])
+
+
+def write_reference(X, feature_order, path=DRIFT_REFERENCE_PATH, source=None):
+    """Save the share of rows with a 1 in each column of an encoded matrix."""
+    rates = np.asarray(X, dtype=np.float64).mean(axis=0)
+    with open(path, "w") as f:
+        json.dump({"source": source, "rows": int(len(X)),
+                   "feature_rates": dict(zip(feature_order, np.round(rates, 6).tolist()))}, f, indent=2)
+
+
+def load_reference(path=DRIFT_REFERENCE_PATH):
+    """Training rate per column, written by scripts/train.py or scripts/drift_reference.py."""
+    with open(path, "r") as f:
+        return json.load(f)["feature_rates"]
+
+
+@lru_cache(maxsize=None)
+def get_drift_monitor(feature_order):
+    """
+    Process-wide monitor for the given feature order (a tuple), or None when
+    there is no reference distribution to compare against.
+    """
+    try:
+        reference = load_reference()
+    except FileNotFoundError:
+        logger.info("No %s; feature drift monitoring is off", DRIFT_REFERENCE_PATH)
+        return None
+    return DriftMonitor(feature_order, reference)
@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+# Single-profile encoding lives in the Streamlit-free core package
+from strokesense.bmi import bmi_category_of
+from strokesense.encoding import (
+    AGE_GENDER_RISKS, AGE_GROUPS, BMI_CATEGORIES, HEALTH_RISKS, ONE_HOT_PREFIXES, RAW_COLUMNS,
+    STRESS_LEVELS, WORK_TYPES, encode_profile,
+)
+from strokesense.risk import work_map, married_map, res_map, health_map
+
+# Text values of a set Yes/No flag: form answers, or 0/1 read as text (a
+# categorical column read from CSV keeps "0"/"1" as strings)
+FLAG_TRUE = ("Yes", "1")
+
+
+class FrameColumns:
+    """
+    Column access for encode_columns over a pandas DataFrame of raw profiles.
+
+    Each accessor returns a NumPy array with one value per row: numeric()
+    as float64, equals() as a boolean mask, flag() as 0/1 int8 (from
+    "Yes"/"No" strings, 0/1 numbers or "0"/"1" strings). Categorical columns are compared
+    once per category and rows matched by code, like Arrow dictionaries.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._text = {}
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __contains__(self, name):
+        return name in self.raw
+
+    def numeric(self, name):
+        return self.raw[name].to_numpy(np.float64)
+
+    def _by_category(self, values, per_category):
+        # Code -1 (missing) picks the trailing False
+        return np.append(per_category, False)[values.cat.codes.to_numpy()]
+
+    def equals(self, name, value):
+        values = self.raw[name]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return self._by_category(values, values.cat.categories.astype(str).to_numpy() == value)
+        if name not in self._text:
+            self._text[name] = values.astype(str).to_numpy()
+        return self._text[name] == value
+
+    def flag(self, name):
+        values = self.raw[name]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories = values.cat.categories
+            if pd.api.types.is_numeric_dtype(categories):
+                per_category = categories.to_numpy() == 1
+            else:
+                per_category = np.isin(categories.astype(str).to_numpy(), FLAG_TRUE)
+            return self._by_category(values, per_category).astype(np.int8)
+        if values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            return np.logical_or.reduce([self.equals(name, value) for value in FLAG_TRUE]).astype(np.int8)
+        return (values.to_numpy() == 1).astype(np.int8)
+
+
+def columns_bmi(columns):
+    """BMI per row, computed from height/weight when there is no "bmi" column."""
+    if "bmi" in columns:
+        return columns.numeric("bmi")
+    height_m = columns.numeric("height") / 100
+    return np.round(columns.numeric("weight") / height_m ** 2, 2)
+
+
+def frame_bmi(raw):
+    """BMI column of a raw frame, computed from height/weight when not given."""
+    return columns_bmi(FrameColumns(raw))
+
+
+def encode_columns(columns, feature_order, dtype=np.float64):
+    """
+    Vectorised encode_profile over columns of raw profiles.
+
+    Works from per-value masks only, so any column source can be encoded
+    without building Python strings per row (see FrameColumns and
+    utils.columnar.ArrowColumns).
+
+    Args:
+        columns: Column accessor with numeric(), equals() and flag().
+        feature_order (list): Model feature columns, e.g. from feature_columns.pkl.
+        dtype: Matrix dtype; every feature is 0/1, so bulk scoring uses
+            uint8 (22 bytes per row instead of 176).
+
+    Returns:
+        np.ndarray: (n_rows, n_features) matrix in feature_order.
+    """
+    n_rows = len(columns)
+    age = columns.numeric("age")
+    male = columns.equals("gender", "Male")
+    female = columns.equals("gender", "Female")
+    hypertension = columns.flag("hypertension")
+    heart_disease = columns.flag("heart_disease")
+    diabetes = columns.flag("diabetes")
+    married = columns.equals("marital_status", "Married")
+    urban = columns.equals("residence_type", "Urban")
+    rural = columns.equals("residence_type", "Rural")
+    smoker = columns.equals("smoking_status", "Formerly Smoker or Currently Smokes")
+    # "Government Job" is the form's label for the model's "Employed"
+    work_type = {wt: columns.equals("work_type", wt) for wt in WORK_TYPES}
+    work_type["Employed"] = work_type["Employed"] | columns.equals("work_type", "Government Job")
+
+    # Same rules as strokesense.risk, one boolean mask per category
+    young_or_middle = age < 65
+    age_group = {"Young (<49)": age < 50, "Middle (50-64)": (age >= 50) & young_or_middle}
+    age_group["Older (65+)"] = ~(age_group["Young (<49)"] | age_group["Middle (50-64)"])
+    age_gender_risk = {
+        "Low Risk": young_or_middle & male,
+        "Moderate Risk": young_or_middle & female & ~male,
+        "High Risk": ~young_or_middle & female & ~male,
+    }
+    age_gender_risk["Very High Risk"] = ~(age_gender_risk["Low Risk"] | age_gender_risk["Moderate Risk"]
+                                          | age_gender_risk["High Risk"])
+    any_condition = (hypertension == 1) | (heart_disease == 1) | (diabetes == 1)
+    health_risk = {"Moderate Risk": any_condition, "Low Risk": ~any_condition}
+
+    # Unknown work and residence types score 1, as in stress_level_category.
+    # Health risk is never "High Risk" here, so its Urban boost never applies.
+    work_score = np.ones(n_rows)
+    for wt, mask in work_type.items():
+        work_score[mask] = work_map[wt]
+    score = (
+        work_score
+        + np.where(married, married_map["Yes"], married_map["No"])
+        + np.where(urban, res_map["Urban"], np.where(rural, res_map["Rural"], 1))
+        + np.where(any_condition, health_map["Moderate Risk"], health_map["Low Risk"])
+    )
+    low_stress = (score - 1) / 9 < 0.3
+    stress_level = {"Low Stress": low_stress, "Moderate Stress": ~low_stress}
+    normal_weight = columns_bmi(columns) < 25
+    bmi_category = {"Normal weight": normal_weight, "Obese": ~normal_weight}
+
+    encoded = {
+        "hypertension": hypertension,
+        "heart_disease": heart_disease,
+        "ever_married": married,
+        "smoking_status": smoker,
+        "diabetes": diabetes,
+    }
+    for prefix, masks in [
+        ("age_group", age_group),
+        ("work_type", work_type),
+        ("bmi_category", bmi_category),
+        ("health_risk", health_risk),
+        ("age_gender_risk", age_gender_risk),
+        ("stress_level", stress_level),
+    ]:
+        encoded.update({f"{prefix}_{category}": mask for category, mask in masks.items()})
+
+    X = np.zeros((n_rows, len(feature_order)), dtype=dtype)
+    for j, feature in enumerate(feature_order):
+        if feature in encoded:  # Missing features stay 0, as on the Results page
+            X[:, j] = encoded[feature]
+    return X
+
+
+def encode_frame(raw, feature_order, dtype=np.float64):
+    """
+    Vectorised encode_profile over a DataFrame of raw profiles.
+
+    Args:
+        raw (pd.DataFrame): One row per profile with the RAW_COLUMNS fields
+            (a "bmi" column may replace height and weight).
+        feature_order (list): Model feature columns, e.g. from feature_columns.pkl.
+        dtype: Matrix dtype (see encode_columns).
+
+    Returns:
+        np.ndarray: (n_rows, n_features) matrix in feature_order.
+    """
+    return encode_columns(FrameColumns(raw), feature_order, dtype)
+
+
+def feature_groups(feature_order):
+    """
+    Split model columns into groups whose categories sum to one per row:
+    each one-hot family, and each binary flag (with its implicit 0 category).
+
+    Returns:
+        dict: group name -> list of column indices
+    """
+    groups = {}
+    for j, feature in enumerate(feature_order):
+        prefix = next((p for p in ONE_HOT_PREFIXES if feature.startswith(p)), None)
+        groups.setdefault(prefix.rstrip("_") if prefix else feature, []).append(j)
+    return groups
@@ -0,0 +1,137 @@
+from functools import lru_cache
+
+import numpy as np
+
+ENSEMBLE_PATH = "data/qda_ensemble.npz"
+
+
+class QDAEnsemble:
+    """
+    Bootstrap QDA members stored as stacked arrays and evaluated together.
+
+    Every member's per-class mean, whitening matrix (rotation scaled by
+    1/sqrt(eigenvalue)) and log-density offset sit in one array each, so a
+    row is scored against all members and classes with a single einsum
+    instead of a Python loop over fitted models.
+
+    Args:
+        means (array): (n_members, n_classes, n_features) class means.
+        rotations (array): (n_members, n_classes, n_features, n_features) covariance eigenvectors.
+        scalings (array): (n_members, n_classes, n_features) covariance eigenvalues.
+        priors (array): (n_members, n_classes) class priors.
+        classes (array): Class labels, in probability column order.
+        feature_columns (list): Model columns the arrays were fitted on.
+    """
+
+    def __init__(self, means, rotations, scalings, priors, classes=(0, 1), feature_columns=None):
+        self.means = np.asarray(means, dtype=np.float64)
+        self.rotations = np.asarray(rotations, dtype=np.float64)
+        self.scalings = np.asarray(scalings, dtype=np.float64)
+        self.priors = np.asarray(priors, dtype=np.float64)
+        self.classes = np.asarray(classes)
+        self.feature_columns = list(feature_columns) if feature_columns is not None else None
+        # Precomputed once so scoring is one matrix product per member and class
+        self._whiten = self.rotations / np.sqrt(self.scalings)[:, :, None, :]
+        self._offset = -0.5 * np.log(self.scalings).sum(axis=2) + np.log(self.priors)
+
+    @property
+    def n_members(self):
+        return len(self.means)
+
+    @classmethod
+    def from_estimators(cls, estimators, feature_columns=None):
+        """Stack the fitted attributes of scikit-learn QDA models."""
+        return cls(
+            means=np.stack([e.means_ for e in estimators]),
+            rotations=np.stack([np.stack(e.rotations_) for e in estimators]),
+            scalings=np.stack([np.stack(e.scalings_) for e in estimators]),
+            priors=np.stack([e.priors_ for e in estimators]),
+            classes=estimators[0].classes_,
+            feature_columns=feature_columns,
+        )
+
+    def predict_proba(self, X):
+        """
+        Positive-class probability of every row under every member.
+
+        Args:
+            X (array): (n_rows, n_features) encoded rows.
+
+        Returns:
+            np.ndarray: (n_members, n_rows) probabilities.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        centred = X[None, None, :, :] - self.means[:, :, None, :]
+        z = np.einsum("bknd,bkde->bkne", centred, self._whiten, optimize=True)
+        log_density = -0.5 * np.einsum("bkne,bkne->bkn", z, z) + self._offset[:, :, None]
+        # Two-class softmax, written as a logistic of the log-odds for stability
+        return 1.0 / (1.0 + np.exp(log_density[:, 0] - log_density[:, 1]))
+
+    def interval(self, X, level=0.9):
+        """
+        Bootstrap percentile interval of the probability for each row.
+
+        Returns:
+            tuple: (low, median, high) arrays of length n_rows.
+        """
+        probabilities = self.predict_proba(X)
+        tail = (1 - level) / 2 * 100
+        low, median, high = np.percentile(probabilities, [tail, 50, 100 - tail], axis=0)
+        return low, median, high
+
+    def save(self, path=ENSEMBLE_PATH):
+        np.savez_compressed(
+            path, means=self.means, rotations=self.rotations, scalings=self.scalings,
+            priors=self.priors, classes=self.classes,
+            feature_columns=np.array(self.feature_columns or [], dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path=ENSEMBLE_PATH):
+        with np.load(path) as data:
+            return cls(
+                data["means"], data["rotations"], data["scalings"], data["priors"],
+                classes=data["classes"], feature_columns=data["feature_columns"].tolist() or None,
+            )
+
+
+def bootstrap_qda(X, y, n_members=100, reg_param=0.4, seed=42, feature_columns=None):
+    """
+    Fit QDA on bootstrap resamples of the training data.
+
+    Each member sees a stratified resample (with replacement) balanced by
+    SMOTE, the same pipeline that produced best_model.pkl.
+
+    Args:
+        X (array): (n_rows, n_features) encoded training rows.
+        y (array): 0/1 labels.
+        n_members (int): Ensemble size.
+        reg_param (float): QDA regularisation (0.4 in best_model.pkl).
+        seed (int): Seed for the resamples and SMOTE.
+        feature_columns (list): Column names stored with the ensemble.
+
+    Returns:
+        QDAEnsemble
+    """
+    from sklearn.discriminant_analysis import QuadraticDiscriminantAnalysis
+    from utils.training import make_pipeline
+
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    rng = np.random.default_rng(seed)
+    by_class = [np.flatnonzero(y == label) for label in np.unique(y)]
+    estimators = []
+    for b in range(n_members):
+        rows = np.concatenate([rng.choice(idx, size=len(idx), replace=True) for idx in by_class])
+        pipeline = make_pipeline("qda", QuadraticDiscriminantAnalysis(reg_param=reg_param), seed=seed + b)
+        estimators.append(pipeline.fit(X[rows], y[rows]).named_steps["qda"])
+    return QDAEnsemble.from_estimators(estimators, feature_columns)
+
+
+@lru_cache(maxsize=None)
+def load_ensemble(path=ENSEMBLE_PATH):
+    """Bootstrap ensemble for risk intervals, or None when none has been trained."""
+    try:
+        return QDAEnsemble.load(path)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,188 @@
+import atexit
+import hashlib
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+import pandas as pd
+
+from utils.model import model_version
+
+HISTORY_DB_PATH = "data/history.db"
+MIN_HISTORY_KEY_LENGTH = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,  -- history_user_id(): SHA-256 of the user's history key
+    ts REAL NOT NULL,
+    probability REAL NOT NULL,
+    model_version TEXT,
+    inputs TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_user_ts ON assessments (user_id, ts, probability);
+CREATE INDEX IF NOT EXISTS idx_assessments_ts ON assessments (ts);
+"""
+
+
+def new_history_key():
+    """Random history key to offer on the input form."""
+    return secrets.token_urlsafe(12)
+
+
+def history_user_id(history_key):
+    """
+    Database id of a history key. Only this hash is stored, so a profile's
+    assessments can only be read by someone who knows its key.
+    """
+    return hashlib.sha256(history_key.strip().encode("utf-8")).hexdigest()
+
+
+class HistoryStore:
+    """
+    Confirmed assessments in a local SQLite database.
+
+    One connection is shared by the whole process (SQLite serialises writes
+    anyway) and the database runs in WAL mode, so readers never block the
+    writer. record() only buffers the row; buffered rows are inserted in one
+    transaction once batch_size are waiting, after flush_interval seconds,
+    before every query and at exit.
+
+    Args:
+        path (str): Database file.
+        batch_size (int): Buffered rows that trigger an insert.
+        flush_interval (float): Longest a row stays buffered.
+    """
+
+    def __init__(self, path=HISTORY_DB_PATH, batch_size=50, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._pending = []
+        self._wake = threading.Event()
+        self._closed = False
+        threading.Thread(target=self._run, name="history-writer", daemon=True).start()
+        atexit.register(self.close)
+
+    def record(self, user_id, probability, inputs=None, ts=None, version=None):
+        """
+        Buffer one assessment.
+
+        Args:
+            user_id (str): Profile the assessment belongs to (see history_user_id).
+            probability (float): Predicted stroke probability.
+            inputs (dict): Form answers, stored as JSON.
+            ts (float): Unix time (default: now).
+            version (str): Model version that scored it (default: production).
+        """
+        row = (user_id, time.time() if ts is None else float(ts), float(probability),
+               version or model_version(), json.dumps(inputs) if inputs is not None else None)
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+        else:
+            self._wake.set()
+
+    def flush(self):
+        """Insert every buffered row in one transaction."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if rows:
+                self._conn.executemany(
+                    "INSERT INTO assessments (user_id, ts, probability, model_version, inputs) VALUES (?, ?, ?, ?, ?)", rows)
+                self._conn.commit()
+
+    def close(self):
+        """Flush and close the connection."""
+        if not self._closed:
+            self._closed = True
+            self._wake.set()
+            self.flush()
+            with self._lock:
+                self._conn.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            time.sleep(self.flush_interval)  # Let a batch collect
+            if not self._closed:
+                self.flush()
+
+    def _query(self, sql, params):
+        self.flush()
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def count(self, user_id, start=None, end=None):
+        """Assessments of a profile between start and end (Unix times)."""
+        return int(self._query(
+            "SELECT COUNT(*) AS n FROM assessments WHERE user_id = ? AND ts >= ? AND ts <= ?",
+            (user_id, start or 0.0, end or time.time() + 1),
+        )["n"].iloc[0])
+
+    def latest(self, user_id, limit=10):
+        """Most recent assessments of a profile, newest first, with their form answers."""
+        df = self._query(
+            "SELECT ts, probability, model_version, inputs FROM assessments "
+            "WHERE user_id = ? ORDER BY ts DESC LIMIT ?", (user_id, limit))
+        df["ts"] = pd.to_datetime(df["ts"], unit="s")
+        df["inputs"] = df["inputs"].map(lambda s: json.loads(s) if s else {})
+        return df
+
+    def timeline(self, user_id, start=None, end=None, max_points=500):
+        """
+        A profile's risk over time, downsampled in SQLite.
+
+        Up to max_points assessments are returned as they are. Longer
+        ranges are split into max_points equal time buckets, and each bucket
+        becomes one point with the mean, min and max probability, so the
+        page receives at most max_points rows however long the history is.
+
+        Args:
+            user_id (str): Profile.
+            start (float): Unix time of the first assessment to include.
+            end (float): Unix time of the last assessment to include.
+            max_points (int): Most points returned.
+
+        Returns:
+            pd.DataFrame: ts, probability, low, high, n (assessments per point).
+        """
+        self.flush()
+        with self._lock:
+            first, last, n = self._conn.execute(
+                "SELECT MIN(ts), MAX(ts), COUNT(*) FROM assessments WHERE user_id = ? AND ts >= ? AND ts <= ?",
+                (user_id, start or 0.0, end or time.time() + 1),
+            ).fetchone()
+        if not n:
+            return pd.DataFrame(columns=["ts", "probability", "low", "high", "n"])
+        if n <= max_points:
+            df = self._query(
+                "SELECT ts, probability, probability AS low, probability AS high, 1 AS n FROM assessments "
+                "WHERE user_id = ? AND ts >= ? AND ts <= ? ORDER BY ts", (user_id, first, last))
+        else:
+            width = max((last - first) / max_points, 1e-6)
+            df = self._query(
+                "SELECT AVG(ts) AS ts, AVG(probability) AS probability, MIN(probability) AS low, "
+                "MAX(probability) AS high, COUNT(*) AS n FROM assessments "
+                "WHERE user_id = ? AND ts >= ? AND ts <= ? "
+                "GROUP BY MIN(CAST((ts - ?) / ? AS INTEGER), ?) ORDER BY ts",
+                (user_id, first, last, first, width, max_points - 1))
+        df["ts"] = pd.to_datetime(df["ts"], unit="s")
+        return df
+
+
+@lru_cache(maxsize=None)
+def get_history_store():
+    """Process-wide history store, opened on first use."""
+    return HistoryStore()
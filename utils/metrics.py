@@ -0,0 +1,305 @@
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_PORT = int(os.environ.get("STROKESENSE_METRICS_PORT", "9464"))
+
+
+class _Shards:
+    """
+    Per-thread accumulators. Each thread only ever writes its own list, so
+    updates need no lock; readers sum all lists. Lists of finished threads
+    (Streamlit starts a thread per rerun) are folded into a retired total.
+    """
+
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live = []
+        self._retired = [0.0] * size
+
+    def mine(self):
+        values = getattr(self._local, "values", None)
+        if values is None:
+            values = [0.0] * self._size
+            self._local.values = values
+            with self._lock:
+                self._fold_finished()
+                self._live.append((threading.current_thread(), values))
+        return values
+
+    def _fold_finished(self):
+        live = []
+        for thread, values in self._live:
+            if thread.is_alive():
+                live.append((thread, values))
+            else:
+                self._retired = [a + b for a, b in zip(self._retired, values)]
+        self._live = live
+
+    def total(self):
+        with self._lock:
+            self._fold_finished()
+            total = list(self._retired)
+            for _, values in self._live:
+                total = [a + b for a, b in zip(total, values)]
+        return total
+
+
+class _Metric:
+    """A metric family; label values select a child holding the data."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        return self.labels() if not self.labelnames else None
+
+    def collect(self):
+        """Yield (suffix, labels dict, value) samples."""
+        for key, child in list(self._children.items()):
+            yield from child.samples(dict(zip(self.labelnames, key)))
+
+
+class _CounterChild:
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount=1.0):
+        self._shards.mine()[0] += amount
+
+    def value(self):
+        return self._shards.total()[0]
+
+    def samples(self, labels):
+        yield "", labels, self.value()
+
+
+class Counter(_Metric):
+    """Monotonically increasing count (by convention the name ends in _total)."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._function = None
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self._value = float(value)
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1.0):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """Compute the value at scrape time instead."""
+        self._function = function
+
+    def value(self):
+        return float(self._function()) if self._function else self._value
+
+    def samples(self, labels):
+        yield "", labels, self.value()
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default().set(value)
+
+    def set_function(self, function):
+        self._default().set_function(function)
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self._buckets = buckets
+        # One slot per bucket, one for +Inf, then the running sum
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value):
+        values = self._shards.mine()
+        values[bisect.bisect_left(self._buckets, value)] += 1
+        values[-1] += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, labels):
+        totals = self._shards.total()
+        cumulative = 0.0
+        for bound, count in zip(list(self._buckets) + ["+Inf"], totals[:-1]):
+            cumulative += count
+            yield "_bucket", dict(labels, le=str(bound)), cumulative
+        yield "_count", labels, cumulative
+        yield "_sum", labels, totals[-1]
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+class Registry:
+    """Named metrics, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.collect():
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                value = _format_value(value)
+                lines.append(f"{metric.name}{suffix}{{{label_text}}} {value}" if label_text
+                             else f"{metric.name}{suffix} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value):
+    """Sample value at full precision, with infinities and NaN spelled as Prometheus expects."""
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = Registry()
+
+# ==========================
+# APP METRICS
+# ==========================
+PREDICTIONS = REGISTRY.counter("strokesense_predictions_total", "Predictions served.", ["page"])
+MODEL_LATENCY = REGISTRY.histogram("strokesense_model_latency_seconds", "Time spent in predict_proba.", ["page"])
+MODEL_LOAD_SECONDS = REGISTRY.histogram("strokesense_model_load_seconds", "Time to load the model from disk.")
+CACHE_REQUESTS = REGISTRY.counter("strokesense_cache_requests_total", "Cache lookups.", ["cache", "result"])
+ASSET_LOAD_SECONDS = REGISTRY.histogram("strokesense_asset_load_seconds", "Time to read an asset from disk.", ["asset"])
+PAGE_RUN_SECONDS = REGISTRY.histogram("strokesense_page_run_seconds", "Script rerun duration.", ["page"])
+ACTIVE_SESSIONS = REGISTRY.gauge("strokesense_active_sessions", "Browser sessions seen recently.")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the app's console
+
+
+@lru_cache(maxsize=None)
+def start_metrics_server(port=METRICS_PORT, host="127.0.0.1"):
+    """
+    Serve /metrics on a local port from a daemon thread, once per process.
+    Set STROKESENSE_METRICS_PORT=0 to disable.
+
+    Returns:
+        ThreadingHTTPServer: The server, or None if disabled or the port is taken.
+    """
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    except OSError as e:
+        logger.warning("Metrics endpoint not started on %s:%s: %s", host, port, e)
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -1,7 +1,108 @@
-import joblib
+import json
+import logging
+import os
+from functools import lru_cache
+
+from strokesense.model import file_sha256, load_artifact
+from utils.benchmark import select_model
+from utils.calibration import calibrated_versions, load_threshold_config
+from utils.metrics import CACHE_REQUESTS, MODEL_LOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SERVING_CONFIG_PATH = "config/serving.json"
+DEFAULT_MODEL_PATH = "data/best_model.pkl"
+DEFAULT_FEATURES_PATH = "data/feature_columns.pkl"
+
+
+@lru_cache(maxsize=None)
+def _json_file(path, mtime):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def load_serving_config(config_path=SERVING_CONFIG_PATH):
+    """
+    config/serving.json as a dict (empty when the file does not exist).
+    Parsed once per file version; callers must not modify the result.
+    """
+    try:
+        return _json_file(config_path, os.path.getmtime(config_path))
+    except FileNotFoundError:
+        return {}
+
+
+def deployed_model_path(config_path=SERVING_CONFIG_PATH):
+    """
+    Path of the model to serve.
+
+    With a latency budget set in config/serving.json and a comparison report
+    from scripts/compare_models.py, the best model within the budget is
+    served; otherwise data/best_model.pkl. Only models with their own
+    threshold calibration (scripts/calibrate.py --model) are considered, so
+    no model is classified with another model's threshold. Runs on every
+    page rerun, so the config files are parsed once per file version.
+    """
+    config = load_serving_config(config_path)
+    budget = config.get("latency_budget_ms")
+    report_path = config.get("comparison", "data/models/comparison.json")
+    if budget is None or not os.path.exists(report_path):
+        return DEFAULT_MODEL_PATH
+    report = _json_file(report_path, os.path.getmtime(report_path))
+    calibrated = calibrated_versions()
+    servable = [entry for entry in report if os.path.abspath(entry["path"]) == os.path.abspath(DEFAULT_MODEL_PATH)
+                or os.path.exists(entry["path"]) and model_version(entry["path"]) in calibrated]
+    if len(servable) < len(report):
+        _warn_uncalibrated(tuple(entry["name"] for entry in report if entry not in servable))
+    chosen = select_model(servable, budget, metric=config.get("metric", "f1"))
+    return chosen["path"] if chosen else DEFAULT_MODEL_PATH
+
+
+@lru_cache(maxsize=None)
+def _warn_uncalibrated(names):
+    logger.warning("Not serving %s: no threshold calibration for these models (run scripts.calibrate --model)",
+                   ", ".join(names))
+
+
+def deployed_threshold_config(config_path=SERVING_CONFIG_PATH):
+    """Threshold and risk bands calibrated for the deployed model."""
+    return load_threshold_config(model_version=model_version(deployed_model_path(config_path)))
+
+
+@lru_cache(maxsize=None)
+def _file_version(path, mtime):
+    return file_sha256(path)[:12]
+
+
+def model_version(path=None):
+    """Short content hash identifying the served model (rehashed when the file changes)."""
+    path = path or deployed_model_path()
+    return _file_version(path, os.path.getmtime(path))
+
+
+_artifact_cache = {}
+
+
+def _load_cached(path):
+    """joblib.load once per file version; a replaced file is loaded again."""
+    key = (path, os.path.getmtime(path))
+    if key in _artifact_cache:
+        CACHE_REQUESTS.labels(cache="model", result="hit").inc()
+        return _artifact_cache[key]
+    CACHE_REQUESTS.labels(cache="model", result="miss").inc()
+    with MODEL_LOAD_SECONDS.time():
+        artifact = load_artifact(path)
+    for stale in [k for k in _artifact_cache if k[0] == path]:
+        del _artifact_cache[stale]
+    _artifact_cache[key] = artifact
+    return artifact
+
+
+def load_model_files(model_path, features_path=DEFAULT_FEATURES_PATH):
+    """Model and feature columns of one model version, cached per file."""
+    return _load_cached(model_path), _load_cached(features_path)
+
 
 # Load model and features
 def load_model_and_features():
-    model = joblib.load("data/best_model.pkl")
-    feature_order = joblib.load("data/feature_columns.pkl")
-    return model, feature_order
+    return load_model_files(deployed_model_path())
@@ -0,0 +1,32 @@
+import time
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.metrics import ACTIVE_SESSIONS, PAGE_RUN_SECONDS, start_metrics_server
+
+SESSION_TTL = 300  # Seconds without a rerun before a session stops counting as active
+_last_seen = {}
+
+
+def _active_sessions():
+    cutoff = time.time() - SESSION_TTL
+    for session_id, seen in list(_last_seen.items()):
+        if seen < cutoff:
+            _last_seen.pop(session_id, None)
+    return len(_last_seen)
+
+
+ACTIVE_SESSIONS.set_function(_active_sessions)
+
+
+def page_run_started():
+    """Call at the top of a page: starts the metrics endpoint and marks the session active."""
+    start_metrics_server()
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        _last_seen[ctx.session_id] = time.time()
+    return time.perf_counter()
+
+
+def page_run_finished(page, started):
+    """Call at the end of a page with the value page_run_started returned."""
+    PAGE_RUN_SECONDS.labels(page=page).observe(time.perf_counter() - started)
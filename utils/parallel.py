@@ -0,0 +1,127 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from strokesense.model import load_artifact, predict_deduplicated
+from strokesense.packed import pack_rows
+from utils.encoding import encode_frame
+
+SCORE_CHUNK_ROWS = 65536
+
+_worker = {}  # Per-process state set up by _init_worker
+
+
+class SharedMatrix:
+    """
+    NumPy array backed by a named shared-memory block.
+
+    The creating process owns the block and unlinks it on close; other
+    processes attach by spec and see the same memory, so rows are never
+    pickled between processes.
+
+    Args:
+        shape (tuple): Array shape.
+        dtype: Array dtype.
+        name (str): Existing block to attach to (default: create a new one).
+    """
+
+    def __init__(self, shape, dtype, name=None):
+        self.shape = tuple(int(n) for n in shape)
+        self.dtype = np.dtype(dtype)
+        self._owner = name is None
+        size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        self.shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size if self._owner else 0)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    @property
+    def spec(self):
+        """Picklable (name, shape, dtype) to attach from another process."""
+        return self.shm.name, self.shape, self.dtype.str
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def encode_to_shared(raw, feature_order, chunk_rows=SCORE_CHUNK_ROWS):
+    """
+    Encode raw profiles chunk by chunk into a shared matrix of bit-packed
+    rows (strokesense.packed.pack_rows): the features are all 0/1, so 22
+    of them take 3 bytes per row.
+
+    Args:
+        raw (pd.DataFrame): Raw profiles (see utils.encoding.encode_frame).
+        feature_order (list): Model feature columns.
+        chunk_rows (int): Rows encoded at a time, bounding the unpacked temporaries.
+
+    Returns:
+        SharedMatrix: (n_rows, ceil(n_features / 8)) uint8; the caller closes it.
+    """
+    X = SharedMatrix((len(raw), (len(feature_order) + 7) // 8), np.uint8)
+    for start in range(0, len(raw), chunk_rows):
+        X.array[start:start + chunk_rows] = pack_rows(
+            encode_frame(raw.iloc[start:start + chunk_rows], feature_order, dtype=np.uint8))
+    return X
+
+
+def _init_worker(model_path, features_path, x_spec, out_spec):
+    # One BLAS thread per worker; the pool provides the parallelism
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(1)
+    _worker["model"] = load_artifact(model_path)
+    _worker["feature_order"] = list(load_artifact(features_path))
+    _worker["X"] = SharedMatrix.attach(x_spec)
+    _worker["out"] = SharedMatrix.attach(out_spec)
+
+
+def _score_range(start, stop):
+    feature_order = _worker["feature_order"]
+    probabilities = predict_deduplicated(_worker["model"], _worker["X"].array[start:stop], feature_order,
+                                         n_features=len(feature_order))
+    _worker["out"].array[start:stop] = probabilities
+    return stop - start
+
+
+def score_shared(X, model_path, features_path, workers=None, chunk_rows=SCORE_CHUNK_ROWS):
+    """
+    Score a shared feature matrix with a pool of processes.
+
+    Each worker loads the model once, reads its row ranges straight from X,
+    scores each distinct row of a range once and writes probabilities into
+    a shared output buffer; only (start, stop) pairs cross the process
+    boundary.
+
+    Args:
+        X (SharedMatrix): Bit-packed encoded rows from encode_to_shared.
+        model_path (str): Pickled model.
+        features_path (str): Pickled feature columns.
+        workers (int): Processes (default: all cores).
+        chunk_rows (int): Rows per task.
+
+    Returns:
+        np.ndarray: Positive-class probability per row.
+    """
+    n_rows = X.shape[0]
+    workers = workers or os.cpu_count() or 1
+    with SharedMatrix((n_rows,), np.float64) as out:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(model_path, features_path, X.spec, out.spec)) as pool:
+            starts = range(0, n_rows, chunk_rows)
+            list(pool.map(_score_range, starts, [min(s + chunk_rows, n_rows) for s in starts]))
+        return out.array.copy()
@@ -0,0 +1,197 @@
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from strokesense.encoding import profile_matrix
+from strokesense.model import predict_proba
+from utils.audit import get_audit_logger
+from utils.calibration import calibrated_versions, load_threshold_config
+from utils.metrics import REGISTRY
+from utils.model import (
+    DEFAULT_FEATURES_PATH, SERVING_CONFIG_PATH, deployed_model_path, load_model_files, load_serving_config,
+    model_version,
+)
+
+logger = logging.getLogger(__name__)
+
+SHADOW_WORKERS = 1
+
+SHADOW_PREDICTIONS = REGISTRY.counter(
+    "strokesense_shadow_predictions_total", "Requests scored again by the other model version.",
+    ["served", "shadow", "agreement"])
+SHADOW_PROBABILITY_DELTA = REGISTRY.histogram(
+    "strokesense_shadow_probability_delta", "Absolute probability difference, shadow vs served model.",
+    ["served", "shadow"], buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5))
+SHADOW_LATENCY_DELTA = REGISTRY.histogram(
+    "strokesense_shadow_latency_delta_seconds", "Shadow minus served predict_proba time on the same request.",
+    ["served", "shadow"], buckets=(-0.1, -0.025, -0.01, -0.0025, -0.001, 0.0, 0.001, 0.0025, 0.01, 0.025, 0.1))
+
+
+class ModelVersion:
+    """
+    One loaded model and its feature columns, identified by content hash.
+
+    Args:
+        role (str): "production" or "candidate".
+        model_path (str): Pickled model.
+        features_path (str): Pickled feature columns the model was trained on.
+        threshold (float): Classification threshold calibrated for this
+            model; None uses its calibration in config/thresholds.json.
+    """
+
+    def __init__(self, role, model_path, features_path=DEFAULT_FEATURES_PATH, threshold=None):
+        self.role = role
+        self.model_path = model_path
+        self.model, self.feature_order = load_model_files(model_path, features_path)
+        self.version = model_version(model_path)
+        self.threshold = threshold
+
+    def threshold_config(self):
+        """Threshold and risk bands to classify this version's probabilities with."""
+        config = load_threshold_config(model_version=self.version)
+        return config if self.threshold is None else {**config, "threshold": self.threshold}
+
+    def predict(self, user_inputs):
+        """Probability for one encoded profile."""
+        X = profile_matrix([user_inputs], self.feature_order)
+        return float(predict_proba(self.model, X, self.feature_order)[0])
+
+
+class ModelRegistry:
+    """
+    The production model and an optional candidate, both kept loaded.
+
+    The candidate is configured in config/serving.json:
+
+        "candidate": {"model": "data/models/candidate.pkl", "traffic": 0.1, "shadow": true,
+                      "threshold": 0.4}
+
+    A "traffic" fraction of sessions is served by the candidate (canary);
+    with "shadow" on, every Results prediction is also scored by the other
+    version on a background worker and the agreement, probability and
+    latency differences are recorded. "threshold" is the candidate's own
+    threshold; without it the candidate's calibration in
+    config/thresholds.json is used, or else the production threshold. A candidate that fails to load is logged and skipped,
+    so production sessions keep working. Anything cached per model (What-If
+    scores, sensitivity, reports, speculative scores) is keyed by version,
+    so candidate results never reach production sessions.
+
+    Args:
+        config (dict): Parsed config/serving.json.
+    """
+
+    def __init__(self, config):
+        self.production = ModelVersion("production", deployed_model_path())
+        candidate = config.get("candidate") or {}
+        self.candidate = None
+        if candidate.get("model"):
+            try:
+                threshold = candidate.get("threshold")
+                self.candidate = ModelVersion(
+                    "candidate", candidate["model"], candidate.get("features", DEFAULT_FEATURES_PATH),
+                    threshold=None if threshold is None else float(threshold))
+            except Exception:
+                logger.exception("Candidate model %s not loaded; serving production only", candidate["model"])
+        if self.candidate is not None and self.candidate.threshold is None \
+                and self.candidate.version not in calibrated_versions():
+            logger.warning("Candidate %s has no threshold calibration; using the production threshold",
+                           self.candidate.version)
+            self.candidate.threshold = self.production.threshold_config()["threshold"]
+        self.traffic = float(candidate.get("traffic", 0.0)) if self.candidate else 0.0
+        self.shadow_enabled = self.candidate is not None and bool(candidate.get("shadow", True))
+
+    def get(self, version):
+        """Loaded model version with the given hash, or None."""
+        for loaded in (self.production, self.candidate):
+            if loaded is not None and loaded.version == version:
+                return loaded
+        return None
+
+    def route(self, draw):
+        """
+        Version serving a session.
+
+        Args:
+            draw (float): The session's uniform [0, 1) draw; kept for the
+                whole session so a user always sees the same model.
+        """
+        return self.candidate if self.candidate is not None and draw < self.traffic else self.production
+
+    def shadow(self, served, user_inputs, probability, served_seconds, page="Results"):
+        """
+        Score a served request with the other version, off the request path.
+
+        Args:
+            served (ModelVersion): Version that answered the request.
+            user_inputs (dict): Encoded profile.
+            probability (float): Served probability.
+            served_seconds (float): Time the served predict_proba took.
+            page (str): Page that served the request.
+
+        Returns:
+            Future or None: Resolves to the shadow record; None when shadowing is off.
+        """
+        if not self.shadow_enabled:
+            return None
+        other = self.production if served is self.candidate else self.candidate
+        return get_shadow_pool().submit(
+            _shadow_score, served, other, dict(user_inputs), float(probability), served_seconds, page)
+
+
+def _shadow_score(served, shadow, user_inputs, probability, served_seconds, page):
+    started = time.perf_counter()
+    shadow_probability = shadow.predict(user_inputs)
+    latency_delta = time.perf_counter() - started - served_seconds
+    # Each version's prediction is classified with its own threshold
+    agree = ((shadow_probability > shadow.threshold_config()["threshold"])
+             == (probability > served.threshold_config()["threshold"]))
+    labels = {"served": served.version, "shadow": shadow.version}
+    SHADOW_PREDICTIONS.labels(agreement="agree" if agree else "disagree", **labels).inc()
+    SHADOW_PROBABILITY_DELTA.labels(**labels).observe(abs(shadow_probability - probability))
+    SHADOW_LATENCY_DELTA.labels(**labels).observe(latency_delta)
+    record = {
+        "page": f"Shadow ({page})",
+        "model_version": shadow.version,
+        "served_version": served.version,
+        "probability": shadow_probability,
+        "served_probability": probability,
+        "agree": bool(agree),
+        "latency_delta_ms": latency_delta * 1000,
+        "profile": {feature: int(user_inputs.get(feature, 0)) for feature in shadow.feature_order},
+    }
+    get_audit_logger().log(record)
+    return record
+
+
+@lru_cache(maxsize=None)
+def get_shadow_pool():
+    """Process-wide worker for shadow scoring."""
+    return ThreadPoolExecutor(max_workers=SHADOW_WORKERS, thread_name_prefix="shadow")
+
+
+@lru_cache(maxsize=1)
+def _registry(config_path, stamp):
+    return ModelRegistry(load_serving_config(config_path))
+
+
+def get_registry(config_path=SERVING_CONFIG_PATH):
+    """Process-wide registry, rebuilt when the serving config or a model file changes."""
+    config = load_serving_config(config_path)
+    paths = [config_path, deployed_model_path(config_path), (config.get("candidate") or {}).get("model")]
+    stamp = tuple(os.path.getmtime(p) if p and os.path.exists(p) else None for p in paths)
+    return _registry(config_path, stamp)
+
+
+def served_model(session_state):
+    """
+    Model version serving this browser session.
+
+    The session draws once and keeps the draw, so canary assignment is
+    sticky across pages and reruns.
+    """
+    if "model_route" not in session_state:
+        session_state.model_route = random.random()
+    return get_registry().route(session_state.model_route)
@@ -0,0 +1,341 @@
+import base64
+import html
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+import plotly.graph_objects as go
+
+from utils.metrics import CACHE_REQUESTS, REGISTRY
+from utils.model import model_version
+
+REPORT_ICON_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "assets", "icon.png")
+REPORT_ICON_SIZE = 64
+REPORT_WORKERS = 2
+REPORT_CACHE_SIZE = 256
+
+REPORT_RENDER_SECONDS = REGISTRY.histogram("strokesense_report_render_seconds", "Time to render a downloadable report.")
+
+# Colours of the four risk bands, lowest first
+BAND_COLORS = ["#28a745", "#ffc107", "#fd7e14", "#dc3545"]
+
+# User-friendly names of the model features
+FEATURE_NAMES = {
+    "hypertension": "High Blood Pressure",
+    "heart_disease": "Heart Disease",
+    "ever_married": "Married",
+    "smoking_status": "Smoking History",
+    "diabetes": "Diabetes",
+    "bmi_category_Obese": "BMI: Obese",
+    "bmi_category_Normal weight": "BMI: Normal",
+    "stress_level_Moderate Stress": "Moderate Stress Level",
+    "stress_level_Low Stress": "Low Stress Level",
+    "age_group_Young (<49)": "Age: Under 49",
+    "age_group_Middle (50-64)": "Age: 50-64",
+    "age_group_Older (65+)": "Age: 65+",
+    "health_risk_Low Risk": "Low Health Risk",
+    "health_risk_Moderate Risk": "Moderate Health Risk",
+    "age_gender_risk_Low Risk": "Low Age-Gender Risk",
+    "age_gender_risk_Moderate Risk": "Moderate Age-Gender Risk",
+    "age_gender_risk_High Risk": "High Age-Gender Risk",
+    "age_gender_risk_Very High Risk": "Very High Age-Gender Risk",
+    "work_type_Private": "Private Sector Work",
+    "work_type_Employed": "Government Work",
+    "work_type_Self-employed": "Self-Employed",
+    "work_type_Unemployed": "Unemployed",
+}
+
+# Features that raise stroke risk when set; the other one-hot columns
+# (normal weight, low stress, under 49, married, ...) are not risk factors
+RISK_FACTORS = (
+    "hypertension",
+    "heart_disease",
+    "diabetes",
+    "smoking_status",
+    "bmi_category_Obese",
+    "stress_level_Moderate Stress",
+    "age_group_Middle (50-64)",
+    "age_group_Older (65+)",
+    "health_risk_Moderate Risk",
+    "age_gender_risk_High Risk",
+    "age_gender_risk_Very High Risk",
+)
+
+GENERAL_TIPS = [
+    {'icon': '🥗', 'title': 'Healthy Diet', 'tip': 'Eat more fruits, vegetables, and whole grains.', 'action': '5 servings of fruits/vegetables daily'},
+    {'icon': '💊', 'title': 'Regular Checkups', 'tip': 'Monitor blood pressure, cholesterol, and blood sugar.', 'action': 'Annual health screening'},
+    {'icon': '🏊‍♀️', 'title': 'Stay Active', 'tip': 'Regular exercise strengthens your cardiovascular system.', 'action': '150 minutes moderate exercise weekly'},
+]
+
+WARNING_SIGNS = [
+    ("😵", "F - Face", "Face drooping or numbness"),
+    ("💪", "A - Arms", "Arm weakness or numbness"),
+    ("🗣️", "S - Speech", "Speech difficulty or slurred"),
+    ("⏰", "T - Time", "Time to call emergency services"),
+]
+
+
+def risk_level(risk_percentage, bands):
+    """
+    Colour, level and message for a risk percentage.
+
+    Args:
+        risk_percentage (float): Predicted risk in %.
+        bands (list): Band edges in % from config/thresholds.json.
+
+    Returns:
+        tuple: (colour, "low" | "moderate" | "high", message)
+    """
+    low_band, moderate_band, _ = bands
+    if risk_percentage < low_band:
+        return "#28a745", "low", "Low risk – Keep up the healthy habits!"
+    if risk_percentage < moderate_band:
+        return "#ffc107", "moderate", "Moderate risk – Consider lifestyle changes & regular check-ups."
+    return "#dc3545", "high", "High risk – Please consult a healthcare provider soon."
+
+
+def risk_ladder_figure(risk_percentage, config):
+    """Stacked horizontal bar of the risk bands with the user's risk marked."""
+    categories = config["band_labels"]
+    ranges = [0, *config["bands"], 100]
+
+    fig = go.Figure()
+    for i in range(len(categories)):
+        fig.add_trace(go.Bar(
+            x=[ranges[i+1] - ranges[i]],
+            y=["Risk Ladder"],
+            orientation='h',
+            marker=dict(color=BAND_COLORS[i]),
+            name=f"{categories[i]} ({ranges[i]}–{ranges[i+1]}%)",
+            hovertemplate=f"{categories[i]} Risk: {ranges[i]}–{ranges[i+1]}%"
+        ))
+    fig.add_shape(
+        type="line",
+        x0=risk_percentage, x1=risk_percentage,
+        y0=-0.5, y1=0.5,
+        line=dict(color="black", width=4, dash="dash"),
+    )
+    fig.add_annotation(
+        x=risk_percentage,
+        y=0.2,
+        text=f"Your Risk: {risk_percentage:.1f}%",
+        showarrow=False,
+        font=dict(color="black", size=14, family="Arial"),
+        bgcolor="white"
+    )
+    fig.update_layout(
+        barmode='stack',
+        height=200,
+        title="Stroke Risk Ladder",
+        xaxis=dict(title="Stroke Risk (%)", range=[0, 100], showgrid=False),
+        yaxis=dict(showticklabels=False),
+        plot_bgcolor="white",
+        showlegend=True,
+        margin=dict(l=40, r=40, t=60, b=40)
+    )
+    return fig
+
+
+def active_risk_factors(user_inputs, feature_order):
+    """Friendly names of the risk factors set in the encoded profile."""
+    return [FEATURE_NAMES.get(f, f) for f in feature_order if f in RISK_FACTORS and user_inputs.get(f, 0) == 1]
+
+
+def prevention_tips(user_inputs):
+    """Tips for the user's risk factors, or general advice if there are none."""
+    tips = []
+    if user_inputs.get("hypertension", 0) == 1:
+        tips.append({
+            'icon': '🩺',
+            'title': 'Blood Pressure Management',
+            'tip': 'Monitor your blood pressure regularly and take prescribed medications consistently.',
+            'action': 'Aim for <120/80 mmHg'
+        })
+    if user_inputs.get("bmi_category_Obese", 0) == 1:
+        tips.append({
+            'icon': '🏃‍♂️',
+            'title': 'Weight Management',
+            'tip': 'Focus on gradual weight loss through diet and exercise.',
+            'action': 'Aim to lose 1-2 pounds per week'
+        })
+    if user_inputs.get("smoking_status", 0) == 1:
+        tips.append({
+            'icon': '🚭',
+            'title': 'Smoking Cessation',
+            'tip': 'Quitting smoking can reduce stroke risk by 50% within 2 years.',
+            'action': 'Contact a smoking cessation program'
+        })
+    if user_inputs.get("stress_level_Moderate Stress", 0) == 1:
+        tips.append({
+            'icon': '🧘‍♀️',
+            'title': 'Stress Management',
+            'tip': 'Practice relaxation techniques like meditation or deep breathing.',
+            'action': '10 minutes daily meditation'
+        })
+    return tips or list(GENERAL_TIPS)
+
+
+# ==========================
+# REPORT RENDERING
+# ==========================
+_REPORT_CSS = """
+body { font-family: Arial, Helvetica, sans-serif; color: #222; max-width: 900px; margin: 30px auto; padding: 0 20px; }
+header { display: flex; align-items: center; gap: 15px; border-bottom: 2px solid #d0d0d0; padding-bottom: 10px; }
+header img { width: 48px; height: 48px; }
+.card { padding: 30px; border-radius: 15px; text-align: center; color: white; font-size: 2rem; font-weight: bold; margin: 20px 0; }
+.tip { background-color: #f0f8ff; border-radius: 10px; padding: 15px; margin: 10px 0; border-left: 5px solid #4169e1; }
+.fast { display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px; background-color: #fff3cd; border-radius: 10px; padding: 20px; }
+.fast div { text-align: center; }
+.disclaimer { border: 2px solid #ff9800; border-radius: 12px; padding: 15px 25px; margin-top: 30px; color: #424242; }
+footer { color: #757575; font-size: 0.9rem; margin-top: 30px; text-align: center; }
+@media print { .tip, .card, .fast { break-inside: avoid; -webkit-print-color-adjust: exact; print-color-adjust: exact; } }
+"""
+
+
+@lru_cache(maxsize=None)
+def _static_assets():
+    """
+    Stylesheet and a downscaled app icon, prepared once per process and
+    embedded in every report, so reports need no network or files.
+    """
+    from PIL import Image
+
+    with Image.open(REPORT_ICON_PATH) as image:
+        image.thumbnail((REPORT_ICON_SIZE, REPORT_ICON_SIZE))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    icon = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return {"css": _REPORT_CSS, "icon": f"data:image/png;base64,{icon}"}
+
+
+def risk_ladder_svg(risk_percentage, config, width=800, height=110):
+    """
+    The risk ladder as inline SVG for the report: same bands, colours and
+    marker as risk_ladder_figure, but static, so it prints and needs no plotly.js.
+    """
+    categories = config["band_labels"]
+    ranges = [0, *config["bands"], 100]
+    scale = width / 100
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="100%" '
+             f'font-family="Arial" font-size="13">']
+    for i in range(len(categories)):
+        x, w = ranges[i] * scale, (ranges[i+1] - ranges[i]) * scale
+        parts.append(f'<rect x="{x:.1f}" y="30" width="{w:.1f}" height="40" fill="{BAND_COLORS[i]}"/>')
+        parts.append(f'<text x="{x + w / 2:.1f}" y="90" text-anchor="middle">'
+                     f'{html.escape(categories[i])} ({ranges[i]}–{ranges[i+1]}%)</text>')
+    x = min(max(risk_percentage, 0), 100) * scale
+    parts.append(f'<line x1="{x:.1f}" x2="{x:.1f}" y1="22" y2="78" stroke="black" stroke-width="4" stroke-dasharray="6,4"/>')
+    parts.append(f'<text x="{min(max(x, 60), width - 60):.1f}" y="16" text-anchor="middle" font-weight="bold">'
+                 f'Your Risk: {risk_percentage:.1f}%</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def render_report(user_inputs, feature_order, probability, config, version=None):
+    """
+    Self-contained HTML report of a prediction: risk card, risk ladder,
+    active risk factors, prevention tips and warning signs. It needs no
+    network access, and the browser's print dialog saves it as a PDF.
+
+    Args:
+        user_inputs (dict): Encoded profile.
+        feature_order (list): Model feature columns.
+        probability (float): Predicted stroke probability.
+        config (dict): Threshold config (see utils.calibration).
+        version (str): Model version that scored it (default: production).
+
+    Returns:
+        bytes: UTF-8 encoded HTML document.
+    """
+    with REPORT_RENDER_SECONDS.time():
+        assets = _static_assets()
+        risk_percentage = probability * 100
+        color, _, message = risk_level(risk_percentage, config["bands"])
+        ladder = risk_ladder_svg(risk_percentage, config)
+        factors = active_risk_factors(user_inputs, feature_order)
+        factor_items = "".join(f"<li>{html.escape(f)}</li>" for f in factors) or "<li>None</li>"
+        tip_items = "".join(
+            f"<div class='tip'><h4>{t['icon']} {html.escape(t['title'])}</h4><p>{html.escape(t['tip'])}</p>"
+            f"<strong>Action: {html.escape(t['action'])}</strong></div>"
+            for t in prevention_tips(user_inputs)
+        )
+        signs = "".join(f"<div><div style='font-size:2.5em;'>{icon}</div><h4>{title}</h4><p>{text}</p></div>"
+                        for icon, title, text in WARNING_SIGNS)
+        generated = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+        document = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>StrokeSense – Stroke Risk Report</title>
+<style>{assets["css"]}</style>
+</head>
+<body>
+<header><img src="{assets["icon"]}" alt=""><h1>StrokeSense – Stroke Risk Report</h1></header>
+<div class="card" style="background-color: {color};">Estimated Stroke Risk: {risk_percentage:.1f}%</div>
+<p><strong>{html.escape(message)}</strong></p>
+<h2>Stroke Risk Ladder</h2>
+{ladder}
+<h2>Active Risk Factors</h2>
+<ul>{factor_items}</ul>
+<h2>Personalized Prevention Tips</h2>
+{tip_items}
+<h2>Stroke Warning Signs – F.A.S.T.</h2>
+<div class="fast">{signs}</div>
+<p><strong>If you notice these signs, call emergency services immediately (995 in Singapore).</strong></p>
+<div class="disclaimer"><p><strong>Important:</strong> This stroke risk prediction tool is for educational and informational
+purposes only. The predictions are <strong>not 100% accurate</strong> and should not be used as a substitute for professional
+medical advice, diagnosis, or treatment. Please consult a qualified healthcare professional with any concerns.</p></div>
+<footer>Generated {generated} · model {version or model_version()} · StrokeSense Team</footer>
+</body>
+</html>
+"""
+    return document.encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def get_report_pool():
+    """Process-wide bounded pool that renders reports off the Streamlit thread."""
+    return ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="report")
+
+
+_report_cache = OrderedDict()
+_report_cache_lock = threading.Lock()
+
+
+def request_report(user_inputs, feature_order, probability, config, version=None):
+    """
+    Start rendering a report in the background, or reuse an earlier one.
+
+    Reports are cached by profile, probability, threshold config and model
+    version (least recently used entries are dropped past REPORT_CACHE_SIZE).
+    The cache holds futures, so a profile requested again while its report
+    is still rendering waits on the same job.
+
+    Returns:
+        concurrent.futures.Future: Resolves to the report bytes.
+    """
+    key = (
+        version or model_version(),
+        tuple(int(user_inputs.get(f, 0)) for f in feature_order),
+        round(float(probability), 6),
+        json.dumps(config, sort_keys=True),
+    )
+    with _report_cache_lock:
+        future = _report_cache.get(key)
+        if future is not None and not (future.done() and future.exception() is not None):
+            CACHE_REQUESTS.labels(cache="report", result="hit").inc()
+            _report_cache.move_to_end(key)
+            return future
+        CACHE_REQUESTS.labels(cache="report", result="miss").inc()
+        future = get_report_pool().submit(
+            render_report, dict(user_inputs), list(feature_order), probability, config, version)
+        _report_cache[key] = future
+        while len(_report_cache) > REPORT_CACHE_SIZE:
+            _report_cache.popitem(last=False)
+    return future
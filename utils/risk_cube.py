@@ -0,0 +1,165 @@
+import json
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+RISK_CUBE_PATH = "data/risk_cube.npz"
+AGE_EDGES = [18, 30, 40, 50, 60, 70, 80]
+
+# Cube dimensions: name -> (title, labels). risk_band labels come from the
+# threshold config when the cube is built.
+DIMENSIONS = {
+    "age_group": ("Age Group", ["18-29", "30-39", "40-49", "50-59", "60-69", "70-79", "80+"]),
+    "gender": ("Gender", ["Male", "Female"]),
+    "work_type": ("Work Type", ["Private", "Self-employed", "Government Job", "Unemployed"]),
+    "residence_type": ("Residence", ["Rural", "Urban"]),
+    "hypertension": ("High Blood Pressure", ["No", "Yes"]),
+    "heart_disease": ("Heart Disease", ["No", "Yes"]),
+    "diabetes": ("Diabetes", ["No", "Yes"]),
+    "risk_band": ("Risk Band", None),
+}
+
+
+def _category_codes(columns, name, labels):
+    """Index of each row's value in labels, -1 when it matches none."""
+    codes = np.full(len(columns), -1, dtype=np.int64)
+    for i, label in enumerate(labels):
+        codes[columns.equals(name, label)] = i
+    if name == "work_type":  # The model's name for "Government Job"
+        codes[columns.equals(name, "Employed")] = labels.index("Government Job")
+    return codes
+
+
+class RiskCube:
+    """
+    Patient count, summed probability and flagged count (probability above
+    the threshold) of a scored cohort, for every combination of the
+    DIMENSIONS categories.
+
+    Built once while a cohort is scored, one np.bincount per batch; after
+    that every filter and breakdown is a slice and sum over a few thousand
+    cells, whatever the cohort size.
+
+    Args:
+        band_labels (list): Risk band names (the risk_band dimension).
+        count, probability_sum, flagged (array): Cube arrays (default: empty).
+        meta (dict): Cohort facts stored with the cube (rows, invalid_rows, ...).
+    """
+
+    def __init__(self, band_labels, count=None, probability_sum=None, flagged=None, meta=None):
+        self.labels = {name: list(labels or band_labels) for name, (_, labels) in DIMENSIONS.items()}
+        self.shape = tuple(len(labels) for labels in self.labels.values())
+        self.count = np.zeros(self.shape, dtype=np.int64) if count is None else count
+        self.probability_sum = np.zeros(self.shape) if probability_sum is None else probability_sum
+        self.flagged = np.zeros(self.shape, dtype=np.int64) if flagged is None else flagged
+        self.meta = {"rows": 0, "invalid_rows": 0, "unmatched_rows": 0, **(meta or {})}
+
+    @property
+    def dimensions(self):
+        return list(self.labels)
+
+    def add(self, columns, probabilities, valid, config):
+        """
+        Add a batch of scored rows.
+
+        Args:
+            columns: Column accessor of the raw rows (utils.encoding.FrameColumns
+                or utils.columnar.ArrowColumns).
+            probabilities (np.ndarray): Probability per row (ignored where invalid).
+            valid (np.ndarray): Rows that passed validation.
+            config (dict): Threshold config (see utils.calibration).
+        """
+        probabilities = np.nan_to_num(np.asarray(probabilities, dtype=np.float64))
+        age = columns.numeric("age")
+        codes = {
+            "age_group": np.searchsorted(np.asarray(AGE_EDGES[1:]), age, side="right"),
+            "risk_band": np.searchsorted(np.asarray(config["bands"], dtype=np.float64), probabilities * 100,
+                                         side="right"),
+        }
+        for name in ("gender", "work_type", "residence_type"):
+            codes[name] = _category_codes(columns, name, self.labels[name])
+        for name in ("hypertension", "heart_disease", "diabetes"):
+            codes[name] = columns.flag(name).astype(np.int64)
+
+        matched = np.asarray(valid, dtype=bool).copy()
+        for values in codes.values():
+            matched &= values >= 0
+        cells = np.ravel_multi_index([codes[name][matched] for name in self.labels], self.shape)
+        size = self.count.size
+        self.count += np.bincount(cells, minlength=size).reshape(self.shape)
+        self.probability_sum += np.bincount(cells, weights=probabilities[matched], minlength=size).reshape(self.shape)
+        self.flagged += np.bincount(cells, weights=probabilities[matched] > config["threshold"],
+                                    minlength=size).astype(np.int64).reshape(self.shape)
+        n_valid = int(np.count_nonzero(valid))
+        self.meta["rows"] += len(probabilities)
+        self.meta["invalid_rows"] += len(probabilities) - n_valid
+        self.meta["unmatched_rows"] += n_valid - int(np.count_nonzero(matched))
+
+    def _selected(self, filters):
+        """Cube arrays restricted to the selected labels of each filtered dimension."""
+        arrays = [self.count, self.probability_sum, self.flagged]
+        for axis, name in enumerate(self.labels):
+            selected = (filters or {}).get(name)
+            if selected is not None:
+                index = [self.labels[name].index(label) for label in selected]
+                arrays = [np.take(a, index, axis=axis) for a in arrays]
+        return arrays
+
+    def breakdown(self, by, filters=None):
+        """
+        Patients, mean risk and flagged share per category of the `by`
+        dimensions, within the filtered cohort.
+
+        Args:
+            by (list): Dimension names to group by (none for the total).
+            filters (dict): Dimension name -> labels to keep.
+
+        Returns:
+            pd.DataFrame: One row per combination of the `by` categories,
+                with patients, mean_risk and flagged_share (NaN for empty
+                groups) and cohort_share.
+        """
+        count, probability_sum, flagged = self._selected(filters)
+        axes = tuple(axis for axis, name in enumerate(self.labels) if name not in by)
+        count, probability_sum, flagged = (a.sum(axis=axes) for a in (count, probability_sum, flagged))
+        # Put the remaining axes in the order asked for
+        order = [list(name for name in self.labels if name in by).index(name) for name in by]
+        count, probability_sum, flagged = (np.transpose(a, order).ravel() for a in (count, probability_sum, flagged))
+
+        selected = [(filters or {}).get(name) or self.labels[name] for name in by]
+        index = pd.MultiIndex.from_product(selected, names=by).to_frame(index=False) if by else pd.DataFrame(index=[0])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return index.assign(
+                patients=count,
+                mean_risk=probability_sum / count,
+                flagged_share=flagged / count,
+                cohort_share=count / max(count.sum(), 1),
+            )
+
+    def save(self, path=RISK_CUBE_PATH):
+        meta = dict(self.meta, band_labels=self.labels["risk_band"], built=self.meta.get("built") or time.time())
+        np.savez_compressed(path, count=self.count, probability_sum=self.probability_sum, flagged=self.flagged,
+                            meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path=RISK_CUBE_PATH):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(meta["band_labels"], data["count"], data["probability_sum"], data["flagged"], meta)
+
+
+@lru_cache(maxsize=4)
+def _load_version(path, mtime):
+    return RiskCube.load(path)
+
+
+def load_risk_cube(path=RISK_CUBE_PATH):
+    """The saved cube, loaded once per file version; None when none has been built."""
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        return None
+    return _load_version(path, mtime)
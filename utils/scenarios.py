@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from utils.encoding import BMI_CATEGORIES, STRESS_LEVELS, bmi_category_of
+from utils.report import FEATURE_NAMES
+
+
+def apply_changes(user_inputs, bmi=None, smoking_status=None, stress_level=None):
+    """
+    Encoded profile with the What-If lifestyle changes applied.
+
+    Args:
+        user_inputs (dict): Encoded baseline profile.
+        bmi (float): Target BMI; sets the BMI category.
+        smoking_status (str): "Non-smoker" or "Formerly Smoker or Currently Smokes".
+        stress_level (str): "Low Stress", "Moderate Stress" or "High Stress".
+            The model only knows the first two levels (stress_level_category
+            never produces High Stress), so High Stress is scored as Moderate.
+
+    Returns:
+        dict: New encoded profile; the baseline is not modified.
+    """
+    changed = dict(user_inputs)
+    if bmi is not None:
+        category = bmi_category_of(bmi)
+        for bc in BMI_CATEGORIES:
+            changed[f"bmi_category_{bc}"] = 1 if category == bc else 0
+    if smoking_status is not None:
+        changed["smoking_status"] = 1 if smoking_status == "Formerly Smoker or Currently Smokes" else 0
+    if stress_level is not None:
+        if stress_level not in STRESS_LEVELS:
+            stress_level = "Moderate Stress"
+        for sl in STRESS_LEVELS:
+            changed[f"stress_level_{sl}"] = 1 if stress_level == sl else 0
+    return changed
+
+
+def encode_row(user_inputs, feature_order):
+    """Encoded profile as a compact uint8 row in feature_order."""
+    return np.array([user_inputs.get(f, 0) for f in feature_order], dtype=np.uint8)
+
+
+def score_rows(model, rows, feature_order, cache):
+    """
+    Probabilities for encoded rows, scoring only rows not seen before.
+
+    Rows missing from the cache are scored together in one predict_proba
+    call; rows that are unchanged since the last rerun are looked up.
+
+    Args:
+        model: Fitted classifier.
+        rows (list): uint8 rows from encode_row.
+        feature_order (list): Model feature columns.
+        cache (dict): Row bytes -> probability, e.g. kept in session state.
+
+    Returns:
+        tuple: (np.ndarray of probabilities, number of rows scored)
+    """
+    missing = list({row.tobytes(): row for row in rows if row.tobytes() not in cache}.values())
+    if missing:
+        X = pd.DataFrame(np.vstack(missing).astype(np.float64), columns=feature_order)
+        for row, probability in zip(missing, model.predict_proba(X)[:, 1]):
+            cache[row.tobytes()] = float(probability)
+    return np.array([cache[row.tobytes()] for row in rows]), len(missing)
+
+
+def describe_changes(row, baseline, feature_order):
+    """Friendly names of the features a scenario turns on or off vs the baseline."""
+    changes = []
+    for j in np.flatnonzero(row != baseline):
+        name = FEATURE_NAMES.get(feature_order[j], feature_order[j])
+        changes.append(f"+ {name}" if row[j] else f"− {name}")
+    return changes
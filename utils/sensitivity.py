@@ -0,0 +1,76 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils.encoding import feature_groups
+from utils.model import model_version
+from utils.registry import get_registry
+from utils.report import FEATURE_NAMES
+
+
+def single_factor_perturbations(user_inputs, feature_order):
+    """
+    Every profile that differs from the user's in exactly one factor: each
+    binary flag flipped, and each one-hot group moved to each of its other
+    categories.
+
+    Args:
+        user_inputs (dict): Encoded profile.
+        feature_order (list): Model feature columns.
+
+    Returns:
+        tuple: (labels, (n_perturbations, n_features) matrix)
+    """
+    base = np.array([user_inputs.get(f, 0) for f in feature_order], dtype=np.float64)
+    labels, rows = [], []
+    for indices in feature_groups(feature_order).values():
+        if len(indices) == 1:
+            j = indices[0]
+            row = base.copy()
+            row[j] = 1 - base[j]
+            name = FEATURE_NAMES.get(feature_order[j], feature_order[j])
+            labels.append(f"{name}: {'Yes → No' if base[j] == 1 else 'No → Yes'}")
+            rows.append(row)
+            continue
+        current = next((j for j in indices if base[j] == 1), None)
+        for j in indices:
+            if j == current:
+                continue
+            row = base.copy()
+            row[indices] = 0
+            row[j] = 1
+            before = FEATURE_NAMES.get(feature_order[current], feature_order[current]) if current is not None else "Other"
+            labels.append(f"{before} → {FEATURE_NAMES.get(feature_order[j], feature_order[j])}")
+            rows.append(row)
+    return labels, np.vstack(rows) if rows else np.empty((0, len(feature_order)))
+
+
+@lru_cache(maxsize=1024)
+def _sensitivity(version, profile, feature_order):
+    model = get_registry().get(version).model
+    user_inputs = dict(zip(feature_order, profile))
+    labels, X = single_factor_perturbations(user_inputs, list(feature_order))
+    # The unchanged profile rides along so every delta comes from the same call
+    X = np.vstack([np.array(profile, dtype=np.float64), X])
+    probabilities = model.predict_proba(pd.DataFrame(X, columns=list(feature_order)))[:, 1]
+    result = pd.DataFrame({
+        "change": labels,
+        "probability": probabilities[1:],
+        "delta": probabilities[1:] - probabilities[0],
+    })
+    return result.reindex(result["delta"].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+
+def sensitivity(user_inputs, feature_order, version=None):
+    """
+    Effect of each single-factor change on the predicted risk, scored in one
+    batched predict_proba call and cached per profile and model version
+    (default: production).
+
+    Returns:
+        pd.DataFrame: change, probability, delta (vs the current profile),
+            largest absolute effect first.
+    """
+    profile = tuple(float(user_inputs.get(f, 0)) for f in feature_order)
+    return _sensitivity(version or model_version(), profile, tuple(feature_order)).copy()
@@ -0,0 +1,77 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from functools import lru_cache
+
+from strokesense.encoding import encode_profile, profile_matrix
+from strokesense.model import predict_proba
+from utils.metrics import MODEL_LATENCY, REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_WORKERS = os.cpu_count() or 1  # Sessions score concurrently, one worker per core
+SPECULATIVE_WAIT_SECONDS = 0.5  # Longest a confirm waits for a background score
+
+SPECULATIVE_FALLBACKS = REGISTRY.counter(
+    "strokesense_speculative_fallbacks_total",
+    "Confirmed profiles scored on Results because the background score failed or was late.", ["reason"])
+
+
+@lru_cache(maxsize=None)
+def get_speculative_pool():
+    """Process-wide pool that scores profiles while the user is still reviewing them."""
+    return ThreadPoolExecutor(max_workers=SPECULATIVE_WORKERS, thread_name_prefix="speculative")
+
+
+def _encode_and_score(answers, served):
+    user_inputs = encode_profile(**answers)
+    X = profile_matrix([user_inputs], served.feature_order)
+    started = time.perf_counter()
+    with MODEL_LATENCY.labels(page="Input").time():
+        probability = float(predict_proba(served.model, X, served.feature_order)[0])
+    return {"user_inputs": user_inputs, "probability": probability, "model_version": served.version,
+            "seconds": time.perf_counter() - started}
+
+
+def start_scoring(answers, served):
+    """
+    Encode and score a profile on a background worker.
+
+    Args:
+        answers (dict): Keyword arguments of encode_profile.
+        served (ModelVersion): Model version serving the session (utils.registry).
+
+    Returns:
+        Future: Resolves to {"user_inputs", "probability", "model_version", "seconds"}.
+    """
+    return get_speculative_pool().submit(_encode_and_score, dict(answers), served)
+
+
+def collect_scoring(future, timeout=SPECULATIVE_WAIT_SECONDS):
+    """
+    Result of start_scoring, waiting at most timeout seconds.
+
+    Returns:
+        dict or None: The scored profile; None if the worker failed or is
+        still busy, in which case the Results page scores the profile itself.
+    """
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        SPECULATIVE_FALLBACKS.labels(reason="timeout").inc()
+    except Exception:
+        logger.exception("Background scoring failed; scoring on the Results page instead")
+        SPECULATIVE_FALLBACKS.labels(reason="error").inc()
+    return None
+
+
+def parked_probability(scored, user_inputs, version):
+    """
+    Probability from a speculative result, if it was scored for exactly
+    these inputs by the given model version; None otherwise.
+    """
+    if not scored or scored["user_inputs"] != user_inputs or scored["model_version"] != version:
+        return None
+    return scored["probability"]
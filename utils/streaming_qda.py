@@ -0,0 +1,135 @@
+import numpy as np
+from sklearn.discriminant_analysis import QuadraticDiscriminantAnalysis
+
+
+class StreamingQDA:
+    """
+    QDA trained from per-class sufficient statistics, one chunk at a time.
+
+    Each class keeps a row count, a mean and a scatter matrix (sum of squared
+    deviations from the mean). Chunks are centred on their own mean before
+    being merged (Chan et al.'s pairwise update), which avoids the precision
+    loss of accumulating raw sums of squares over millions of rows.
+
+    Args:
+        n_features (int): Width of the encoded feature matrix.
+        classes (tuple): Class labels, in predict_proba column order.
+        reg_param (float): QDA covariance regularisation (0.4 in best_model.pkl).
+        priors (str or array): "balanced" gives equal class priors, matching the
+            SMOTE-balanced training data of best_model.pkl; "empirical" uses
+            class frequencies; an array is used as is.
+        ddof (int): Covariance divisor is n - ddof. best_model.pkl was fitted by
+            scikit-learn 1.6, which used n - 1; newer releases use n.
+    """
+
+    def __init__(self, n_features, classes=(0, 1), reg_param=0.4, priors="balanced", ddof=1):
+        self.classes = np.asarray(classes)
+        self.reg_param = reg_param
+        self.priors = priors
+        self.ddof = ddof
+        self.counts = np.zeros(len(classes), dtype=np.int64)
+        self.means = np.zeros((len(classes), n_features))
+        self.scatter = np.zeros((len(classes), n_features, n_features))
+
+    def _merge(self, k, n_b, mean_b, scatter_b):
+        """Fold one block's statistics for class index k into the totals."""
+        n_a = self.counts[k]
+        n = n_a + n_b
+        delta = mean_b - self.means[k]
+        self.means[k] += delta * (n_b / n)
+        self.scatter[k] += scatter_b + np.outer(delta, delta) * (n_a * n_b / n)
+        self.counts[k] = n
+
+    def partial_fit(self, X, y):
+        """
+        Add a chunk of encoded rows.
+
+        Args:
+            X (array): (n_rows, n_features) encoded features.
+            y (array): Class label per row.
+
+        Returns:
+            StreamingQDA: self
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+        for k, label in enumerate(self.classes):
+            Xc = X[y == label]
+            if len(Xc) == 0:
+                continue
+            mean_b = Xc.mean(axis=0)
+            centred = Xc - mean_b
+            self._merge(k, len(Xc), mean_b, centred.T @ centred)
+        return self
+
+    def merge(self, other):
+        """Combine with statistics gathered elsewhere, e.g. another worker."""
+        for k in range(len(self.classes)):
+            if other.counts[k]:
+                self._merge(k, other.counts[k], other.means[k], other.scatter[k])
+        return self
+
+    def class_priors(self):
+        """Prior probability of each class."""
+        if isinstance(self.priors, str) and self.priors == "balanced":
+            return np.full(len(self.classes), 1 / len(self.classes))
+        if isinstance(self.priors, str) and self.priors == "empirical":
+            return self.counts / self.counts.sum()
+        return np.asarray(self.priors, dtype=np.float64)
+
+    def decompose(self):
+        """
+        Regularised eigen-decomposition of each class covariance.
+
+        Returns:
+            tuple: (scalings, rotations) laid out as sklearn's QDA scalings_
+            and rotations_, largest component first.
+        """
+        if (self.counts < 2).any():
+            raise ValueError(f"Every class needs at least 2 rows, got counts {self.counts.tolist()}")
+        cov = self.scatter / (self.counts - self.ddof)[:, None, None]
+        eigvals, eigvecs = np.linalg.eigh(cov)
+        eigvals = np.clip(eigvals[:, ::-1], 0, None)
+        scalings = (1 - self.reg_param) * eigvals + self.reg_param
+        return scalings, eigvecs[:, :, ::-1]
+
+    def to_estimator(self, feature_names=None):
+        """
+        Build a fitted sklearn QuadraticDiscriminantAnalysis.
+
+        Args:
+            feature_names (list): Column names to validate DataFrame inputs against.
+
+        Returns:
+            QuadraticDiscriminantAnalysis: Ready for predict_proba.
+        """
+        scalings, rotations = self.decompose()
+        qda = QuadraticDiscriminantAnalysis(reg_param=self.reg_param)
+        qda.classes_ = self.classes
+        qda.priors_ = self.class_priors()
+        qda.means_ = self.means.copy()
+        qda.scalings_ = list(scalings)
+        qda.rotations_ = list(rotations)
+        qda.n_features_in_ = self.means.shape[1]
+        if feature_names is not None:
+            qda.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        return qda
+
+    def save(self, path):
+        """Write the statistics to an .npz file for later incremental updates."""
+        priors = np.asarray(self.priors if not isinstance(self.priors, str) else [], dtype=np.float64)
+        priors_mode = self.priors if isinstance(self.priors, str) else ""
+        np.savez(path, classes=self.classes, counts=self.counts, means=self.means, scatter=self.scatter,
+                 reg_param=self.reg_param, ddof=self.ddof, priors_mode=priors_mode, priors=priors)
+
+    @classmethod
+    def load(cls, path):
+        """Read statistics written by save()."""
+        with np.load(path) as data:
+            priors = str(data["priors_mode"]) or data["priors"]
+            model = cls(data["means"].shape[1], classes=data["classes"],
+                        reg_param=float(data["reg_param"]), priors=priors, ddof=int(data["ddof"]))
+            model.counts = data["counts"].copy()
+            model.means = data["means"].copy()
+            model.scatter = data["scatter"].copy()
+        return model
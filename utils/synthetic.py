@@ -0,0 +1,179 @@
+import copy
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from utils.columnar import ARROW_BATCH_ROWS, BatchWriter
+
+# Marginals and dependencies of the synthetic raw records. Binary fields are
+# logistic models: "baseline" is the probability for the reference patient
+# (age 50, BMI 25, female, no condition drawn so far) and "odds_ratios"
+# multiply the odds per 10 years of age (age_10y), per 5 BMI points (bmi_5),
+# for men (male) and for any earlier field of the spec being "Yes".
+DEFAULT_COHORT_SPEC = {
+    "age": {"edges": [18, 30, 40, 50, 60, 70, 80, 90, 101],
+            "weights": [0.18, 0.16, 0.15, 0.16, 0.15, 0.11, 0.07, 0.02]},
+    "gender": {"Male": 0.49, "Female": 0.51},
+    "height": {"Male": [176.0, 7.0], "Female": [163.0, 6.5], "min": 140, "max": 210},
+    "bmi": {"mean": 26.5, "sd": 4.5, "per_10y": 0.4, "min": 15.0, "max": 50.0},
+    "hypertension": {"baseline": 0.25, "odds_ratios": {"age_10y": 1.7, "bmi_5": 1.5, "male": 1.2}},
+    "diabetes": {"baseline": 0.05, "odds_ratios": {"age_10y": 1.4, "bmi_5": 1.9, "hypertension": 1.6}},
+    "heart_disease": {"baseline": 0.02, "odds_ratios": {"age_10y": 1.9, "male": 1.6, "hypertension": 2.2,
+                                                         "diabetes": 1.8}},
+    "smoking_status": {"baseline": 0.35, "odds_ratios": {"age_10y": 1.05, "male": 1.4}},
+    "marital_status": {"baseline": 0.6, "odds_ratios": {"age_10y": 1.5}},
+    "residence_type": {"Urban": 0.55, "Rural": 0.45},
+    # Work type below and from retirement_age
+    "work_type": {"retirement_age": 65,
+                  "working": {"Private": 0.58, "Self-employed": 0.16, "Government Job": 0.14, "Unemployed": 0.12},
+                  "retired": {"Private": 0.08, "Self-employed": 0.10, "Government Job": 0.02, "Unemployed": 0.80}},
+    # Share of rows with an under-18 age, which the input form accepts and validation rejects
+    "invalid_fraction": 0.0,
+}
+
+# Category order of every text field ("Yes"/"No" fields use _BINARY_LABELS)
+CATEGORIES = {
+    "gender": ["Male", "Female"],
+    "hypertension": ["No", "Yes"],
+    "heart_disease": ["No", "Yes"],
+    "diabetes": ["No", "Yes"],
+    "marital_status": ["Single", "Married"],
+    "residence_type": ["Rural", "Urban"],
+    "work_type": ["Private", "Self-employed", "Government Job", "Unemployed"],
+    "smoking_status": ["Non-smoker", "Formerly Smoker or Currently Smokes"],
+}
+_BINARY_FIELDS = ["hypertension", "diabetes", "heart_disease", "smoking_status", "marital_status"]
+COHORT_COLUMNS = ["age", "gender", "height", "weight", "hypertension", "heart_disease", "diabetes",
+                  "marital_status", "residence_type", "work_type", "smoking_status"]
+
+
+def load_cohort_spec(path=None):
+    """
+    DEFAULT_COHORT_SPEC with the fields of a JSON file (if given) replacing
+    the defaults one field at a time.
+    """
+    spec = copy.deepcopy(DEFAULT_COHORT_SPEC)
+    if path:
+        with open(path, "r") as f:
+            spec.update(json.load(f))
+    return spec
+
+
+def _categorical(rng, n_rows, probabilities, categories):
+    """Codes into categories drawn with the given {category: probability}."""
+    weights = np.array([probabilities.get(c, 0.0) for c in categories], dtype=np.float64)
+    cumulative = np.cumsum(weights / weights.sum())
+    cumulative[-1] = 1.0
+    return np.searchsorted(cumulative, rng.random(n_rows, dtype=np.float32), side="right").astype(np.int8)
+
+
+def generate_codes(n_rows, rng, spec=DEFAULT_COHORT_SPEC):
+    """
+    One block of synthetic records, drawn with whole-array NumPy operations.
+
+    Args:
+        n_rows (int): Rows to draw.
+        rng (np.random.Generator): Source of randomness.
+        spec (dict): Marginals and dependencies (see DEFAULT_COHORT_SPEC).
+
+    Returns:
+        dict: age, height and weight as int16 arrays; every text field as
+            int8 codes into CATEGORIES[field].
+    """
+    age_spec = spec["age"]
+    edges = np.asarray(age_spec["edges"], dtype=np.float64)
+    band = _categorical(rng, n_rows, dict(enumerate(age_spec["weights"])), list(range(len(edges) - 1)))
+    age = np.floor(edges[band] + rng.random(n_rows) * (edges[band + 1] - edges[band]))
+
+    codes = {"gender": _categorical(rng, n_rows, spec["gender"], CATEGORIES["gender"])}
+    male = codes["gender"] == 0
+
+    height_spec = spec["height"]
+    mean = np.where(male, height_spec["Male"][0], height_spec["Female"][0])
+    sd = np.where(male, height_spec["Male"][1], height_spec["Female"][1])
+    height = np.clip(np.round(mean + sd * rng.standard_normal(n_rows, dtype=np.float32)),
+                     height_spec["min"], height_spec["max"])
+
+    bmi_spec = spec["bmi"]
+    age_10y = (age - 50) / 10
+    bmi = np.clip(bmi_spec["mean"] + bmi_spec["per_10y"] * age_10y
+                  + bmi_spec["sd"] * rng.standard_normal(n_rows, dtype=np.float32),
+                  bmi_spec["min"], bmi_spec["max"])
+    weight = np.clip(np.round(bmi * (height / 100) ** 2), 30, 200)  # The input form's weight range
+
+    covariates = {"age_10y": age_10y, "bmi_5": (bmi - 25) / 5, "male": male}
+    for field in _BINARY_FIELDS:
+        model = spec[field]
+        log_odds = np.full(n_rows, np.log(model["baseline"] / (1 - model["baseline"])))
+        for name, odds_ratio in model.get("odds_ratios", {}).items():
+            log_odds += np.log(odds_ratio) * covariates[name]
+        drawn = rng.random(n_rows) * (1 + np.exp(-log_odds)) < 1
+        codes[field] = drawn.astype(np.int8)
+        covariates[field] = drawn
+
+    codes["residence_type"] = _categorical(rng, n_rows, spec["residence_type"], CATEGORIES["residence_type"])
+    work_spec = spec["work_type"]
+    retired = age >= work_spec["retirement_age"]
+    codes["work_type"] = np.where(
+        retired,
+        _categorical(rng, n_rows, work_spec["retired"], CATEGORIES["work_type"]),
+        _categorical(rng, n_rows, work_spec["working"], CATEGORIES["work_type"]))
+
+    if spec.get("invalid_fraction"):
+        minors = rng.random(n_rows) < spec["invalid_fraction"]
+        age[minors] = rng.integers(0, 18, int(minors.sum()))
+
+    numeric = {"age": age, "height": height, "weight": weight}
+    return {name: numeric[name].astype(np.int16) if name in numeric else codes[name] for name in COHORT_COLUMNS}
+
+
+def _block_rngs(seed, n_rows, batch_rows):
+    """One generator per block, so a block's rows depend only on the seed and its position."""
+    n_blocks = -(-n_rows // batch_rows)
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_blocks)]
+
+
+def cohort_batches(n_rows, seed=0, spec=DEFAULT_COHORT_SPEC, batch_rows=ARROW_BATCH_ROWS):
+    """
+    Synthetic raw records as Arrow record batches with dictionary-encoded
+    text columns (the layout Parquet text columns are read back in).
+
+    The same seed, n_rows and batch_rows always give the same rows.
+
+    Yields:
+        pa.RecordBatch
+    """
+    dictionaries = {name: pa.array(categories) for name, categories in CATEGORIES.items()}
+    for i, rng in enumerate(_block_rngs(seed, n_rows, batch_rows)):
+        block = generate_codes(min(batch_rows, n_rows - i * batch_rows), rng, spec)
+        yield pa.RecordBatch.from_arrays(
+            [pa.DictionaryArray.from_arrays(values, dictionaries[name]) if name in dictionaries else pa.array(values)
+             for name, values in block.items()],
+            names=list(block))
+
+
+def cohort_frame(n_rows, seed=0, spec=DEFAULT_COHORT_SPEC, batch_rows=ARROW_BATCH_ROWS):
+    """Synthetic raw records as a DataFrame, text fields as pandas categoricals."""
+    blocks = [generate_codes(min(batch_rows, n_rows - i * batch_rows), rng, spec)
+              for i, rng in enumerate(_block_rngs(seed, n_rows, batch_rows))]
+    columns = {}
+    for name in COHORT_COLUMNS:
+        values = np.concatenate([block[name] for block in blocks]) if blocks else np.zeros(0, dtype=np.int16)
+        columns[name] = (pd.Categorical.from_codes(values, CATEGORIES[name]) if name in CATEGORIES else values)
+    return pd.DataFrame(columns)
+
+
+def write_cohort(path, n_rows, seed=0, spec=DEFAULT_COHORT_SPEC, batch_rows=ARROW_BATCH_ROWS):
+    """
+    Write a synthetic cohort to CSV, Parquet or Arrow IPC (by extension),
+    one batch at a time.
+
+    Returns:
+        int: Rows written.
+    """
+    with BatchWriter(path) as writer:
+        for batch in cohort_batches(n_rows, seed, spec, batch_rows):
+            writer.write(batch)
+    return n_rows
@@ -0,0 +1,167 @@
+import json
+import platform
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+import imblearn
+from imblearn.over_sampling import SMOTE
+from imblearn.pipeline import Pipeline
+from sklearn.discriminant_analysis import QuadraticDiscriminantAnalysis
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+
+from utils.dataset import load_labelled_dataset
+from utils.encoding import AGE_GENDER_RISKS, AGE_GROUPS, BMI_CATEGORIES, HEALTH_RISKS, STRESS_LEVELS, WORK_TYPES, encode_frame
+from utils.model import file_sha256
+
+SEED = 42
+SCORING = ["f1", "precision", "recall", "accuracy"]
+
+# Searched by scripts/train.py unless --models asks for others; the rest of
+# candidate_models() (logistic regression) is only benchmarked on request
+TRAINING_MODELS = ("rf", "et", "qda")
+
+# Column layout of data/feature_columns.pkl
+FEATURE_COLUMNS = (
+    ["hypertension", "heart_disease", "ever_married", "smoking_status", "diabetes"]
+    + [f"age_group_{c}" for c in AGE_GROUPS]
+    + [f"health_risk_{c}" for c in HEALTH_RISKS]
+    + [f"work_type_{c}" for c in WORK_TYPES]
+    + [f"bmi_category_{c}" for c in BMI_CATEGORIES]
+    + [f"age_gender_risk_{c}" for c in AGE_GENDER_RISKS]
+    + [f"stress_level_{c}" for c in STRESS_LEVELS]
+)
+
+
+def candidate_models(seed=SEED):
+    """
+    Models compared during selection, with their search grids.
+    Tree ensembles run single-threaded; parallelism comes from the grid search.
+
+    Returns:
+        dict: name -> (estimator, param_grid)
+    """
+    trees = {"n_estimators": [100, 300], "max_depth": [None, 8], "min_samples_leaf": [1, 5]}
+    return {
+        "rf": (RandomForestClassifier(random_state=seed, n_jobs=1), trees),
+        "et": (ExtraTreesClassifier(random_state=seed, n_jobs=1), trees),
+        "qda": (QuadraticDiscriminantAnalysis(), {"reg_param": [0.1, 0.2, 0.4, 0.6, 0.8]}),
+        "logreg": (LogisticRegression(max_iter=1000, random_state=seed), {"C": [0.01, 0.1, 1.0, 10.0]}),
+    }
+
+
+def make_pipeline(name, estimator, seed=SEED, memory=None):
+    """SMOTE oversampling followed by the classifier, as in best_model.pkl."""
+    return Pipeline([("smote", SMOTE(random_state=seed)), (name, estimator)], memory=memory)
+
+
+def encode_dataset(path, label, data_hash):
+    """Load and encode a labelled dataset. data_hash keys the preprocessing cache."""
+    raw, y = load_labelled_dataset(path, label=label)
+    X = pd.DataFrame(encode_frame(raw, FEATURE_COLUMNS), columns=FEATURE_COLUMNS)
+    return X, y
+
+
+def evaluate(model, X, y):
+    """Hold-out precision, recall, F1 and accuracy."""
+    y_pred = model.predict(X)
+    return {
+        "precision": float(precision_score(y, y_pred, zero_division=0)),
+        "recall": float(recall_score(y, y_pred, zero_division=0)),
+        "f1": float(f1_score(y, y_pred, zero_division=0)),
+        "accuracy": float(accuracy_score(y, y_pred)),
+    }
+
+
+def train(dataset, label="stroke", cache_dir=".cache/training", n_jobs=-1, cv=5,
+          test_size=0.2, seed=SEED, select_on="f1", models=None):
+    """
+    Run the model-selection grid and refit the winner.
+
+    Encoded features and SMOTE resamples are cached on disk under cache_dir,
+    so re-runs and grid points sharing a fold skip the preprocessing.
+
+    Args:
+        dataset (str): Labelled CSV (see utils.dataset.load_labelled_dataset).
+        label (str): Outcome column.
+        cache_dir (str): joblib cache directory, or None to disable caching.
+        n_jobs (int): Worker processes for the grid search (-1 for all cores).
+        cv (int): Stratified folds.
+        test_size (float): Hold-out fraction for the reported metrics.
+        seed (int): Seed for every random component.
+        select_on (str): Cross-validated metric used to pick the winner.
+        models (list): candidate_models() names to search; TRAINING_MODELS by default.
+
+    Returns:
+        tuple: (fitted best pipeline, manifest dict)
+    """
+    memory = joblib.Memory(cache_dir, verbose=0) if cache_dir else None
+    data_hash = file_sha256(dataset)
+    encode = memory.cache(encode_dataset) if memory else encode_dataset
+    X, y = encode(dataset, label, data_hash)
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, stratify=y, random_state=seed)
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed)
+
+    results = {}
+    best_name, best_search = None, None
+    for name, (estimator, grid) in candidate_models(seed).items():
+        if name not in (models or TRAINING_MODELS):
+            continue
+        search = GridSearchCV(
+            make_pipeline(name, estimator, seed, memory),
+            {f"{name}__{k}": v for k, v in grid.items()},
+            scoring=SCORING, refit=select_on, cv=folds, n_jobs=n_jobs,
+        )
+        search.fit(X_train, y_train)
+        i = search.best_index_
+        results[name] = {
+            "best_params": {k.split("__", 1)[1]: v for k, v in search.best_params_.items()},
+            "cv": {m: float(search.cv_results_[f"mean_test_{m}"][i]) for m in SCORING},
+            "test": evaluate(search.best_estimator_, X_test, y_test),
+        }
+        if best_search is None or search.best_score_ > best_search.best_score_:
+            best_name, best_search = name, search
+
+    # Refit the winner on all rows so the deployed model sees the full dataset
+    estimator = candidate_models(seed)[best_name][0].set_params(**results[best_name]["best_params"])
+    model = make_pipeline(best_name, estimator, seed).fit(X, y)
+
+    manifest = {
+        "model": best_name,
+        "params": results[best_name]["best_params"],
+        "selected_on": select_on,
+        "candidates": results,
+        "dataset": {"path": dataset, "sha256": data_hash, "rows": int(len(y)), "positives": int(y.sum())},
+        "feature_columns": FEATURE_COLUMNS,
+        "feature_rates": dict(zip(FEATURE_COLUMNS, X.mean().round(6).tolist())),
+        "seed": seed,
+        "cv_folds": cv,
+        "test_size": test_size,
+        "versions": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "scikit-learn": sklearn.__version__,
+            "imbalanced-learn": imblearn.__version__,
+        },
+    }
+    return model, manifest
+
+
+def save_artifacts(model, manifest, out_dir="data"):
+    """Write best_model.pkl, feature_columns.pkl, model_manifest.json and drift_reference.json."""
+    joblib.dump(model, f"{out_dir}/best_model.pkl")
+    joblib.dump(pd.Index(manifest["feature_columns"]), f"{out_dir}/feature_columns.pkl")
+    manifest = dict(manifest, model_sha256=file_sha256(f"{out_dir}/best_model.pkl"))
+    with open(f"{out_dir}/model_manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    with open(f"{out_dir}/drift_reference.json", "w") as f:
+        json.dump({"source": manifest["dataset"]["path"], "rows": manifest["dataset"]["rows"],
+                   "feature_rates": manifest["feature_rates"]}, f, indent=2)
+    return manifest
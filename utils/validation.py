@@ -0,0 +1,4 @@
+# Validation rules live in the Streamlit-free core package
+from strokesense.validation import (
+    VALIDATION_RULES, Rule, error_messages, error_summary, validate_columns, validate_profile,
+)